@@ -0,0 +1,49 @@
+"""add_pin_lookup_to_user
+
+Revision ID: 7f3a9c21d4e8
+Revises: 35a516c5fc58
+Create Date: 2026-10-16 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.security import get_pin_lookup
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3a9c21d4e8'
+down_revision: Union[str, None] = '35a516c5fc58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('pin_lookup', sa.String(length=64), nullable=True))
+
+    # Backfill: pin_unique guarda o PIN, então a chave HMAC pode ser recalculada
+    connection = op.get_bind()
+    users = sa.table(
+        'users',
+        sa.column('id', sa.Integer),
+        sa.column('pin_unique', sa.String),
+        sa.column('pin_lookup', sa.String),
+    )
+    rows = connection.execute(sa.select(users.c.id, users.c.pin_unique)).fetchall()
+    for user_id, pin in rows:
+        connection.execute(
+            users.update()
+            .where(users.c.id == user_id)
+            .values(pin_lookup=get_pin_lookup(pin))
+        )
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('pin_lookup', existing_type=sa.String(length=64), nullable=False)
+    op.create_index(op.f('ix_users_pin_lookup'), 'users', ['pin_lookup'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_users_pin_lookup'), table_name='users')
+    op.drop_column('users', 'pin_lookup')
@@ -0,0 +1,27 @@
+"""add_order_revision
+
+Revision ID: e7b2f90c4a16
+Revises: c4d81a7e5b92
+Create Date: 2026-10-17 14:05:37.218940
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2f90c4a16'
+down_revision: Union[str, None] = 'c4d81a7e5b92'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Versão do pedido para ETag / If-None-Match; pedidos existentes começam em 0
+    op.add_column('orders', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('orders', 'revision')
@@ -9,6 +9,14 @@ from sqlalchemy import text
 from app.core.database import get_db
 from app.core.config import settings
 from app.core.cache import get_redis_client
+from app.services.password_hasher import password_hasher
+from app.services.pdf_parser_pool import pdf_parser_pool
+from app.services.pdf_parse_cache import pdf_parse_cache
+from app.services.pdf_import_jobs import pdf_import_service
+from app.services.pdf_batch_upload import pdf_batch_upload_service
+from app.services.pdf_preview_store import pdf_preview_store
+from app.services.order_progress_reconciler import order_progress_reconciler
+from app.services.order_detail_cache import order_detail_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -138,5 +146,13 @@ async def basic_metrics():
         "environment": settings.ENVIRONMENT,
         "timestamp": time.time(),
         "uptime_seconds": time.time() - _start_time,
+        "password_hashing": password_hasher.get_metrics(),
+        "pdf_parsing": pdf_parser_pool.get_metrics(),
+        "pdf_parse_cache": pdf_parse_cache.get_metrics(),
+        "pdf_import_jobs": pdf_import_service.get_metrics(),
+        "pdf_batch_upload": pdf_batch_upload_service.get_metrics(),
+        "pdf_previews": pdf_preview_store.get_metrics(),
+        "order_progress_reconciler": order_progress_reconciler.get_metrics(),
+        "order_detail_cache": order_detail_cache.get_metrics(),
         # Add more metrics as needed
     }
\ No newline at end of file
@@ -1,26 +1,38 @@
 """
 Endpoints para gerenciamento de pedidos.
 """
-from pathlib import Path
-from typing import List, Optional
-import tempfile
+from typing import List, Optional, Tuple, Union
+import csv
+import hashlib
+import io
 import logging
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Header, Query, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_async_session, get_current_user
+from app.core.config import settings
+from app.core.deps import get_async_session, get_current_user, require_admin
 from app.models.user import User
 from app.models.order import Order
+from app.models.order_item import OrderItem
 from app.repositories.order import OrderRepository
 from app.repositories.order_item import OrderItemRepository
 from app.repositories.order_access import OrderAccessRepository
-from app.services.pdf_parser import PDFParser, PDFParseError
+from app.services.pdf_parser import PDFParseError
+from app.services.pdf_parser_pool import pdf_parser_pool
+from app.services.pdf_parse_cache import pdf_parse_cache
+from app.services.pdf_import_jobs import ImportQueueFullError, build_pdf_preview, pdf_import_service
+from app.services.pdf_batch_upload import pdf_batch_upload_service
+from app.services.pdf_preview_store import pdf_preview_store
+from app.services.order_import import OrderImportError, order_importer, read_rows
+from app.services.order_detail_cache import order_detail_cache
 from app.schemas.pdf import (
     PDFPreviewResponse,
-    PDFExtractedData, 
+    ImportJobResponse,
+    BatchUploadResponse,
+    OrderImportResult,
     OrderCreateFromPDF,
     OrderResponse
 )
@@ -29,6 +41,8 @@ from app.schemas.orders import (
     OrderItemsBatchUpdate,
     OrderDetailResponse,
     OrderItemResponse,
+    OrderItemsDeltaResponse,
+    OrderListItem,
     OrderStats,
     PurchaseItemResponse
 )
@@ -45,6 +59,130 @@ from app.api.v1.websocket import (
 logger = logging.getLogger("app.api.orders")
 router = APIRouter()
 
+# Colunas de orders lidas para cada campo da listagem (parâmetro fields)
+ORDER_LIST_FIELD_COLUMNS = {
+    "id": ("id",),
+    "order_number": ("order_number",),
+    "client_name": ("client_name",),
+    "seller_name": ("seller_name",),
+    "total_value": ("total_value",),
+    "items_count": ("items_count",),
+    "progress_percentage": ("items_count", "items_separated", "items_not_sent"),
+    "created_at": ("created_at",),
+}
+
+
+def _item_response(item: OrderItem) -> OrderItemResponse:
+    """Item do pedido no formato da API."""
+    return OrderItemResponse(
+        id=item.id,
+        product_code=item.product_code,
+        product_reference=item.product_reference,
+        product_name=item.product_name,
+        quantity=item.quantity,
+        unit_price=item.unit_price,
+        total_price=item.total_price,
+        separated=item.is_separated,
+        sent_to_purchase=item.sent_to_purchase,
+        not_sent=item.not_sent,
+        separated_at=item.separated_at
+    )
+
+
+def _item_progress(processed_items: int, total_items: int) -> float:
+    """
+    Porcentagem de progresso do detalhe: itens processados (separados ou
+    não enviados) sobre o número de itens do pedido.
+    """
+    return (processed_items / total_items) * 100 if total_items else 0.0
+
+
+def _wants_minimal(prefer: Optional[str], response_mode: Optional[str]) -> bool:
+    """
+    Se o cliente pediu a resposta compacta.
+    
+    `?response=` tem precedência; sem ele, vale `Prefer: return=minimal`
+    (RFC 7240).
+    """
+    if response_mode is not None:
+        return response_mode == "delta"
+    if not prefer:
+        return False
+    preferences = {token.strip().lower().replace(" ", "") for token in prefer.split(",")}
+    return "return=minimal" in preferences
+
+
+def _order_etag(order_id: int, revision: int) -> str:
+    """ETag forte do pedido, a partir da revisão."""
+    return f'"order-{order_id}-r{revision}"'
+
+
+def _page_etag(rows, fields: List[str]) -> str:
+    """
+    ETag forte de uma página da listagem.
+    
+    Muda quando muda qualquer pedido da página (revisão), a composição da
+    página ou os campos pedidos.
+    """
+    digest = hashlib.sha1(repr((fields, [(row.id, row.revision) for row in rows])).encode()).hexdigest()
+    return f'"orders-{digest[:20]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Se o If-None-Match casa com o ETag (comparação fraca, RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+    return etag in candidates
+
+
+def _validate_pdf_upload(file: UploadFile) -> None:
+    """
+    Valida nome, extensão e tamanho do arquivo enviado.
+    
+    Raises:
+        HTTPException: Se o arquivo não for um PDF aceito
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Filename is required")
+    
+    if not file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    
+    # Tamanho informado pelo cliente (opcional); o limite é garantido na leitura
+    if file.size and file.size > settings.PDF_MAX_UPLOAD_BYTES:
+        raise _file_too_large()
+
+
+def _file_too_large() -> HTTPException:
+    """Erro de arquivo acima do limite de upload."""
+    return HTTPException(
+        status_code=400,
+        detail=f"File too large (max {settings.PDF_MAX_UPLOAD_BYTES // (1024 * 1024)}MB)"
+    )
+
+
+async def _read_pdf_upload(file: UploadFile) -> Tuple[bytes, str]:
+    """
+    Lê o arquivo em blocos, calculando o hash e aplicando o limite de tamanho.
+    
+    Returns:
+        Tuple[bytes, str]: Conteúdo e SHA-256 do arquivo
+        
+    Raises:
+        HTTPException: Se o arquivo passar do limite
+    """
+    content = bytearray()
+    digest = hashlib.sha256()
+    while chunk := await file.read(settings.PDF_UPLOAD_CHUNK_SIZE):
+        if len(content) + len(chunk) > settings.PDF_MAX_UPLOAD_BYTES:
+            raise _file_too_large()
+        content += chunk
+        digest.update(chunk)
+    return bytes(content), digest.hexdigest()
+
 
 @router.post("/upload", response_model=PDFPreviewResponse)
 async def upload_pdf(
@@ -52,70 +190,58 @@ async def upload_pdf(
     logistics_type: Optional[str] = Form(None),
     package_type: Optional[str] = Form(None), 
     observations: Optional[str] = Form(None),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Upload de PDF e extração de dados para preview.
     
+    O número do orçamento é lido primeiro só da primeira página; se o
+    pedido já existir, o upload é recusado antes do parsing completo.
+    
     Args:
         file: Arquivo PDF do pedido
         logistics_type: Tipo de logística (opcional)
         package_type: Tipo de embalagem (opcional)
         observations: Observações (opcional)
+        session: Sessão do banco de dados
         current_user: Usuário autenticado
         
     Returns:
         PDFPreviewResponse: Dados extraídos para preview
     """
-    # Validações do arquivo
-    if not file.filename:
-        raise HTTPException(status_code=400, detail="Filename is required")
-    
-    if not file.filename.lower().endswith('.pdf'):
-        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
-    
-    if file.size and file.size > 10 * 1024 * 1024:  # 10MB limit
-        raise HTTPException(status_code=400, detail="File too large (max 10MB)")
+    _validate_pdf_upload(file)
+    content, content_hash = await _read_pdf_upload(file)
     
     try:
-        # Salva arquivo temporário
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
-            content = await file.read()
-            temp_file.write(content)
-            temp_path = Path(temp_file.name)
+        # Reenvio do mesmo arquivo: reaproveita o parsing anterior
+        extracted_data = await pdf_parse_cache.get(content, content_hash)
+        if extracted_data is not None:
+            order_number = extracted_data.get("order_number")
+        else:
+            order_number = await pdf_parser_pool.sniff_order_number(content)
         
-        # Extrai dados do PDF
-        parser = PDFParser()
-        extracted_data = parser.extract(temp_path)
+        if order_number and await OrderRepository(session).get_by_order_number(order_number):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Pedido {order_number} já existe"
+            )
         
-        # Remove arquivo temporário
-        temp_path.unlink()
+        if extracted_data is None:
+            # Extrai dados do PDF em memória no pool de processos
+            # (sem arquivo temporário e sem bloquear o event loop)
+            extracted_data = await pdf_parser_pool.parse_bytes(content)
+            await pdf_parse_cache.set(content, extracted_data, content_hash)
         
-        # Converte para schema Pydantic para validação
-        pdf_data = PDFExtractedData(**extracted_data)
+        preview = build_pdf_preview(extracted_data)
+        preview.preview_token = await pdf_preview_store.put(preview.data, current_user.id)
         
         logger.info(
             f"PDF uploaded successfully by user {current_user.id}: "
-            f"order {pdf_data.order_number}, {len(pdf_data.items)} items"
+            f"order {preview.data.order_number}, {len(preview.data.items)} items"
         )
         
-        # Criar informações de validação para o vendedor
-        validation_info = {
-            "calculated_total": pdf_data.calculated_total,
-            "pdf_total": pdf_data.total_value,
-            "items_count": pdf_data.items_count,
-            "models_count": pdf_data.models_count,
-            "totals_match": abs(pdf_data.calculated_total - pdf_data.total_value) <= 0.01,
-            "difference": abs(pdf_data.calculated_total - pdf_data.total_value)
-        }
-        
-        return PDFPreviewResponse(
-            success=True,
-            message="PDF processado com sucesso",
-            data=pdf_data,
-            errors=None,
-            validation_info=validation_info
-        )
+        return preview
         
     except PDFParseError as e:
         logger.warning(f"PDF parse error for user {current_user.id}: {str(e)}")
@@ -125,18 +251,165 @@ async def upload_pdf(
             data=None,
             errors=[str(e)]
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Unexpected error uploading PDF for user {current_user.id}: {str(e)}")
-        # Remove arquivo temporário em caso de erro
-        if 'temp_path' in locals() and temp_path.exists():
-            temp_path.unlink()
-        
         raise HTTPException(
             status_code=500,
             detail="Erro interno ao processar PDF"
         )
 
 
+@router.post("/upload/batch", response_model=BatchUploadResponse)
+async def upload_pdf_batch(
+    files: List[UploadFile] = File(...),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload de vários PDFs em uma requisição, com preview de cada um.
+    
+    Os arquivos são processados em paralelo no pool de parsing. Arquivos
+    com o mesmo conteúdo são processados uma vez; orçamentos repetidos no
+    lote ou já cadastrados são sinalizados no resultado do arquivo.
+    
+    Args:
+        files: Arquivos PDF dos pedidos
+        session: Sessão do banco de dados
+        current_user: Usuário autenticado
+        
+    Returns:
+        BatchUploadResponse: Resultado por arquivo, na ordem do envio
+    """
+    if len(files) > settings.PDF_BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (max {settings.PDF_BATCH_MAX_FILES})"
+        )
+    
+    contents = []
+    for file in files:
+        _validate_pdf_upload(file)
+        content, _ = await _read_pdf_upload(file)
+        contents.append((file.filename, content))
+    response = await pdf_batch_upload_service.preview(contents, OrderRepository(session), current_user.id)
+    
+    logger.info(
+        f"PDF batch uploaded by user {current_user.id}: {response.total} files, "
+        f"{response.parsed} parsed, {response.duplicates} duplicates, "
+        f"{response.existing_orders} existing, {response.failed} failed"
+    )
+    
+    return response
+
+
+@router.post("/upload/jobs", response_model=ImportJobResponse, status_code=202)
+async def upload_pdf_job(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Upload de PDF com processamento em segundo plano.
+    
+    Responde imediatamente com o ID da importação. O progresso e o preview
+    final são enviados pelo WebSocket do usuário (mensagens
+    `import_progress` e `import_done`) e podem ser consultados em
+    GET /upload/jobs/{job_id}.
+    
+    Args:
+        file: Arquivo PDF do pedido
+        current_user: Usuário autenticado
+        
+    Returns:
+        ImportJobResponse: Importação criada
+        
+    Raises:
+        HTTPException: 503 se a fila de importações estiver cheia
+    """
+    _validate_pdf_upload(file)
+    content, _ = await _read_pdf_upload(file)
+    
+    try:
+        job = pdf_import_service.submit(content, current_user.id, file.filename)
+    except ImportQueueFullError as e:
+        logger.warning(f"PDF import rejected for user {current_user.id}: {str(e)}")
+        raise HTTPException(
+            status_code=503,
+            detail="Muitas importações em andamento. Tente novamente em instantes."
+        )
+    return job.to_response()
+
+
+@router.get("/upload/jobs/{job_id}", response_model=ImportJobResponse)
+async def get_upload_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Consulta o andamento de uma importação de PDF.
+    
+    Args:
+        job_id: ID da importação
+        current_user: Usuário autenticado
+        
+    Returns:
+        ImportJobResponse: Situação, progresso e, ao terminar, o preview
+    """
+    job = pdf_import_service.get(job_id)
+    if job is None or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Importação não encontrada")
+    return job.to_response()
+
+
+@router.post("/import", response_model=OrderImportResult)
+async def import_orders(
+    file: UploadFile = File(...),
+    session: AsyncSession = Depends(get_async_session),
+    current_user: User = Depends(require_admin)
+):
+    """
+    Importação em massa de pedidos a partir de JSONL ou CSV (apenas admin).
+    
+    Para migrações e backfills: cada pedido segue o formato de
+    PDFExtractedData (JSONL: um objeto por linha; CSV: uma linha por item).
+    Pedidos já cadastrados ou repetidos no arquivo são ignorados e os
+    inválidos são rejeitados sem interromper a importação.
+    
+    Args:
+        file: Arquivo .jsonl ou .csv (UTF-8)
+        session: Sessão do banco de dados
+        current_user: Administrador autenticado
+        
+    Returns:
+        OrderImportResult: Totais da importação e primeiras rejeições
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="Filename is required")
+    
+    async def log_progress(result: OrderImportResult) -> None:
+        logger.info(
+            f"Order import by user {current_user.id}: {result.total_rows} rows read, "
+            f"{result.imported} imported"
+        )
+    
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        result = await order_importer.run(read_rows(file.filename, lines), session, log_progress)
+    except (OrderImportError, UnicodeDecodeError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        lines.detach()
+    
+    logger.info(
+        f"Order import by user {current_user.id} finished: {result.imported} imported, "
+        f"{result.skipped_existing} existing, {result.duplicates} duplicates, "
+        f"{result.invalid} invalid in {result.elapsed_seconds:.1f}s"
+    )
+    
+    return result
+
+
 @router.post("/confirm", response_model=OrderResponse)
 async def confirm_order(
     order_data: OrderCreateFromPDF,
@@ -146,6 +419,9 @@ async def confirm_order(
     """
     Confirma criação do pedido a partir dos dados extraídos do PDF.
     
+    Com `preview_token`, os dados vêm do preview guardado no upload, já
+    validados; o token é descartado após a criação do pedido.
+    
     Args:
         order_data: Dados do pedido para criação
         session: Sessão do banco de dados
@@ -157,19 +433,26 @@ async def confirm_order(
     try:
         repository = OrderRepository(session)
         
+        pdf_data = order_data.pdf_data
+        if order_data.preview_token:
+            pdf_data = await pdf_preview_store.get(order_data.preview_token, current_user.id)
+            if pdf_data is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail="Preview expirado ou inválido, envie o PDF novamente"
+                )
+        
         # Verifica se o pedido já existe
-        existing_order = await repository.get_by_order_number(
-            order_data.pdf_data.order_number
-        )
+        existing_order = await repository.get_by_order_number(pdf_data.order_number)
         if existing_order:
             raise HTTPException(
                 status_code=400,
-                detail=f"Pedido {order_data.pdf_data.order_number} já existe"
+                detail=f"Pedido {pdf_data.order_number} já existe"
             )
         
         # Cria o pedido
         order = await repository.create_from_pdf_data(
-            pdf_data=order_data.pdf_data,
+            pdf_data=pdf_data,
             logistics_type=order_data.logistics_type,
             package_type=order_data.package_type,
             observations=order_data.observations
@@ -180,6 +463,9 @@ async def confirm_order(
             f"order {order.order_number}, ID {order.id}"
         )
         
+        if order_data.preview_token:
+            await pdf_preview_store.discard(order_data.preview_token)
+        
         # Notificar via WebSocket sobre novo pedido
         await notify_new_order(order.id, order.order_number, order.client_name)
         
@@ -204,26 +490,46 @@ async def confirm_order(
         )
 
 
-@router.get("", response_model=List[OrderResponse])
+@router.get("", response_model=List[OrderListItem], response_model_exclude_unset=True)
 async def list_orders(
+    response: Response,
     page: int = 1,
     per_page: int = 20,
     status: Optional[str] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Lista pedidos com paginação e filtros.
     
+    Aceita paginação por página (`page`) ou por cursor: o header
+    `X-Next-Cursor` traz o cursor da página seguinte, que deve ser enviado
+    em `cursor` (nesse caso `page` é ignorado). O cursor é estável quando
+    novos pedidos chegam e não fica mais lento em páginas profundas.
+    
+    A consulta lê só as colunas da listagem, sem carregar os itens. Com
+    `fields` (ex.: `fields=id,order_number,progress_percentage`) a resposta
+    traz apenas esses campos e só as colunas deles são lidas.
+    
+    O header `ETag` identifica a página (pedidos, revisões e campos); com
+    `If-None-Match` igual, a resposta é 304 sem corpo.
+    
     Args:
+        response: Response (headers X-Next-Cursor e ETag)
         page: Número da página (1-based)
         per_page: Itens por página (max 100)
         status: Filtro por status (opcional)
+        cursor: Cursor da página seguinte (header X-Next-Cursor da resposta anterior)
+        fields: Campos da resposta, separados por vírgula (opcional)
+        if_none_match: ETag da página já recebida (opcional)
         session: Sessão do banco de dados
         current_user: Usuário autenticado
         
     Returns:
-        List[OrderResponse]: Lista de pedidos
+        List[OrderListItem]: Lista de pedidos (ou 304 se a página não mudou)
     """
     if page < 1:
         raise HTTPException(status_code=400, detail="Page must be >= 1")
@@ -231,25 +537,53 @@ async def list_orders(
     if per_page < 1 or per_page > 100:
         raise HTTPException(status_code=400, detail="Per page must be between 1 and 100")
     
+    if cursor:
+        try:
+            OrderRepository.decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    if fields:
+        requested = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+        unknown = [field for field in requested if field not in ORDER_LIST_FIELD_COLUMNS]
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)} "
+                       f"(available: {', '.join(ORDER_LIST_FIELD_COLUMNS)})"
+            )
+    else:
+        requested = list(ORDER_LIST_FIELD_COLUMNS)
+    columns = list(dict.fromkeys(
+        column for field in requested for column in ORDER_LIST_FIELD_COLUMNS[field]
+    ))
+    
     try:
         logger.info(f"Orders requested by user {current_user.id}")
         
         repository = OrderRepository(session)
         offset = (page - 1) * per_page
-        orders = await repository.list_paginated(offset=offset, limit=per_page, status_filter=status)
-        
-        return [
-            OrderResponse(
-                id=order.id,
-                order_number=order.order_number,
-                client_name=order.client_name,
-                seller_name=order.seller_name,
-                total_value=order.total_value,
-                items_count=order.items_count,
-                progress_percentage=order.progress_percentage,
-                created_at=order.created_at
-            ) for order in orders
-        ]
+        rows = await repository.list_summaries(
+            offset=offset, limit=per_page, status_filter=status, cursor=cursor, columns=columns
+        )
+        
+        headers = {"ETag": _page_etag(rows, requested)}
+        # Página cheia: pode haver mais pedidos depois do último
+        if len(rows) == per_page:
+            headers["X-Next-Cursor"] = repository.encode_cursor(rows[-1])
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+        
+        orders = []
+        for row in rows:
+            values = {field: getattr(row, field) for field in requested if field != "progress_percentage"}
+            if "progress_percentage" in requested:
+                values["progress_percentage"] = Order.calculate_progress(
+                    row.items_count, row.items_separated, row.items_not_sent
+                )
+            orders.append(OrderListItem(**values))
+        return orders
         
     except Exception as e:
         import traceback
@@ -439,52 +773,72 @@ async def get_order(
 @router.get("/{order_id}/detail", response_model=OrderDetailResponse)
 async def get_order_detail(
     order_id: int,
+    if_none_match: Optional[str] = Header(None),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Busca detalhes completos do pedido incluindo itens.
     
+    O header `ETag` vem da revisão do pedido. Com `If-None-Match` igual à
+    revisão atual, a resposta é 304 após uma consulta pela chave primária,
+    sem carregar os itens nem registrar acesso.
+    
+    O JSON do detalhe fica em cache (order_detail_cache) pela revisão do
+    pedido: enquanto o pedido não muda, pedido e itens são lidos do banco
+    uma única vez.
+    
     Args:
         order_id: ID do pedido
+        if_none_match: ETag já recebido (opcional)
         session: Sessão do banco de dados
         current_user: Usuário autenticado
         
     Returns:
-        OrderDetailResponse: Dados completos do pedido
+        OrderDetailResponse: Dados completos do pedido (ou 304 se não mudou)
     """
     try:
         logger.info(f"Getting order detail for order_id={order_id}, user_id={current_user.id}")
         
+        # Revisão atual do pedido: ETag e validade do cache
+        order_repo = OrderRepository(session)
+        revision = await order_repo.get_revision(order_id)
+        if revision is None:
+            logger.warning(f"Order {order_id} not found in database")
+            raise HTTPException(status_code=404, detail="Pedido não encontrado")
+        
+        etag = _order_etag(order_id, revision)
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+        
         # Registrar acesso ao pedido
         access_repo = OrderAccessRepository(session)
         logger.debug(f"Creating access record for order {order_id}, user {current_user.id}")
         await access_repo.create_access(order_id, current_user.id)
         
-        # Buscar pedido
-        order_repo = OrderRepository(session)
-        logger.debug(f"Fetching order {order_id} from database")
-        order = await order_repo.get(order_id)
+        body = await order_detail_cache.get(order_id, revision)
+        if body is not None:
+            return Response(content=body, media_type="application/json", headers={"ETag": etag})
         
-        if not order:
+        # Buscar pedido e itens em uma consulta: a revisão usada no ETag e
+        # na chave do cache é a mesma com que o corpo é montado
+        logger.debug(f"Fetching order {order_id} with items from database")
+        detail_row = await order_repo.get_detail(order_id)
+        
+        if not detail_row:
             logger.warning(f"Order {order_id} not found in database")
             raise HTTPException(status_code=404, detail="Pedido não encontrado")
         
-        logger.debug(f"Order {order_id} found: {order.order_number}")
-        
-        # Buscar itens
-        item_repo = OrderItemRepository(session)
-        logger.debug(f"Fetching items for order {order_id}")
-        items = await item_repo.get_by_order(order_id)
-        logger.debug(f"Found {len(items)} items for order {order_id}")
+        order, items = detail_row
+        logger.debug(f"Order {order_id} found: {order.order_number}, {len(items)} items")
         
         # Calculate progress based on fetched items instead of using the property
         # that causes lazy loading in async context
         # Separated items AND not_sent items count for progress (not purchase items)
         processed_items = sum(1 for item in items if item.is_separated or item.not_sent)
-        progress_percentage = (processed_items / len(items)) * 100 if items else 0.0
+        progress_percentage = _item_progress(processed_items, len(items))
         
-        return OrderDetailResponse(
+        detail = OrderDetailResponse(
             id=order.id,
             order_number=order.order_number,
             client_name=order.client_name,
@@ -497,24 +851,15 @@ async def get_order_detail(
             package_type=order.package_type,
             observations=order.observations,
             created_at=order.created_at,
-            items=[
-                OrderItemResponse(
-                    id=item.id,
-                    product_code=item.product_code,
-                    product_reference=item.product_reference,
-                    product_name=item.product_name,
-                    quantity=item.quantity,
-                    unit_price=item.unit_price,
-                    total_price=item.total_price,
-                    separated=item.is_separated,
-                    sent_to_purchase=item.sent_to_purchase,
-                    not_sent=item.not_sent,
-                    separated_at=item.separated_at
-                )
-                for item in items
-            ]
+            items=[_item_response(item) for item in items]
         )
         
+        # Serializado uma vez: a mesma resposta vai para o cache
+        body = detail.model_dump_json().encode()
+        revision = order.revision
+        await order_detail_cache.set(order_id, revision, body)
+        return Response(content=body, media_type="application/json", headers={"ETag": _order_etag(order_id, revision)})
+        
     except HTTPException:
         raise
     except Exception as e:
@@ -537,24 +882,36 @@ async def get_order_detail(
         )
 
 
-@router.patch("/{order_id}/items", response_model=OrderDetailResponse)
+@router.patch("/{order_id}/items", response_model=Union[OrderDetailResponse, OrderItemsDeltaResponse])
 async def update_order_items(
+    response: Response,
     order_id: int,
     updates: OrderItemsBatchUpdate,
+    prefer: Optional[str] = Header(None),
+    response_mode: Optional[str] = Query(None, alias="response", pattern="^(full|delta)$"),
     session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_user)
 ):
     """
     Atualiza múltiplos itens do pedido em lote.
     
+    Por padrão responde com o pedido completo (como GET /detail). Com
+    `Prefer: return=minimal` ou `?response=delta`, responde só com os itens
+    do lote e os contadores do pedido, montados a partir dos objetos já na
+    sessão, sem registrar acesso nem recarregar o pedido e os itens.
+    
     Args:
+        response: Resposta HTTP (header Preference-Applied)
         order_id: ID do pedido
         updates: Lista de atualizações para os itens
+        prefer: Header Prefer (`return=minimal` para a resposta compacta)
+        response_mode: `full` ou `delta` (tem precedência sobre o Prefer)
         session: Sessão do banco de dados
         current_user: Usuário autenticado
         
     Returns:
-        OrderDetailResponse: Dados atualizados do pedido
+        OrderDetailResponse | OrderItemsDeltaResponse: Pedido completo ou
+        só as alterações
     """
     try:
         # Verificar se o pedido existe
@@ -566,79 +923,77 @@ async def update_order_items(
         
         item_repo = OrderItemRepository(session)
         
-        # Processar cada atualização
+        # Validar todos os itens do lote em uma consulta
+        states = await item_repo.get_item_states(
+            order_id, [update.item_id for update in updates.updates]
+        )
         for update in updates.updates:
-            item = await item_repo.get(update.item_id)
-            if not item or item.order_id != order_id:
+            if update.item_id not in states:
                 raise HTTPException(
                     status_code=400,
                     detail=f"Item {update.item_id} não encontrado no pedido {order_id}"
                 )
-            
-            # Aplicar atualizações
-            if update.separated is not None:
-                if update.separated:
-                    await item_repo.mark_separated(update.item_id, current_user.id)
-                    logger.info(f"Item {update.item_id} marked as separated by user {current_user.id}")
-                    
-                    # Notificar separação via WebSocket
-                    # Vamos calcular progresso temporário para a notificação
-                    temp_order = await order_repo.get(order_id)
-                    if temp_order:
-                        await notify_item_separated(order_id, update.item_id, temp_order.progress_percentage)
-                else:
-                    # Reverter separação se necessário
-                    item.is_separated = False
-                    item.separated_at = None
-                    item.separated_by_id = None
-            
-            if update.sent_to_purchase is not None:
-                if update.sent_to_purchase:
-                    purchase_item = await item_repo.send_to_purchase(update.item_id, current_user.id)
-                    if purchase_item:
-                        logger.info(f"Item {update.item_id} sent to purchase by user {current_user.id}")
-                        
-                        # Notificar envio para compras via WebSocket
-                        await notify_item_sent_to_purchase(order_id, update.item_id)
-                else:
-                    await item_repo.remove_from_purchase(update.item_id, current_user.id)
-                    logger.info(f"Item {update.item_id} removed from purchase by user {current_user.id}")
-            
-            if update.not_sent is not None:
-                if update.not_sent:
-                    # Marcar como não enviado
-                    item.not_sent = True
-                    item.not_sent_at = datetime.utcnow()
-                    item.not_sent_by_id = current_user.id
-                    logger.info(f"Item {update.item_id} marked as not sent by user {current_user.id}")
-                    
-                    # Notificar via WebSocket imediatamente após mudança
-                    # Progresso será recalculado depois
-                    await notify_item_not_sent(order_id, update.item_id, 0.0)  # Progress will be updated later
-                else:
-                    # Reverter não enviado
-                    item.not_sent = False
-                    item.not_sent_at = None
-                    item.not_sent_by_id = None
-                    logger.info(f"Item {update.item_id} marked as pending by user {current_user.id}")
-        
-        # Commit todas as mudanças
-        await session.commit()
         
-        # Recalcular progresso do pedido
-        updated_order = await order_repo.recalculate_progress(order_id)
+        # Um UPDATE por transição de estado, compras em lote
+        changes = await item_repo.apply_batch_update(updates.updates, states, current_user.id)
+        logger.info(
+            f"Order {order_id} items updated by user {current_user.id}: "
+            + ", ".join(f"{action}={item_ids}" for action, item_ids in changes.items() if item_ids)
+        )
+        
+        # Contadores e revisão do pedido por variação, na mesma transação dos itens
+        # (lote sem nenhuma transição real não altera o pedido)
+        updated_order = order
+        if any(changes.values()):
+            updated_order = await order_repo.apply_progress_delta(order_id, **item_repo.progress_delta(changes))
         await session.commit()
         
+        # Antes das notificações: os tablets buscam o detalhe ao recebê-las
+        if any(changes.values()):
+            await order_detail_cache.invalidate(order_id)
+        
+        progress_percentage = updated_order.progress_percentage if updated_order else 0.0
+        
+        # Notificar alterações dos itens via WebSocket
+        for item_id in changes["separated"]:
+            await notify_item_separated(order_id, item_id, progress_percentage)
+        for item_id in changes["sent_to_purchase"]:
+            await notify_item_sent_to_purchase(order_id, item_id)
+        for item_id in changes["not_sent"]:
+            await notify_item_not_sent(order_id, item_id, progress_percentage)
+        
         # Notificar atualização do pedido e verificar se foi completado
         if updated_order:
-            await notify_order_updated(order_id, updated_order.progress_percentage)
+            await notify_order_updated(order_id, progress_percentage)
             
             # Se pedido foi completado, notificar
-            if updated_order.progress_percentage >= 100.0:
+            if progress_percentage >= 100.0:
                 await notify_order_completed(order_id)
         
+        # Resposta compacta: itens do lote (já sincronizados na sessão) e contadores
+        if _wants_minimal(prefer, response_mode):
+            if response_mode is None:
+                response.headers["Preference-Applied"] = "return=minimal"
+            response.headers["ETag"] = _order_etag(updated_order.id, updated_order.revision)
+            # Mesmo progresso do detalhe completo (itens, não quantidades)
+            processed_items, total_items = await item_repo.get_progress_counts(order_id)
+            return OrderItemsDeltaResponse(
+                id=updated_order.id,
+                status=updated_order.status,
+                progress_percentage=_item_progress(processed_items, total_items),
+                items_count=updated_order.items_count,
+                items_separated=updated_order.items_separated,
+                items_in_purchase=updated_order.items_in_purchase,
+                items_not_sent=updated_order.items_not_sent,
+                items=[_item_response(states[item_id]) for item_id in dict.fromkeys(
+                    update.item_id for update in updates.updates
+                )]
+            )
+        
         # Retornar dados atualizados
-        return await get_order_detail(order_id, session, current_user)
+        return await get_order_detail(
+            order_id=order_id, if_none_match=None, session=session, current_user=current_user
+        )
         
     except HTTPException:
         raise
@@ -695,11 +1050,11 @@ async def send_item_to_purchase(
         
         # Enviar para compras
         purchase_item = await item_repo.send_to_purchase(item_id, current_user.id)
-        await session.commit()
         
-        # Recalcular progresso do pedido
-        updated_order = await order_repo.recalculate_progress(order_id)
+        # Atualizar contadores do pedido na mesma transação
+        updated_order = await order_repo.apply_progress_delta(order_id, in_purchase=1)
         await session.commit()
+        await order_detail_cache.invalidate(order_id)
         
         if purchase_item:
             logger.info(f"Item {item_id} sent to purchase by user {current_user.id}")
@@ -788,6 +1143,7 @@ async def complete_order(
         # Recalcular progresso para atualizar contadores
         await order_repo.update_progress(order_id)
         await session.commit()
+        await order_detail_cache.invalidate(order_id)
         
         logger.info(f"Order {order_id} completed manually by user {current_user.id}")
         
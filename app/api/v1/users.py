@@ -83,7 +83,7 @@ async def create_user(
             )
         
         # Criar usuário
-        user = await user_repo.create(
+        user = await user_repo.create_user(
             name=user_data.name,
             pin=user_data.pin,
             role=user_data.role
@@ -190,7 +190,7 @@ async def update_user(
         if user_data.name:
             user.name = user_data.name
         if user_data.pin:
-            user.set_pin(user_data.pin)
+            await user_repo.update_pin(user, user_data.pin)
         if user_data.role:
             user.role = user_data.role
             
@@ -206,19 +206,27 @@ def generate_secure_key(length: int = 32) -> str:
 
 
 def hash_password(password: str) -> str:
-    """Hash password securely"""
-    from passlib.context import CryptContext
+    """
+    Hash password securely.
     
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    return pwd_context.hash(password)
+    Blocking (bcrypt): from async code use
+    app.services.password_hasher.password_hasher.hash instead.
+    """
+    from app.core.security import get_password_hash
+    
+    return get_password_hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify password against hash"""
-    from passlib.context import CryptContext
+    """
+    Verify password against hash.
+    
+    Blocking (bcrypt): from async code use
+    app.services.password_hasher.password_hasher.verify instead.
+    """
+    from app.core.security import verify_password as _verify_password
     
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-    return pwd_context.verify(plain_password, hashed_password)
+    return _verify_password(plain_password, hashed_password)
 
 
 def sanitize_input(input_string: str) -> str:
@@ -5,7 +5,7 @@ from typing import List, Optional
 
 from sqlalchemy import (
     Column, Integer, String, Float, DateTime, 
-    Enum as SQLAlchemyEnum, ForeignKey
+    Enum as SQLAlchemyEnum, ForeignKey, Index
 )
 from sqlalchemy.orm import relationship
 
@@ -29,6 +29,12 @@ class Order(Base):
     """
     __tablename__ = "orders"
     
+    # Paginação por cursor em (created_at, id), com e sem filtro de status
+    __table_args__ = (
+        Index('idx_orders_created_at_id', 'created_at', 'id'),
+        Index('idx_orders_status_created_at_id', 'status', 'created_at', 'id'),
+    )
+    
     # Primary key
     id = Column(Integer, primary_key=True, index=True)
     
@@ -57,6 +63,9 @@ class Order(Base):
     items_in_purchase = Column(Integer, default=0, nullable=False)
     items_not_sent = Column(Integer, default=0, nullable=False)
     
+    # Versão do pedido (ETag): incrementada a cada alteração do pedido ou dos itens
+    revision = Column(Integer, default=0, server_default="0", nullable=False)
+    
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -81,13 +90,27 @@ class Order(Base):
         # Usar contadores para evitar lazy loading quando disponíveis
         # Itens separados E não enviados contam como processados
         if self.items_separated is not None and self.items_not_sent is not None:
-            processed_items = self.items_separated + self.items_not_sent
-        else:
-            # Fallback para contar diretamente os itens (usado em testes)
-            processed_items = sum(1 for item in self.items if item.is_separated or item.not_sent)
-            
+            return self.calculate_progress(self.items_count, self.items_separated, self.items_not_sent)
+        
+        # Fallback para contar diretamente os itens (usado em testes)
+        processed_items = sum(1 for item in self.items if item.is_separated or item.not_sent)
         return (processed_items / self.items_count) * 100
     
+    @staticmethod
+    def calculate_progress(items_count: int, items_separated: int, items_not_sent: int) -> float:
+        """
+        Porcentagem de progresso a partir dos contadores do pedido.
+        
+        Usado por consultas que selecionam só as colunas, sem carregar o
+        pedido como objeto.
+        
+        Returns:
+            float: Porcentagem de 0 a 100
+        """
+        if not items_count:
+            return 0.0
+        return ((items_separated + items_not_sent) / items_count) * 100
+    
     @property
     def is_complete(self) -> bool:
         """
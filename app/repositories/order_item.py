@@ -1,13 +1,14 @@
 """Repository para operações com itens de pedido."""
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
-from sqlalchemy import select, and_
+from sqlalchemy import select, and_, or_, update, insert, delete, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models.order_item import OrderItem
 from app.models.purchase_item import PurchaseItem
 from app.repositories.base import BaseRepository
+from app.schemas.orders import OrderItemUpdate
 
 
 class OrderItemRepository(BaseRepository[OrderItem]):
@@ -209,6 +210,159 @@ class OrderItemRepository(BaseRepository[OrderItem]):
         await self.session.flush()
         return items
     
+    async def get_item_states(self, order_id: int, item_ids: List[int]) -> Dict[int, OrderItem]:
+        """
+        Busca, em uma consulta, os itens do lote que pertencem ao pedido.
+        
+        Os itens ficam na sessão: os UPDATEs de apply_batch_update são
+        sincronizados neles, então depois do lote eles já têm o estado
+        final, sem nova consulta.
+        
+        Args:
+            order_id: ID do pedido
+            item_ids: IDs dos itens
+            
+        Returns:
+            Dict[int, OrderItem]: Itens do pedido por ID (itens de outros
+            pedidos ou inexistentes ficam de fora)
+        """
+        if not item_ids:
+            return {}
+        
+        query = select(OrderItem).where(
+            and_(
+                OrderItem.id.in_(set(item_ids)),
+                OrderItem.order_id == order_id
+            )
+        )
+        result = await self.session.execute(query)
+        return {item.id: item for item in result.scalars().all()}
+    
+    async def apply_batch_update(
+        self,
+        updates: List[OrderItemUpdate],
+        states: Dict[int, OrderItem],
+        user_id: int
+    ) -> Dict[str, List[int]]:
+        """
+        Aplica um lote de atualizações com um comando por transição de estado.
+        
+        As atualizações são agrupadas por ação: um UPDATE ... WHERE id IN
+        (...) para cada transição (separar, desfazer separação, enviar para
+        compras, tirar de compras, não enviado, pendente), um INSERT em lote
+        dos PurchaseItem e um DELETE em lote dos removidos. Só mudam os
+        itens que ainda não estão no estado pedido. Se o mesmo item aparece
+        mais de uma vez, vale o último valor de cada campo. Não faz commit.
+        
+        Args:
+            updates: Atualizações do lote (itens já validados)
+            states: Estado atual de cada item (get_item_states)
+            user_id: ID do usuário
+            
+        Returns:
+            Dict[str, List[int]]: IDs dos itens por transição (separated,
+            unseparated, sent_to_purchase, removed_from_purchase, not_sent,
+            pending), na ordem do lote; ver progress_delta
+        """
+        separated: Dict[int, bool] = {}
+        sent_to_purchase: Dict[int, bool] = {}
+        not_sent: Dict[int, bool] = {}
+        for item_update in updates:
+            if item_update.separated is not None:
+                separated[item_update.item_id] = item_update.separated
+            if item_update.sent_to_purchase is not None:
+                sent_to_purchase[item_update.item_id] = item_update.sent_to_purchase
+            if item_update.not_sent is not None:
+                not_sent[item_update.item_id] = item_update.not_sent
+        
+        def changed(requested: Dict[int, bool], field: str, value: bool) -> List[int]:
+            return [
+                item_id for item_id, target in requested.items()
+                if target == value and getattr(states[item_id], field) != value
+            ]
+        
+        changes = {
+            "separated": changed(separated, "is_separated", True),
+            "unseparated": changed(separated, "is_separated", False),
+            "sent_to_purchase": changed(sent_to_purchase, "sent_to_purchase", True),
+            "removed_from_purchase": changed(sent_to_purchase, "sent_to_purchase", False),
+            "not_sent": changed(not_sent, "not_sent", True),
+            "pending": changed(not_sent, "not_sent", False),
+        }
+        
+        now = datetime.utcnow()
+        transitions = (
+            ("separated", {"is_separated": True, "separated_at": now, "separated_by_id": user_id}),
+            ("unseparated", {"is_separated": False, "separated_at": None, "separated_by_id": None}),
+            ("sent_to_purchase", {
+                "sent_to_purchase": True, "sent_to_purchase_at": now, "sent_to_purchase_by_id": user_id
+            }),
+            ("removed_from_purchase", {
+                "sent_to_purchase": False, "sent_to_purchase_at": None, "sent_to_purchase_by_id": None
+            }),
+            ("not_sent", {"not_sent": True, "not_sent_at": now, "not_sent_by_id": user_id}),
+            ("pending", {"not_sent": False, "not_sent_at": None, "not_sent_by_id": None}),
+        )
+        for action, values in transitions:
+            if changes[action]:
+                await self.session.execute(
+                    update(OrderItem).where(OrderItem.id.in_(changes[action])).values(**values)
+                )
+        
+        if changes["removed_from_purchase"]:
+            await self.session.execute(
+                delete(PurchaseItem).where(PurchaseItem.order_item_id.in_(changes["removed_from_purchase"]))
+            )
+        if changes["sent_to_purchase"]:
+            await self.session.execute(
+                insert(PurchaseItem),
+                [
+                    {"order_item_id": item_id, "requested_by_id": user_id, "requested_at": now}
+                    for item_id in changes["sent_to_purchase"]
+                ]
+            )
+        
+        return changes
+    
+    @staticmethod
+    def progress_delta(changes: Dict[str, List[int]]) -> Dict[str, int]:
+        """
+        Variação dos contadores do pedido causada pelas transições de apply_batch_update.
+        
+        Args:
+            changes: Resultado de apply_batch_update
+            
+        Returns:
+            Dict[str, int]: Argumentos de OrderRepository.apply_progress_delta
+        """
+        return {
+            "separated": len(changes["separated"]) - len(changes["unseparated"]),
+            "in_purchase": len(changes["sent_to_purchase"]) - len(changes["removed_from_purchase"]),
+            "not_sent": len(changes["not_sent"]) - len(changes["pending"]),
+        }
+    
+    async def get_progress_counts(self, order_id: int) -> Tuple[int, int]:
+        """
+        Conta, em uma consulta, os itens processados e o total de itens do pedido.
+        
+        Processado é o item separado OU não enviado (compras não contam),
+        contado uma vez mesmo com as duas marcações: a mesma regra do
+        detalhe do pedido, sem carregar os itens.
+        
+        Args:
+            order_id: ID do pedido
+            
+        Returns:
+            Tuple[int, int]: (itens processados, total de itens)
+        """
+        processed = func.count(OrderItem.id).filter(
+            or_(OrderItem.is_separated == True, OrderItem.not_sent == True)
+        )
+        query = select(processed, func.count(OrderItem.id)).where(OrderItem.order_id == order_id)
+        result = await self.session.execute(query)
+        processed_items, total_items = result.one()
+        return processed_items, total_items
+    
     async def count_all(self) -> int:
         """
         Conta o total de itens.
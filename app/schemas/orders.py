@@ -77,6 +77,40 @@ class OrderDetailResponse(BaseModel):
         from_attributes = True
 
 
+class OrderItemsDeltaResponse(BaseModel):
+    """
+    Schema para a resposta compacta da atualização de itens.
+    
+    Só os itens do lote e os contadores do pedido, sem os demais itens
+    (`Prefer: return=minimal` ou `?response=delta`).
+    """
+    id: int = Field(..., description="ID do pedido")
+    status: str = Field(..., description="Status do pedido")
+    progress_percentage: float = Field(..., description="Porcentagem de progresso")
+    items_count: int = Field(..., description="Quantidade total de itens")
+    items_separated: int = Field(..., description="Itens separados")
+    items_in_purchase: int = Field(..., description="Itens em compras")
+    items_not_sent: int = Field(..., description="Itens não enviados")
+    items: List[OrderItemResponse] = Field(..., description="Itens alterados, na ordem do lote")
+
+
+class OrderListItem(BaseModel):
+    """
+    Schema para um pedido na listagem.
+    
+    Mesmos campos de OrderResponse; com `fields=` na listagem, só os
+    campos pedidos vêm na resposta.
+    """
+    id: Optional[int] = Field(None, description="ID do pedido")
+    order_number: Optional[str] = Field(None, description="Número do orçamento")
+    client_name: Optional[str] = Field(None, description="Nome do cliente")
+    seller_name: Optional[str] = Field(None, description="Nome do vendedor")
+    total_value: Optional[float] = Field(None, description="Valor total")
+    items_count: Optional[int] = Field(None, description="Quantidade total de itens")
+    progress_percentage: Optional[float] = Field(None, description="Porcentagem de progresso")
+    created_at: Optional[datetime] = Field(None, description="Data de criação")
+
+
 class OrderStats(BaseModel):
     """Schema para estatísticas do dashboard."""
     total_orders: int = Field(..., description="Total de pedidos")
@@ -147,7 +181,11 @@ class WebSocketMessage(BaseModel):
         "user_left",
         "order_completed",
         "new_order",
-        "order_access"
+        "order_access",
+        "presence_update",
+        "pong",
+        "import_progress",
+        "import_done"
     ] = Field(..., description="Tipo da mensagem")
     data: Dict[str, Any] = Field(..., description="Dados da mensagem")
     timestamp: datetime = Field(default_factory=datetime.now, description="Timestamp da mensagem")
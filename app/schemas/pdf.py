@@ -2,8 +2,8 @@
 Schemas Pydantic para upload e processamento de PDFs.
 """
 from datetime import datetime
-from typing import List, Optional
-from pydantic import BaseModel, Field, validator
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, root_validator, validator
 
 
 def normalize_logistics_type(logistics_type: str) -> str:
@@ -170,6 +170,9 @@ class PDFPreviewResponse(BaseModel):
     # Informações para validação do vendedor
     validation_info: Optional[dict] = Field(None, description="Informações para validação")
     
+    # Token do preview guardado no servidor, usado no /confirm
+    preview_token: Optional[str] = Field(None, description="Token para confirmar o pedido sem reenviar os dados")
+    
     @property
     def summary(self) -> Optional[dict]:
         """Retorna resumo para validação do vendedor."""
@@ -211,9 +214,70 @@ class PDFPreviewResponse(BaseModel):
         }
 
 
+class ImportJobResponse(BaseModel):
+    """Schema para o estado de uma importação assíncrona de PDF."""
+    job_id: str = Field(..., description="ID da importação")
+    status: Literal["pending", "running", "done", "failed"] = Field(..., description="Situação da importação")
+    filename: str = Field(..., description="Nome do arquivo enviado")
+    pages_total: int = Field(0, description="Páginas do PDF (0 se ainda não conhecido)")
+    pages_done: int = Field(0, description="Páginas processadas")
+    items_found: int = Field(0, description="Itens encontrados até agora")
+    created_at: datetime = Field(..., description="Data de criação")
+    updated_at: datetime = Field(..., description="Última atualização")
+    result: Optional[PDFPreviewResponse] = Field(None, description="Preview ao terminar (done ou failed)")
+
+
+class BatchUploadFileResult(BaseModel):
+    """Schema para o resultado de um arquivo do upload em lote."""
+    filename: str = Field(..., description="Nome do arquivo enviado")
+    content_hash: Optional[str] = Field(None, description="SHA-256 do conteúdo")
+    status: Literal["parsed", "duplicate_file", "duplicate_order", "existing_order", "failed"] = Field(
+        ..., description="Resultado do arquivo"
+    )
+    duplicate_of: Optional[str] = Field(None, description="Arquivo do lote com o mesmo conteúdo ou pedido")
+    existing_order_id: Optional[int] = Field(None, description="ID do pedido já cadastrado")
+    preview: Optional[PDFPreviewResponse] = Field(None, description="Preview dos dados extraídos")
+
+
+class BatchUploadResponse(BaseModel):
+    """Schema para response do upload em lote."""
+    total: int = Field(..., description="Arquivos enviados")
+    parsed: int = Field(..., description="Arquivos prontos para confirmação")
+    duplicates: int = Field(..., description="Arquivos repetidos no lote (conteúdo ou pedido)")
+    existing_orders: int = Field(..., description="Arquivos de pedidos já cadastrados")
+    failed: int = Field(..., description="Arquivos com erro")
+    results: List[BatchUploadFileResult] = Field(..., description="Resultado por arquivo, na ordem do envio")
+
+
+class OrderImportRowError(BaseModel):
+    """Schema para um pedido rejeitado na importação em massa."""
+    line: int = Field(..., description="Linha do arquivo onde o pedido começa")
+    order_number: Optional[str] = Field(None, description="Número do pedido, se legível")
+    message: str = Field(..., description="Motivo da rejeição")
+
+
+class OrderImportResult(BaseModel):
+    """Schema para o resultado da importação em massa de pedidos."""
+    total_rows: int = Field(..., description="Pedidos lidos do arquivo")
+    imported: int = Field(..., description="Pedidos criados")
+    items_imported: int = Field(..., description="Itens criados")
+    skipped_existing: int = Field(..., description="Pedidos já cadastrados (ignorados)")
+    duplicates: int = Field(..., description="Pedidos repetidos no arquivo (ignorados)")
+    invalid: int = Field(..., description="Pedidos rejeitados na validação")
+    errors: List[OrderImportRowError] = Field(default_factory=list, description="Primeiras rejeições")
+    elapsed_seconds: float = Field(..., description="Duração da importação")
+
+
 class OrderCreateFromPDF(BaseModel):
-    """Schema para criação de pedido a partir do PDF."""
-    pdf_data: PDFExtractedData = Field(..., description="Dados extraídos do PDF")
+    """
+    Schema para criação de pedido a partir do PDF.
+    
+    O pedido é identificado pelo `preview_token` devolvido no upload (dados
+    guardados no servidor) ou, por compatibilidade, pelos dados completos
+    em `pdf_data`.
+    """
+    pdf_data: Optional[PDFExtractedData] = Field(None, description="Dados extraídos do PDF")
+    preview_token: Optional[str] = Field(None, description="Token do preview devolvido pelo upload")
     logistics_type: Optional[str] = Field(None, description="Tipo de logística")
     package_type: Optional[str] = Field(None, description="Tipo de embalagem")
     observations: Optional[str] = Field(None, max_length=500, description="Observações")
@@ -242,6 +306,13 @@ class OrderCreateFromPDF(BaseModel):
                 raise ValueError(f"Invalid package type. Allowed: {allowed_types}")
             return normalized
         return v
+    
+    @root_validator(skip_on_failure=True)
+    def validate_source(cls, values):
+        """Exige o token do preview ou os dados do PDF."""
+        if not values.get('preview_token') and values.get('pdf_data') is None:
+            raise ValueError("preview_token or pdf_data is required")
+        return values
 
 
 class OrderResponse(BaseModel):
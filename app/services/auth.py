@@ -3,7 +3,8 @@ from fastapi import HTTPException, status
 from ..repositories.user import UserRepository
 from ..repositories.order import OrderRepository
 from ..repositories.order_access import OrderAccessRepository
-from ..core.security import verify_password, create_access_token
+from ..core.security import create_access_token
+from .password_hasher import password_hasher
 from ..schemas.auth import LoginRequest, TokenResponse, OrderAccessRequest, OrderAccessResponse, UserResponse
 
 class AuthService:
@@ -15,14 +16,8 @@ class AuthService:
     
     async def login(self, login_data: LoginRequest) -> TokenResponse:
         """Autentica usuário com PIN e retorna token"""
-        # Busca todos os usuários e verifica PIN
-        users = await self.user_repo.get_all_users()
-        
-        user = None
-        for u in users:
-            if verify_password(login_data.pin, u.pin_hash):
-                user = u
-                break
+        # Busca indexada pelo PIN e uma única verificação bcrypt
+        user = await self._find_user_by_pin(login_data.pin)
         
         if not user:
             raise HTTPException(
@@ -50,6 +45,13 @@ class AuthService:
             }
         )
     
+    async def _find_user_by_pin(self, pin: str):
+        """Busca o usuário pela chave do PIN e confirma com o hash bcrypt"""
+        user = await self.user_repo.get_by_pin(pin)
+        if user and await password_hasher.verify(pin, user.pin_hash):
+            return user
+        return None
+    
     async def get_current_user(self, user_id: int):
         """Retorna usuário atual pelo ID do token"""
         user = await self.user_repo.get(user_id)
@@ -80,12 +82,7 @@ class AuthService:
                 )
             
             # Buscar usuário por PIN
-            users = await self.user_repo.get_all_users()
-            user = None
-            for u in users:
-                if verify_password(access_data.pin, u.pin_hash):
-                    user = u
-                    break
+            user = await self._find_user_by_pin(access_data.pin)
             
             if not user:
                 raise HTTPException(
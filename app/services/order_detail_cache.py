@@ -0,0 +1,172 @@
+"""
+Cache de leitura do detalhe de pedidos (GET /orders/{id}/detail).
+
+Os tablets consultam o detalhe do mesmo pedido a cada evento do
+WebSocket. O JSON do detalhe é guardado pela chave
+`CacheKeys.order_detail_key` em dois níveis: um LRU em memória do processo
+e, quando REDIS_URL está configurado, o Redis compartilhado entre instâncias. Cada entrada
+leva a revisão do pedido com que foi montada e só é usada se ainda for a
+revisão atual; assim um processo nunca serve o detalhe de outro processo
+que já mudou. As mutações de itens e do pedido invalidam a entrada (local
+e Redis) logo após o commit.
+"""
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.cache import Cache, CacheKeys
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class OrderDetailCache:
+    """
+    Cache em dois níveis (LRU local + Redis) do JSON do detalhe de pedidos.
+
+    As entradas são (revisão, corpo JSON); a busca recebe a revisão atual
+    do pedido e descarta entradas de revisões anteriores.
+    """
+
+    def __init__(self, max_entries: int = 500, ttl: int = 600, use_redis: bool = True):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries: Máximo de pedidos no LRU local (0 = desativado)
+            ttl: Validade de cada entrada em segundos
+            use_redis: Usar o Redis como segundo nível
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.use_redis = use_redis
+
+        self._entries: "OrderedDict[str, Tuple[float, int, bytes]]" = OrderedDict()
+
+        # Métricas
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    def _get_local(self, key: str, revision: int) -> Optional[bytes]:
+        """Busca no LRU local, descartando entradas expiradas ou de outra revisão."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, cached_revision, body = entry
+        if expires_at <= time.monotonic() or cached_revision != revision:
+            if cached_revision != revision:
+                self._stale += 1
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def _set_local(self, key: str, revision: int, body: bytes) -> None:
+        """Armazena no LRU local, removendo as entradas menos recentes."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, revision, body)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def get(self, order_id: int, revision: int) -> Optional[bytes]:
+        """
+        Busca o JSON do detalhe do pedido na revisão atual.
+
+        Args:
+            order_id: ID do pedido
+            revision: Revisão atual do pedido
+
+        Returns:
+            Optional[bytes]: Corpo JSON do detalhe ou None
+        """
+        key = CacheKeys.order_detail_key(order_id)
+
+        body = self._get_local(key, revision)
+        if body is not None:
+            self._hits += 1
+            return body
+
+        entry = await Cache.get(key) if self.use_redis else None
+        if entry is not None:
+            cached_revision, body = entry
+            if cached_revision == revision:
+                self._redis_hits += 1
+                self._set_local(key, revision, body)
+                return body
+            self._stale += 1
+
+        self._misses += 1
+        return None
+
+    async def set(self, order_id: int, revision: int, body: bytes) -> None:
+        """
+        Armazena o JSON do detalhe do pedido.
+
+        Args:
+            order_id: ID do pedido
+            revision: Revisão do pedido com que o detalhe foi montado
+            body: Corpo JSON do detalhe
+        """
+        key = CacheKeys.order_detail_key(order_id)
+        self._set_local(key, revision, body)
+        if self.use_redis:
+            await Cache.set(key, (revision, body), self.ttl)
+
+    async def invalidate(self, order_id: int) -> None:
+        """
+        Remove o detalhe do pedido do LRU local e do Redis.
+
+        Deve ser chamado após o commit de qualquer alteração do pedido ou
+        dos itens. Só a chave do detalhe é removida (um DEL, sem varrer o
+        Redis); entradas de outra revisão já são descartadas na leitura.
+
+        Args:
+            order_id: ID do pedido
+        """
+        key = CacheKeys.order_detail_key(order_id)
+        self._entries.pop(key, None)
+        self._invalidations += 1
+        if self.use_redis:
+            await Cache.delete(key)
+
+    def clear(self) -> None:
+        """Limpa o LRU local."""
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do cache.
+
+        Returns:
+            Dict[str, Any]: Entradas, acertos por nível, falhas, entradas
+            desatualizadas, invalidações e remoções
+        """
+        lookups = self._hits + self._redis_hits + self._misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "redis": self.use_redis,
+            "hits": self._hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "stale": self._stale,
+            "invalidations": self._invalidations,
+            "evictions": self._evictions,
+            "hit_rate": round((self._hits + self._redis_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Instância global do serviço
+order_detail_cache = OrderDetailCache(
+    max_entries=settings.ORDER_DETAIL_CACHE_MAX_ENTRIES,
+    ttl=settings.ORDER_DETAIL_CACHE_TTL,
+    use_redis=bool(settings.REDIS_URL)
+)
@@ -0,0 +1,176 @@
+"""
+Serviço de hash de senhas/PINs fora do event loop.
+
+O bcrypt consome ~100 ms de CPU por chamada. Executado direto em um handler
+assíncrono, ele trava o event loop do uvicorn inteiro (inclusive o fan-out
+dos WebSockets). Este serviço executa hash e verificação em um pool de
+threads limitado e controla quantas operações podem estar em andamento.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.security import get_password_hash, verify_password
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """
+    Executor assíncrono de bcrypt com pool de threads limitado.
+
+    O bcrypt libera o GIL durante o cálculo, então as threads do pool
+    rodam em paralelo sem bloquear o event loop. Um semáforo limita as
+    operações submetidas ao pool; as excedentes aguardam na fila
+    (exposta como `queue_depth` nas métricas).
+    """
+
+    def __init__(self, max_workers: int = 4, max_concurrency: Optional[int] = None):
+        """
+        Inicializa o serviço.
+
+        Args:
+            max_workers: Número de threads do pool
+            max_concurrency: Máximo de operações simultâneas no pool
+                (padrão: igual a max_workers)
+        """
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency or max_workers
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+
+        # O semáforo pertence ao event loop em que foi criado
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Métricas
+        self._waiting = 0
+        self._in_flight = 0
+        self._completed = 0
+        self._errors = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._last_ms = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Obtém ou cria o pool de threads."""
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers,
+                        thread_name_prefix="password-hasher"
+                    )
+        return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Obtém o semáforo do event loop atual."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    @staticmethod
+    def _timed(func, *args):
+        """Executa a função no pool e devolve o resultado com o tempo gasto."""
+        start = time.perf_counter()
+        result = func(*args)
+        return result, (time.perf_counter() - start) * 1000
+
+    def _record(self, elapsed_ms: float) -> None:
+        """Registra o tempo de uma operação concluída."""
+        self._completed += 1
+        self._total_ms += elapsed_ms
+        self._last_ms = elapsed_ms
+        if elapsed_ms > self._max_ms:
+            self._max_ms = elapsed_ms
+
+    async def _run(self, func, *args):
+        """Agenda a função no pool respeitando o limite de concorrência."""
+        semaphore = self._get_semaphore()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed_ms = await loop.run_in_executor(
+                self._get_executor(), self._timed, func, *args
+            )
+        except Exception:
+            self._errors += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            semaphore.release()
+
+        self._record(elapsed_ms)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """
+        Gera o hash bcrypt sem bloquear o event loop.
+
+        Args:
+            password: Senha ou PIN em texto puro
+
+        Returns:
+            str: Hash bcrypt
+        """
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifica a senha contra o hash sem bloquear o event loop.
+
+        Args:
+            plain_password: Senha ou PIN em texto puro
+            hashed_password: Hash bcrypt armazenado
+
+        Returns:
+            bool: True se a senha confere
+        """
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do serviço.
+
+        Returns:
+            Dict[str, Any]: Fila, operações em andamento e tempos de hash
+        """
+        return {
+            "workers": self.max_workers,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self._waiting,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "errors": self._errors,
+            "avg_hash_ms": round(self._total_ms / self._completed, 2) if self._completed else 0.0,
+            "max_hash_ms": round(self._max_ms, 2),
+            "last_hash_ms": round(self._last_ms, 2),
+        }
+
+    def shutdown(self) -> None:
+        """Encerra o pool de threads."""
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
+                logger.info("Password hasher executor shut down")
+
+
+# Instância global do serviço
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY
+)
@@ -0,0 +1,409 @@
+"""
+Importação assíncrona de PDFs com progresso via WebSocket.
+
+O upload cria uma importação e responde imediatamente com o ID; o parsing
+roda em segundo plano no pool de processos. O progresso (páginas
+processadas, itens encontrados) e o resultado final são enviados ao
+usuário que fez o upload pelo connection_manager, como mensagens
+`import_progress` e `import_done`. O estado de cada importação fica em um
+store em memória com expiração (TTL), consultado pelo endpoint de polling
+quando o WebSocket não está disponível.
+
+Um semáforo limita as importações em execução; as excedentes aguardam
+como `pending`, até `max_queued`, e acima disso o upload é recusado.
+"""
+import asyncio
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Set
+
+from app.core.config import settings
+from app.schemas.orders import WebSocketMessage
+from app.schemas.pdf import ImportJobResponse, PDFExtractedData, PDFPreviewResponse
+from app.services.pdf_parse_cache import PDFParseCache, pdf_parse_cache
+from app.services.pdf_parser import PDFParser, PDFParseError
+from app.services.pdf_parser_pool import PDFParserPool, pdf_parser_pool
+from app.services.pdf_preview_store import PDFPreviewStore, pdf_preview_store
+from app.services.websocket import connection_manager
+
+logger = logging.getLogger(__name__)
+
+# Situação da importação
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class ImportQueueFullError(Exception):
+    """Exceção quando a fila de importações está cheia."""
+    pass
+
+
+def build_pdf_preview(extracted_data: Dict[str, Any]) -> PDFPreviewResponse:
+    """
+    Monta o preview do PDF com as informações de validação do vendedor.
+
+    Args:
+        extracted_data: Dados extraídos pelo parser
+
+    Returns:
+        PDFPreviewResponse: Preview com os dados e a conferência dos totais
+    """
+    # Converte para schema Pydantic para validação
+    pdf_data = PDFExtractedData(**extracted_data)
+
+    # Criar informações de validação para o vendedor
+    validation_info = {
+        "calculated_total": pdf_data.calculated_total,
+        "pdf_total": pdf_data.total_value,
+        "items_count": pdf_data.items_count,
+        "models_count": pdf_data.models_count,
+        "totals_match": abs(pdf_data.calculated_total - pdf_data.total_value) <= 0.01,
+        "difference": abs(pdf_data.calculated_total - pdf_data.total_value)
+    }
+
+    return PDFPreviewResponse(
+        success=True,
+        message="PDF processado com sucesso",
+        data=pdf_data,
+        errors=None,
+        validation_info=validation_info
+    )
+
+
+class ImportJob:
+    """Estado de uma importação de PDF."""
+
+    def __init__(self, job_id: str, user_id: int, filename: str):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.filename = filename
+        self.status = PENDING
+        self.pages_total = 0
+        self.pages_done = 0
+        self.items_found = 0
+        self.result: Optional[PDFPreviewResponse] = None
+        self.created_at = datetime.now()
+        self.updated_at = self.created_at
+
+    @property
+    def finished(self) -> bool:
+        """Se a importação terminou (com sucesso ou erro)."""
+        return self.status in (DONE, FAILED)
+
+    def to_response(self) -> ImportJobResponse:
+        """Estado da importação no formato da API."""
+        return ImportJobResponse(
+            job_id=self.job_id,
+            status=self.status,
+            filename=self.filename,
+            pages_total=self.pages_total,
+            pages_done=self.pages_done,
+            items_found=self.items_found,
+            created_at=self.created_at,
+            updated_at=self.updated_at,
+            result=self.result
+        )
+
+
+class ImportJobStore:
+    """
+    Importações em memória, com expiração e limite de tamanho.
+
+    Cada importação terminada expira `ttl` segundos após a última
+    atualização. Acima de `max_jobs`, as importações terminadas mais antigas
+    são removidas primeiro. Importações pendentes ou em execução nunca são
+    removidas: o cliente continua consultando até o resultado.
+    """
+
+    def __init__(self, ttl: int = 3600, max_jobs: int = 1000):
+        """
+        Inicializa o store.
+
+        Args:
+            ttl: Segundos que uma importação fica disponível após a última atualização
+            max_jobs: Máximo de importações mantidas
+        """
+        self.ttl = ttl
+        self.max_jobs = max_jobs
+
+        self._jobs: "OrderedDict[str, ImportJob]" = OrderedDict()
+        self._expires_at: Dict[str, float] = {}
+
+        # Métricas
+        self._created = 0
+        self._evictions = 0
+
+    def create(self, user_id: int, filename: str) -> ImportJob:
+        """
+        Cria uma importação.
+
+        Args:
+            user_id: Usuário que enviou o arquivo
+            filename: Nome do arquivo
+
+        Returns:
+            ImportJob: Importação pendente
+        """
+        self._evict()
+        job = ImportJob(uuid.uuid4().hex, user_id, filename)
+        self._jobs[job.job_id] = job
+        self.touch(job)
+        self._created += 1
+
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            finished = [job_id for job_id, stored in self._jobs.items() if stored.finished]
+            for job_id in finished[:excess]:
+                self._remove(job_id)
+        return job
+
+    def touch(self, job: ImportJob) -> None:
+        """Registra uma atualização, renovando a expiração."""
+        job.updated_at = datetime.now()
+        self._expires_at[job.job_id] = time.monotonic() + self.ttl
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """
+        Busca uma importação.
+
+        Returns:
+            Optional[ImportJob]: A importação ou None se não existir ou expirou
+        """
+        self._evict()
+        return self._jobs.get(job_id)
+
+    def _remove(self, job_id: str) -> None:
+        """Remove uma importação do store."""
+        self._expires_at.pop(job_id, None)
+        self._jobs.pop(job_id, None)
+        self._evictions += 1
+
+    def _evict(self) -> None:
+        """Remove as importações terminadas e expiradas."""
+        now = time.monotonic()
+        expired = [
+            job_id for job_id, expires_at in self._expires_at.items()
+            if expires_at <= now and self._jobs[job_id].finished
+        ]
+        for job_id in expired:
+            self._remove(job_id)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do store.
+
+        Returns:
+            Dict[str, Any]: Importações por situação, criadas e removidas
+        """
+        by_status = {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        for job in self._jobs.values():
+            by_status[job.status] += 1
+        return {
+            "jobs": len(self._jobs),
+            "by_status": by_status,
+            "created": self._created,
+            "evictions": self._evictions,
+        }
+
+
+class PDFImportService:
+    """Executa importações de PDF em segundo plano."""
+
+    def __init__(
+        self,
+        store: ImportJobStore,
+        pool: PDFParserPool = pdf_parser_pool,
+        cache: PDFParseCache = pdf_parse_cache,
+        previews: PDFPreviewStore = pdf_preview_store,
+        progress_interval: float = 0.25,
+        max_concurrency: int = 2,
+        max_queued: int = 50
+    ):
+        """
+        Inicializa o serviço.
+
+        Args:
+            store: Store das importações
+            pool: Pool de parsing
+            cache: Cache de resultados de parsing
+            previews: Store dos previews para o /confirm
+            progress_interval: Intervalo mínimo (s) entre mensagens de progresso
+            max_concurrency: Máximo de importações em execução
+            max_queued: Máximo de importações aguardando execução
+        """
+        self.store = store
+        self.pool = pool
+        self.cache = cache
+        self.previews = previews
+        self.progress_interval = progress_interval
+        self.max_concurrency = max_concurrency
+        self.max_queued = max_queued
+
+        # O semáforo pertence ao event loop em que foi criado
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._waiting = 0
+
+        # Referências às tarefas em execução (evita coleta pelo GC)
+        self._tasks: Set[asyncio.Task] = set()
+        self._last_progress_sent: Dict[str, float] = {}
+
+    def submit(self, content: bytes, user_id: int, filename: str) -> ImportJob:
+        """
+        Cria uma importação e inicia o parsing em segundo plano.
+
+        Args:
+            content: Conteúdo do arquivo PDF
+            user_id: Usuário que enviou o arquivo
+            filename: Nome do arquivo
+
+        Returns:
+            ImportJob: Importação pendente
+
+        Raises:
+            ImportQueueFullError: Se `max_queued` importações já aguardam execução
+        """
+        if self._waiting >= self.max_queued:
+            raise ImportQueueFullError(f"{self._waiting} importações aguardando execução")
+        job = self.store.create(user_id, filename)
+        self._waiting += 1
+        self._spawn(self._run(job, content))
+        logger.info(f"PDF import {job.job_id} queued for user {user_id}: {filename}")
+        return job
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        """Busca uma importação pelo ID."""
+        return self.store.get(job_id)
+
+    def _spawn(self, coroutine) -> None:
+        """Executa uma corrotina em segundo plano, mantendo sua referência."""
+        task = asyncio.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Obtém o semáforo do event loop atual."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, job: ImportJob, content: bytes) -> None:
+        """Aguarda uma vaga entre as importações em execução e executa a importação."""
+        semaphore = self._get_semaphore()
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            await self._import(job, content)
+        finally:
+            semaphore.release()
+
+    async def _import(self, job: ImportJob, content: bytes) -> None:
+        """Executa o parsing e envia o resultado ao usuário."""
+        job.status = RUNNING
+        self.store.touch(job)
+        try:
+            # Reenvio do mesmo arquivo: reaproveita o parsing anterior
+            extracted_data = await self.cache.get(content)
+            if extracted_data is None:
+                job.pages_total = await asyncio.to_thread(PDFParser.count_pages, content)
+                await self._send_progress(job)
+                extracted_data = await self.pool.parse_bytes(
+                    content,
+                    progress=lambda pages_done, items_found: self._on_progress(job, pages_done, items_found)
+                )
+                await self.cache.set(content, extracted_data)
+            result = build_pdf_preview(extracted_data)
+            result.preview_token = await self.previews.put(result.data, job.user_id)
+            job.status = DONE
+            job.pages_done = job.pages_total or job.pages_done
+            job.items_found = len(result.data.items)
+            logger.info(
+                f"PDF import {job.job_id} done for user {job.user_id}: "
+                f"order {result.data.order_number}, {len(result.data.items)} items"
+            )
+        except PDFParseError as e:
+            logger.warning(f"PDF import {job.job_id} parse error for user {job.user_id}: {str(e)}")
+            job.status = FAILED
+            result = PDFPreviewResponse(
+                success=False,
+                message="Erro ao processar PDF",
+                data=None,
+                errors=[str(e)]
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error in PDF import {job.job_id} for user {job.user_id}: {str(e)}")
+            job.status = FAILED
+            result = PDFPreviewResponse(
+                success=False,
+                message="Erro interno ao processar PDF",
+                data=None,
+                errors=[str(e)]
+            )
+
+        job.result = result
+        self.store.touch(job)
+        self._last_progress_sent.pop(job.job_id, None)
+        await connection_manager.send_personal_message(WebSocketMessage(
+            type="import_done",
+            data=job.to_response().model_dump(mode="json")
+        ), job.user_id)
+
+    def _on_progress(self, job: ImportJob, pages_done: int, items_found: int) -> None:
+        """Recebe o progresso do parsing (no event loop)."""
+        if job.finished:
+            return
+        job.pages_done = pages_done
+        job.items_found = items_found
+        self.store.touch(job)
+
+        now = time.monotonic()
+        last_sent = self._last_progress_sent.get(job.job_id, 0.0)
+        if now - last_sent >= self.progress_interval or pages_done == job.pages_total:
+            self._last_progress_sent[job.job_id] = now
+            self._spawn(self._send_progress(job))
+
+    async def _send_progress(self, job: ImportJob) -> None:
+        """Envia o progresso ao usuário que fez o upload."""
+        if job.finished:
+            return
+        await connection_manager.send_personal_message(WebSocketMessage(
+            type="import_progress",
+            data={
+                "job_id": job.job_id,
+                "status": job.status,
+                "pages_total": job.pages_total,
+                "pages_done": job.pages_done,
+                "items_found": job.items_found,
+            }
+        ), job.user_id)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas das importações.
+
+        Returns:
+            Dict[str, Any]: Métricas do store, tarefas em execução e fila
+        """
+        return {
+            **self.store.get_metrics(),
+            "running_tasks": len(self._tasks),
+            "queued": self._waiting,
+            "max_concurrency": self.max_concurrency,
+        }
+
+
+# Instância global do serviço
+pdf_import_service = PDFImportService(
+    ImportJobStore(ttl=settings.PDF_IMPORT_JOB_TTL, max_jobs=settings.PDF_IMPORT_MAX_JOBS),
+    max_concurrency=settings.PDF_IMPORT_MAX_CONCURRENT,
+    max_queued=settings.PDF_IMPORT_MAX_QUEUED
+)
@@ -0,0 +1,162 @@
+"""
+Cache de resultados de parsing de PDF por hash de conteúdo.
+
+Vendedores costumam reenviar o mesmo orçamento após um erro de validação.
+O resultado do parsing é guardado pela chave `CacheKeys.pdf_cache_key`
+(SHA-256 do arquivo + versão do parser) em dois níveis: um LRU em memória
+do processo e, quando disponível, o Redis compartilhado entre instâncias.
+Incrementar `PDFParser.PARSER_VERSION` muda todas as chaves, invalidando
+os resultados antigos automaticamente.
+"""
+import copy
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.cache import Cache, CacheKeys
+from app.core.config import settings
+from app.services.pdf_parser import PDFParser
+
+logger = logging.getLogger(__name__)
+
+
+class PDFParseCache:
+    """
+    Cache em dois níveis (LRU local + Redis) para dados extraídos de PDFs.
+
+    Apenas parsings bem-sucedidos são armazenados; erros são sempre
+    reprocessados.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: int = 86400,
+        parser_version: str = PDFParser.PARSER_VERSION
+    ):
+        """
+        Inicializa o cache.
+
+        Args:
+            max_entries: Máximo de resultados no LRU local (0 = desativado)
+            ttl: Validade de cada resultado em segundos
+            parser_version: Versão do parser que compõe a chave
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.parser_version = parser_version
+
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+        # Métricas
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def key_for(self, content: bytes, content_hash: Optional[str] = None) -> str:
+        """
+        Gera a chave de cache do conteúdo.
+
+        Args:
+            content: Bytes do arquivo PDF
+            content_hash: SHA-256 do conteúdo, se já calculado na leitura
+
+        Returns:
+            str: Chave com hash do conteúdo e versão do parser
+        """
+        return CacheKeys.pdf_cache_key(content, self.parser_version, content_hash)
+
+    def _get_local(self, key: str) -> Optional[Dict[str, Any]]:
+        """Busca no LRU local, descartando entradas expiradas."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    def _set_local(self, key: str, data: Dict[str, Any]) -> None:
+        """Armazena no LRU local, removendo as entradas menos recentes."""
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    async def get(self, content: bytes, content_hash: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Busca o resultado de parsing do conteúdo.
+
+        Args:
+            content: Bytes do arquivo PDF
+            content_hash: SHA-256 do conteúdo, se já calculado na leitura
+
+        Returns:
+            Optional[Dict[str, Any]]: Cópia dos dados extraídos ou None
+        """
+        key = self.key_for(content, content_hash)
+
+        data = self._get_local(key)
+        if data is not None:
+            self._hits += 1
+            return copy.deepcopy(data)
+
+        data = await Cache.get(key)
+        if data is not None:
+            self._redis_hits += 1
+            self._set_local(key, data)
+            return copy.deepcopy(data)
+
+        self._misses += 1
+        return None
+
+    async def set(self, content: bytes, data: Dict[str, Any], content_hash: Optional[str] = None) -> None:
+        """
+        Armazena o resultado de parsing do conteúdo.
+
+        Args:
+            content: Bytes do arquivo PDF
+            data: Dados extraídos pelo parser
+            content_hash: SHA-256 do conteúdo, se já calculado na leitura
+        """
+        key = self.key_for(content, content_hash)
+        data = copy.deepcopy(data)
+        self._set_local(key, data)
+        await Cache.set(key, data, self.ttl)
+
+    def clear(self) -> None:
+        """Limpa o LRU local."""
+        self._entries.clear()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do cache.
+
+        Returns:
+            Dict[str, Any]: Entradas, acertos por nível, falhas e remoções
+        """
+        lookups = self._hits + self._redis_hits + self._misses
+        return {
+            "parser_version": self.parser_version,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self._hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "hit_rate": round((self._hits + self._redis_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Instância global do serviço
+pdf_parse_cache = PDFParseCache(
+    max_entries=settings.PDF_CACHE_MAX_ENTRIES,
+    ttl=settings.PDF_CACHE_TTL
+)
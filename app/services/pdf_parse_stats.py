@@ -0,0 +1,191 @@
+"""
+Instrumentação do parsing de PDFs: tempo por etapa e contadores.
+
+Cada parsing produz um ParseStats com o tempo de cada etapa do PDFParser
+e contadores do documento (páginas, caracteres, linhas, itens descartados,
+fallbacks usados). As etapas rodam intercaladas, página a página, em
+geradores encadeados; o tempo é atribuído à etapa ativa, trocada a cada
+avanço de um gerador instrumentado, de modo que cada etapa mede só o
+próprio trabalho.
+
+O ParseMetrics agrega os ParseStats em histogramas por etapa, servidos
+pelo /metrics.
+"""
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar
+
+from app.services.pdf_text_engines import EngineAttempt
+
+T = TypeVar("T")
+
+# Etapas do parsing
+EXTRACT = "extract"        # Texto das páginas (engines de extração)
+NORMALIZE = "normalize"    # _normalize_text
+CLEAN = "clean"            # _clean_extracted_text
+ITEMS = "items"            # Tokenização e validação dos itens
+METADATA = "metadata"      # Campos do cabeçalho
+VALIDATE = "validate"      # validate
+QUALITY = "quality"        # Conferência de valores entre engines
+STAGES = (EXTRACT, NORMALIZE, CLEAN, ITEMS, METADATA, VALIDATE, QUALITY)
+
+# Limites superiores (ms) dos buckets dos histogramas
+HISTOGRAM_BOUNDS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class ParseStats:
+    """Tempos por etapa e contadores de um parsing."""
+
+    def __init__(self):
+        """Inicializa as estatísticas vazias."""
+        self.stages_ms: Dict[str, float] = {stage: 0.0 for stage in STAGES}
+        self.counters: Dict[str, int] = {
+            "pages": 0,
+            "chars": 0,
+            "lines": 0,
+            "items": 0,
+            "suspicious_items": 0,    # Descartados por _is_suspicious_match
+            "invalid_items": 0,       # Descartados por _is_valid_item_data
+            "item_fallbacks": 0,      # Variantes tolerantes tentadas
+            "metadata_fallbacks": 0,  # FALLBACK_PATTERNS usados
+        }
+        self.engine: Optional[str] = None
+        self.item_variant: Optional[str] = None
+        self.attempts: List[EngineAttempt] = []
+        self.total_ms = 0.0
+
+        self._stage: Optional[str] = None
+        self._since = 0.0
+
+    def reset_counters(self) -> None:
+        """Zera os contadores do documento (nova tentativa de engine)."""
+        for name in self.counters:
+            self.counters[name] = 0
+        self.item_variant = None
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Incrementa um contador."""
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def _switch(self, stage: Optional[str]) -> Optional[str]:
+        """Encerra a medição da etapa ativa e ativa `stage`."""
+        now = time.perf_counter()
+        if self._stage is not None:
+            self.stages_ms[self._stage] += (now - self._since) * 1000
+        previous, self._stage, self._since = self._stage, stage, now
+        return previous
+
+    @contextmanager
+    def timer(self, stage: str):
+        """Atribui à etapa o tempo do bloco."""
+        previous = self._switch(stage)
+        try:
+            yield
+        finally:
+            self._switch(previous)
+
+    def timed(self, iterable: Iterable[T], stage: str) -> Iterator[T]:
+        """
+        Atribui à etapa o tempo gasto em produzir cada elemento.
+
+        O tempo de geradores instrumentados consumidos dentro deste fica
+        com a etapa deles.
+        """
+        iterator = iter(iterable)
+        while True:
+            previous = self._switch(stage)
+            try:
+                value = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._switch(previous)
+            yield value
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Registro estruturado para log e agregação."""
+        return {
+            "total_ms": round(self.total_ms, 3),
+            "stages_ms": {stage: round(value, 3) for stage, value in self.stages_ms.items()},
+            "counters": dict(self.counters),
+            "engine": self.engine,
+            "item_variant": self.item_variant,
+            "engine_attempts": [attempt.engine for attempt in self.attempts],
+        }
+
+    def __getstate__(self):
+        # Vai dos workers para o processo da API sem o estado da medição
+        state = self.__dict__.copy()
+        state["_stage"] = None
+        return state
+
+
+class Histogram:
+    """Histograma de tempos com buckets fixos (contagem acumulada)."""
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS_MS):
+        self.bounds = bounds
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Registra uma observação."""
+        index = 0
+        while index < len(self.bounds) and value > self.bounds[index]:
+            index += 1
+        self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Contagem, soma e buckets acumulados no formato `le`."""
+        cumulative = {}
+        total = 0
+        for bound, count in zip(list(self.bounds) + ["+Inf"], self.buckets):
+            total += count
+            cumulative[str(bound)] = total
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum, 2),
+            "avg_ms": round(self.sum / self.count, 2) if self.count else 0.0,
+            "buckets": cumulative,
+        }
+
+
+class ParseMetrics:
+    """Agregado dos ParseStats de todos os parsings."""
+
+    def __init__(self):
+        self.documents = 0
+        self.total = Histogram()
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.counters: Dict[str, int] = {}
+        self.item_variants: Dict[str, int] = {}
+
+    def record(self, stats: ParseStats) -> None:
+        """Registra um parsing."""
+        self.documents += 1
+        self.total.observe(stats.total_ms)
+        for stage, value in stats.stages_ms.items():
+            self.stages.setdefault(stage, Histogram()).observe(value)
+        for name, value in stats.counters.items():
+            self.counters[name] = self.counters.get(name, 0) + value
+        variant = stats.item_variant or "none"
+        self.item_variants[variant] = self.item_variants.get(variant, 0) + 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna as métricas agregadas.
+
+        Returns:
+            Dict[str, Any]: Histogramas por etapa, totais dos contadores e
+                documentos por variante de item
+        """
+        return {
+            "documents": self.documents,
+            "total": self.total.get_metrics(),
+            "stages": {stage: histogram.get_metrics() for stage, histogram in self.stages.items()},
+            "counters": dict(self.counters),
+            "item_variants": dict(self.item_variants),
+        }
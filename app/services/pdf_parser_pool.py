@@ -0,0 +1,514 @@
+"""
+Serviço de execução do PDFParser em um pool de processos.
+
+A análise de layout do pdfplumber é CPU-bound e pode levar segundos em
+orçamentos longos. Executada dentro do endpoint assíncrono, ela trava o
+event loop e todas as outras requisições e WebSockets. Este serviço
+encaminha o parsing para processos dedicados, com workers pré-aquecidos,
+timeout por job e isolamento de falhas (um worker que morre não derruba
+a aplicação; o pool é recriado).
+
+PDFs com muitas páginas (a partir de `parallel_min_pages`) são divididos
+em intervalos de páginas extraídos em paralelo pelos workers; o texto das
+páginas é unido em ordem no processo da API, onde normalização, limpeza e
+tokenização (baratas em relação ao layout) rodam em sequência.
+
+As tentativas de cada engine de extração de texto feitas nos workers são
+reunidas em `engine_stats` e expostas em `get_metrics()["engines"]`. A
+ordem de tentativa de cada parsing é decidida aqui (EngineStats.plan) e
+enviada ao worker: todos os workers usam o que foi aprendido em conjunto.
+
+O tempo por etapa e os contadores de cada parsing (ParseStats) são
+registrados no log em uma linha JSON e agregados em histogramas em
+`get_metrics()["stages"]`.
+
+O progresso de um parsing (páginas processadas, itens encontrados) volta
+dos workers por uma fila de multiprocessing; uma thread do processo da
+API entrega cada atualização ao event loop de quem pediu o parsing.
+"""
+import asyncio
+import json
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.services.pdf_parse_stats import ParseMetrics, ParseStats
+from app.services.pdf_parser import PDFParser, PDFParseError, ProgressCallback
+from app.services.pdf_text_engines import (
+    DEFAULT_ENGINE_ORDER,
+    EngineStats,
+    TextEngine,
+    TextExtractionError,
+)
+
+logger = logging.getLogger(__name__)
+
+# Parser do processo worker, criado uma única vez no initializer
+_worker_parser: Optional[PDFParser] = None
+
+# Quem aguarda o progresso de cada parsing, pela chave enviada ao job
+_progress_listeners: Dict[str, Tuple[asyncio.AbstractEventLoop, ProgressCallback]] = {}
+
+
+class _ProgressChannel:
+    """Entrega ao event loop o progresso enviado por workers ou threads."""
+
+    def __init__(self, progress_queue):
+        self.queue = progress_queue
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Inicia a thread leitora, se ainda não estiver rodando."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._pump, name="pdf-parse-progress", daemon=True
+                )
+                self._thread.start()
+
+    def _pump(self) -> None:
+        while True:
+            message = self.queue.get()
+            if message is None:
+                return
+            key, pages_done, items_found = message
+            listener = _progress_listeners.get(key)
+            if listener is None:
+                continue  # Parsing já terminou
+            loop, callback = listener
+            try:
+                loop.call_soon_threadsafe(callback, pages_done, items_found)
+            except RuntimeError:
+                pass  # Event loop encerrado
+
+    def close(self) -> None:
+        """Encerra a thread leitora."""
+        with self._lock:
+            if self._thread is not None:
+                self.queue.put(None)
+                self._thread = None
+
+
+# Canal dos jobs executados no próprio processo da API (modo thread)
+_local_progress = _ProgressChannel(queue.SimpleQueue())
+
+# Fila em que os jobs publicam o progresso: a do pool nos workers
+# (definida no initializer), a local no processo da API
+_progress_queue = _local_progress.queue
+
+
+def _init_worker(engines: Optional[Sequence[str]] = None, progress_queue=None) -> None:
+    """Aquece o worker: importa as bibliotecas de PDF e cria o parser uma vez."""
+    global _worker_parser, _progress_queue
+    import pdfplumber  # noqa: F401
+    import PyPDF2  # noqa: F401
+    _worker_parser = PDFParser(engines)
+    _progress_queue = progress_queue
+
+
+def _progress_reporter(progress_key: Optional[str]) -> Optional[ProgressCallback]:
+    """Callback de progresso que publica na fila com a chave do parsing."""
+    if progress_key is None or _progress_queue is None:
+        return None
+    return lambda pages_done, items_found: _progress_queue.put((progress_key, pages_done, items_found))
+
+
+def _warm_up_job() -> bool:
+    """Job vazio usado para forçar a inicialização dos workers."""
+    return _worker_parser is not None
+
+
+def _parse_job(pdf_path: str, order: Optional[Sequence[str]] = None) -> Tuple[Dict[str, Any], ParseStats]:
+    """Executa o parsing dentro do processo worker, na ordem de engines recebida."""
+    parser = _worker_parser or PDFParser()
+    data = parser.extract(Path(pdf_path), order)
+    return data, parser.last_stats
+
+
+def _parse_bytes_job(
+    content: bytes,
+    progress_key: Optional[str] = None,
+    order: Optional[Sequence[str]] = None
+) -> Tuple[Dict[str, Any], ParseStats]:
+    """Executa o parsing de um PDF em memória dentro do processo worker."""
+    parser = _worker_parser or PDFParser()
+    data = parser.extract_bytes(content, _progress_reporter(progress_key), order)
+    return data, parser.last_stats
+
+
+def _sniff_job(content: bytes) -> Optional[str]:
+    """Lê o número do orçamento da primeira página dentro do processo worker."""
+    parser = _worker_parser or PDFParser()
+    return parser.sniff_order_number(content)
+
+
+def _extract_pages_job(content: bytes, first_page: int, last_page: int, engine: str) -> Optional[List[str]]:
+    """Extrai o texto de um intervalo de páginas (None se o engine falhar)."""
+    parser = _worker_parser or PDFParser()
+    try:
+        return parser.extract_page_texts(content, first_page, last_page, engine)
+    except PDFParseError as e:
+        logger.warning(f"PDF pages {first_page}-{last_page} failed with {engine}: {e}")
+        return None
+
+
+class PDFParserPool:
+    """
+    Pool de processos para parsing de PDFs.
+
+    Com `max_workers=0` o parsing roda em uma thread do processo atual
+    (útil em testes e ambientes sem suporte a multiprocessing).
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        timeout: float = 60.0,
+        parallel_min_pages: int = 20,
+        engines: Optional[Sequence[str]] = None
+    ):
+        """
+        Inicializa o pool.
+
+        Args:
+            max_workers: Número de processos worker (0 = thread local)
+            timeout: Tempo máximo de cada job em segundos
+            parallel_min_pages: Páginas a partir das quais o PDF é dividido
+                entre os workers (0 = nunca; exige max_workers > 1)
+            engines: Engines de extração de texto, do mais barato ao mais
+                caro; o último é a referência (padrão: DEFAULT_ENGINE_ORDER)
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.parallel_min_pages = parallel_min_pages
+        self.engines = tuple(engines or DEFAULT_ENGINE_ORDER)
+
+        # Tentativas dos engines em todos os workers; a ordem de tentativa
+        # de cada parsing é decidida aqui e enviada ao worker (no modo
+        # paralelo, pelo parser do processo da API)
+        self.engine_stats = EngineStats()
+        self._sharded_parser = PDFParser(self.engines, self.engine_stats)
+        self.parse_metrics = ParseMetrics()
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._progress: Optional[_ProgressChannel] = None
+        self._lock = threading.Lock()
+
+        # Métricas
+        self._in_flight = 0
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._crashes = 0
+        self._total_ms = 0.0
+        self._sharded = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Obtém ou cria o pool de processos."""
+        with self._lock:
+            if self._executor is None:
+                context = multiprocessing.get_context("spawn")
+                # Fila nova a cada pool: um worker encerrado pode deixá-la inconsistente
+                self._progress = _ProgressChannel(context.Queue())
+                self._progress.start()
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=context,
+                    initializer=_init_worker,
+                    initargs=(self.engines, self._progress.queue),
+                )
+                logger.info(f"PDF parser pool started with {self.max_workers} workers")
+            return self._executor
+
+    def _restart(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Descarta um pool quebrado ou com job travado.
+
+        Jobs em andamento no pool descartado falham com BrokenProcessPool
+        e são reenviados uma vez ao novo pool.
+        """
+        with self._lock:
+            if self._executor is not executor:
+                return  # Já foi recriado por outro job
+            self._executor = None
+            progress, self._progress = self._progress, None
+        if progress is not None:
+            progress.close()
+
+        # ProcessPoolExecutor não cancela jobs em execução: encerra os processos
+        for process in list(getattr(executor, "_processes", {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+        logger.warning("PDF parser pool restarted")
+
+    async def warm_up(self) -> None:
+        """Inicia todos os workers antes da primeira requisição."""
+        if self.max_workers <= 0:
+            return
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _warm_up_job)
+            for _ in range(self.max_workers)
+        ))
+
+    async def parse(self, pdf_path: Path) -> Dict[str, Any]:
+        """
+        Extrai os dados do PDF sem bloquear o event loop.
+
+        Args:
+            pdf_path: Caminho para o arquivo PDF
+
+        Returns:
+            Dict contendo os dados extraídos
+
+        Raises:
+            PDFParseError: Se houver erro na extração, timeout ou falha do worker
+        """
+        order = self.engine_stats.plan(self.engines)
+        return await self._run(_parse_job, str(pdf_path), order, label=str(pdf_path))
+
+    async def sniff_order_number(self, content: bytes) -> Optional[str]:
+        """
+        Número do orçamento lido só da primeira página, em um worker.
+
+        Leitura rápida para recusar um pedido já cadastrado antes do
+        parsing completo. Roda no pool, como o parsing: a extração da
+        página não disputa o GIL com o processo da API. Uma falha ou timeout
+        não impede o upload; o parsing completo decide.
+
+        Args:
+            content: Conteúdo do arquivo PDF
+
+        Returns:
+            Optional[str]: Número do orçamento ou None se não encontrado
+        """
+        try:
+            if self.max_workers <= 0:
+                return await asyncio.wait_for(asyncio.to_thread(_sniff_job, content), timeout=self.timeout)
+            return await self._parse_in_pool(_sniff_job, content, label=f"<{len(content)} bytes>")
+        except (asyncio.TimeoutError, PDFParseError) as e:
+            logger.warning(f"PDF order number sniff failed: {e or 'timeout'}")
+            return None
+
+    async def parse_bytes(self, content: bytes, progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """
+        Extrai os dados de um PDF em memória sem bloquear o event loop.
+
+        O conteúdo é enviado ao worker pelo pipe do pool, sem passar pelo disco.
+        PDFs com `parallel_min_pages` páginas ou mais são extraídos em
+        paralelo, um intervalo de páginas por worker.
+
+        Args:
+            content: Conteúdo do arquivo PDF
+            progress: Chamado no event loop com (páginas processadas, itens
+                encontrados) durante o parsing; atualizações que chegam
+                depois do fim do parsing são descartadas
+
+        Returns:
+            Dict contendo os dados extraídos
+
+        Raises:
+            PDFParseError: Se houver erro na extração, timeout ou falha do worker
+        """
+        label = f"<{len(content)} bytes>"
+        progress_key = None
+        if progress is not None:
+            progress_key = uuid.uuid4().hex
+            _progress_listeners[progress_key] = (asyncio.get_running_loop(), progress)
+        try:
+            if self.max_workers > 1 and self.parallel_min_pages > 0:
+                page_count = await asyncio.to_thread(PDFParser.count_pages, content)
+                if page_count >= self.parallel_min_pages:
+                    return await self._measure(
+                        self._parse_sharded(content, page_count, label, progress_key), label
+                    )
+            order = self.engine_stats.plan(self.engines)
+            return await self._run(_parse_bytes_job, content, progress_key, order, label=label)
+        finally:
+            _progress_listeners.pop(progress_key, None)
+
+    async def _run(self, job, *args, label: str) -> Dict[str, Any]:
+        """Executa o job (no pool ou em thread) registrando as métricas."""
+        if self.max_workers <= 0:
+            _local_progress.start()
+            parsing = asyncio.wait_for(asyncio.to_thread(job, *args), timeout=self.timeout)
+        else:
+            parsing = self._parse_in_pool(job, *args, label=label)
+        return await self._measure(self._collect(parsing), label)
+
+    async def _collect(self, parsing) -> Dict[str, Any]:
+        """Registra as tentativas dos engines e as estatísticas do job."""
+        data, stats = await parsing
+        self.engine_stats.merge(stats.attempts)
+        self._record_stats(stats)
+        return data
+
+    def _record_stats(self, stats: ParseStats) -> None:
+        """Agrega as estatísticas de um parsing e as registra no log."""
+        self.parse_metrics.record(stats)
+        logger.info(f"PDF parse stats: {json.dumps(stats.as_dict(), sort_keys=True)}")
+
+    async def _measure(self, parsing, label: str) -> Dict[str, Any]:
+        """Aguarda o parsing registrando as métricas e convertendo timeouts."""
+        start = time.perf_counter()
+        self._in_flight += 1
+        try:
+            data = await parsing
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._failed += 1
+            logger.warning(f"PDF parse timed out after {self.timeout}s: {label}")
+            raise PDFParseError(
+                f"Tempo limite de processamento excedido ({self.timeout:.0f}s)"
+            )
+        except Exception:
+            self._failed += 1
+            raise
+        finally:
+            self._in_flight -= 1
+
+        self._completed += 1
+        self._total_ms += (time.perf_counter() - start) * 1000
+        return data
+
+    async def _parse_in_pool(self, job, *args, label: str) -> Any:
+        """Envia o job ao pool, recriando-o se um worker morrer."""
+        loop = asyncio.get_running_loop()
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                future = executor.submit(job, *args)
+                return await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout)
+            except asyncio.TimeoutError:
+                # O worker continua preso no job: descarta o pool inteiro
+                await loop.run_in_executor(None, self._restart, executor)
+                raise
+            except BrokenProcessPool:
+                self._crashes += 1
+                logger.error(f"PDF parser worker crashed while parsing {label}")
+                await loop.run_in_executor(None, self._restart, executor)
+                if attempt == 0:
+                    continue
+                raise PDFParseError("Falha no processamento do PDF")
+        raise PDFParseError("Falha no processamento do PDF")
+
+    def _page_ranges(self, page_count: int) -> List[Tuple[int, int]]:
+        """Divide as páginas em intervalos contíguos, um por worker."""
+        shards = min(self.max_workers, page_count)
+        size, remainder = divmod(page_count, shards)
+        ranges = []
+        first = 1
+        for index in range(shards):
+            last = first + size - (0 if index < remainder else 1)
+            ranges.append((first, last))
+            first = last + 1
+        return ranges
+
+    async def _parse_sharded(
+        self,
+        content: bytes,
+        page_count: int,
+        label: str,
+        progress_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrai os intervalos de páginas em paralelo e une o resultado.
+
+        Cada engine tentado pelo parser do processo da API extrai os
+        intervalos em paralelo nos workers; se algum intervalo falhar, o
+        engine inteiro falha e o parser passa ao próximo.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        ranges = self._page_ranges(page_count)
+        _local_progress.start()
+        crashed = False
+
+        def read_pages(engine: TextEngine) -> Iterator[str]:
+            nonlocal crashed
+            futures = [
+                executor.submit(_extract_pages_job, content, first, last, engine.name)
+                for first, last in ranges
+            ]
+            try:
+                shards = [future.result() for future in futures]
+            except BrokenProcessPool:
+                crashed = True
+                raise
+            if any(shard is None for shard in shards):
+                raise TextExtractionError(f"Erro com {engine.name} em um intervalo de páginas")
+            return chain.from_iterable(shards)
+
+        try:
+            data, stats = await asyncio.wait_for(
+                asyncio.to_thread(
+                    self._sharded_parser.extract_adaptive, read_pages, _progress_reporter(progress_key)
+                ),
+                timeout=self.timeout
+            )
+        except asyncio.TimeoutError:
+            await loop.run_in_executor(None, self._restart, executor)
+            raise
+        except PDFParseError:
+            if not crashed:
+                raise
+            self._crashes += 1
+            logger.error(f"PDF parser worker crashed while parsing {label}")
+            await loop.run_in_executor(None, self._restart, executor)
+            raise PDFParseError("Falha no processamento do PDF")
+
+        self._sharded += 1
+        self._record_stats(stats)
+        return data
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do pool.
+
+        Returns:
+            Dict[str, Any]: Jobs em andamento, concluídos, falhas, tempo médio,
+                tentativas por engine de extração e histogramas por etapa
+        """
+        return {
+            "workers": self.max_workers,
+            "in_flight": self._in_flight,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "crashes": self._crashes,
+            "sharded": self._sharded,
+            "avg_parse_ms": round(self._total_ms / self._completed, 2) if self._completed else 0.0,
+            "engines": self.engine_stats.get_metrics(),
+            "stages": self.parse_metrics.get_metrics(),
+        }
+
+    def shutdown(self) -> None:
+        """Encerra o pool de processos."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            progress, self._progress = self._progress, None
+        if progress is not None:
+            progress.close()
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+            logger.info("PDF parser pool shut down")
+
+
+# Instância global do serviço
+pdf_parser_pool = PDFParserPool(
+    max_workers=settings.PDF_PARSER_WORKERS,
+    timeout=settings.PDF_PARSE_TIMEOUT,
+    parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES,
+    engines=settings.get_pdf_text_engines()
+)
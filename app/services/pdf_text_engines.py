@@ -0,0 +1,333 @@
+"""
+Engines de extração de texto de PDF.
+
+Cada engine transforma as páginas do PDF em texto, uma página por vez. O
+PDFParser tenta os engines na ordem definida por EngineStats.plan: o
+engine de referência (o mais caro) primeiro, até que as estatísticas
+mostrem que um engine mais barato passa na verificação de qualidade com
+frequência suficiente para compensar.
+
+Engines registrados:
+    pypdf2: ordem do content stream, sem posições (o mais barato; falha
+        nos orçamentos do ERP, que desenham cada coluna separadamente)
+    pdfminer: modo rápido do pdfminer, sem análise de layout (LAParams);
+        as linhas são reconstruídas agrupando os caracteres pela posição
+    pdfplumber: análise de layout completa (referência, o mais caro)
+
+Novos engines podem ser adicionados com `register_engine`.
+"""
+from abc import ABC, abstractmethod
+from collections import deque
+from io import StringIO
+from typing import BinaryIO, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import pdfplumber
+import PyPDF2
+from pdfminer.converter import PDFPageAggregator
+from pdfminer.layout import LTChar, LTContainer
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+PYPDF2 = "pypdf2"
+PDFMINER = "pdfminer"
+PDFPLUMBER = "pdfplumber"
+
+# Ordem padrão: do mais barato ao mais caro; o último é a referência
+DEFAULT_ENGINE_ORDER = (PYPDF2, PDFMINER, PDFPLUMBER)
+
+# Resultado de uma tentativa
+ACCEPTED = "accepted"   # Passou na verificação de qualidade
+REJECTED = "rejected"   # Extraiu texto, mas o orçamento não fecha
+FAILED = "failed"       # Erro ou nenhum texto
+
+
+class TextExtractionError(Exception):
+    """Falha de um engine ao ler o PDF (aciona o próximo engine)."""
+    pass
+
+
+class EngineAttempt(NamedTuple):
+    """Tentativa de extração de um engine em um PDF."""
+
+    engine: str
+    outcome: str
+    elapsed_ms: float
+    selected: bool
+
+
+class TextEngine(ABC):
+    """Interface dos engines de extração de texto."""
+
+    name = ""
+
+    @abstractmethod
+    def iter_pages(self, stream: BinaryIO, page_numbers: Optional[List[int]] = None) -> Iterator[str]:
+        """
+        Texto de cada página com conteúdo, terminado em quebra de linha.
+
+        Args:
+            stream: Stream com o conteúdo do PDF
+            page_numbers: Páginas a extrair (1 = primeira); None = todas
+
+        Raises:
+            TextExtractionError: Se o PDF não puder ser lido
+        """
+
+
+class PdfplumberEngine(TextEngine):
+    """Análise de layout completa do pdfplumber."""
+
+    name = PDFPLUMBER
+
+    def iter_pages(self, stream: BinaryIO, page_numbers: Optional[List[int]] = None) -> Iterator[str]:
+        try:
+            stream.seek(0)
+            # Stream externo: o pdfplumber não o fecha, permitindo o fallback
+            with pdfplumber.open(stream, pages=page_numbers) as pdf:
+                for page in pdf.pages:
+                    try:
+                        page_text = page.extract_text()
+                    finally:
+                        # Descarta o layout da página (caracteres, mapa de texto)
+                        page.get_textmap.cache_clear()
+                        page.flush_cache()
+                    if page_text:
+                        yield page_text + "\n"
+        except Exception as e:
+            raise TextExtractionError(f"Erro com pdfplumber: {e}") from e
+
+
+class PyPDF2Engine(TextEngine):
+    """Texto na ordem do content stream, via PyPDF2."""
+
+    name = PYPDF2
+
+    def iter_pages(self, stream: BinaryIO, page_numbers: Optional[List[int]] = None) -> Iterator[str]:
+        try:
+            stream.seek(0)
+            reader = PyPDF2.PdfReader(stream)
+            numbers = page_numbers or range(1, len(reader.pages) + 1)
+            for number in numbers:
+                yield reader.pages[number - 1].extract_text() + "\n"
+        except Exception as e:
+            raise TextExtractionError(f"Erro com PyPDF2: {e}") from e
+
+
+class PdfminerEngine(TextEngine):
+    """
+    Modo rápido do pdfminer: caracteres sem análise de layout.
+
+    As linhas são formadas agrupando os caracteres pelo topo (tolerância
+    Y_TOLERANCE) e ordenando por x; um espaço é inserido quando a distância
+    entre caracteres passa de X_TOLERANCE, como no pdfplumber.
+    """
+
+    name = PDFMINER
+
+    X_TOLERANCE = 3
+    Y_TOLERANCE = 3
+
+    def iter_pages(self, stream: BinaryIO, page_numbers: Optional[List[int]] = None) -> Iterator[str]:
+        try:
+            stream.seek(0)
+            resources = PDFResourceManager()
+            device = PDFPageAggregator(resources, laparams=None)
+            interpreter = PDFPageInterpreter(resources, device)
+            pages = PDFPage.get_pages(
+                stream, pagenos=[number - 1 for number in page_numbers] if page_numbers else None
+            )
+            for page in pages:
+                interpreter.process_page(page)
+                page_text = self._page_text(device.get_result())
+                if page_text:
+                    yield page_text + "\n"
+        except Exception as e:
+            raise TextExtractionError(f"Erro com pdfminer: {e}") from e
+
+    def _chars(self, container: Iterable) -> Iterator[LTChar]:
+        """Caracteres da página, incluindo os de figuras."""
+        for obj in container:
+            if isinstance(obj, LTChar):
+                yield obj
+            elif isinstance(obj, LTContainer):
+                yield from self._chars(obj)
+
+    def _page_text(self, layout) -> str:
+        """Reconstrói as linhas da página a partir das posições."""
+        lines: List[List[LTChar]] = []
+        top = None
+        for char in sorted(self._chars(layout), key=lambda char: (-char.y1, char.x0)):
+            if top is None or abs(char.y1 - top) > self.Y_TOLERANCE:
+                lines.append([])
+                top = char.y1
+            lines[-1].append(char)
+
+        output = StringIO()
+        for index, line in enumerate(lines):
+            if index:
+                output.write("\n")
+            previous = None
+            for char in sorted(line, key=lambda char: char.x0):
+                text = char.get_text()
+                if previous is not None and char.x0 - previous.x1 > self.X_TOLERANCE \
+                        and text != " " and previous.get_text() != " ":
+                    output.write(" ")
+                output.write(text)
+                previous = char
+        return output.getvalue()
+
+
+_ENGINES: Dict[str, TextEngine] = {}
+
+
+def register_engine(engine: TextEngine) -> TextEngine:
+    """
+    Registra um engine pelo nome.
+
+    Args:
+        engine: Instância do engine
+
+    Returns:
+        TextEngine: O próprio engine
+    """
+    _ENGINES[engine.name] = engine
+    return engine
+
+
+def get_engine(name: str) -> TextEngine:
+    """
+    Busca um engine registrado.
+
+    Raises:
+        ValueError: Se o engine não existir
+    """
+    try:
+        return _ENGINES[name]
+    except KeyError:
+        raise ValueError(f"Engine de extração desconhecido: {name}")
+
+
+register_engine(PyPDF2Engine())
+register_engine(PdfminerEngine())
+register_engine(PdfplumberEngine())
+
+
+class EngineStats:
+    """
+    Taxa de acerto e tempo por engine, com seleção adaptativa.
+
+    O engine de referência (o último da ordem configurada) é tentado
+    primeiro. Um engine mais barato só passa à frente quando as tentativas
+    recentes mostram que compensa: seu tempo médio é menor que o tempo que
+    ele economiza ao acertar (taxa de acerto × tempo médio da referência).
+    A cada `probe_every` documentos todos os engines são tentados, do mais
+    barato ao mais caro, para medir os que ainda não compensam.
+    """
+
+    def __init__(self, window: int = 50, min_samples: int = 5, probe_every: int = 20):
+        """
+        Inicializa as estatísticas.
+
+        Args:
+            window: Tentativas recentes consideradas na taxa de acerto e no tempo
+            min_samples: Tentativas antes de o engine poder passar à frente
+            probe_every: Frequência (em documentos) da sondagem de todos os engines
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.probe_every = probe_every
+
+        self._documents = 0
+        self._recent: Dict[str, Deque[Tuple[bool, float]]] = {}
+        self._counters: Dict[str, Dict[str, float]] = {}
+
+    def _counter(self, engine: str) -> Dict[str, float]:
+        """Contadores do engine, criados no primeiro uso."""
+        if engine not in self._counters:
+            self._counters[engine] = {
+                "attempts": 0, ACCEPTED: 0, REJECTED: 0, FAILED: 0,
+                "selected": 0, "skipped": 0, "total_ms": 0.0,
+            }
+            self._recent[engine] = deque(maxlen=self.window)
+        return self._counters[engine]
+
+    def pays_off(self, engine: str, reference: str) -> bool:
+        """
+        Indica se tentar o engine antes da referência economiza tempo.
+
+        Returns:
+            bool: False sem tentativas recentes suficientes dos dois engines
+        """
+        recent = self._recent.get(engine)
+        reference_recent = self._recent.get(reference)
+        if not recent or len(recent) < self.min_samples or not reference_recent:
+            return False
+        hit_rate = sum(accepted for accepted, _ in recent) / len(recent)
+        average_ms = sum(elapsed for _, elapsed in recent) / len(recent)
+        reference_ms = sum(elapsed for _, elapsed in reference_recent) / len(reference_recent)
+        return average_ms < hit_rate * reference_ms
+
+    def plan(self, engines: Sequence[str]) -> List[str]:
+        """
+        Ordem de tentativa dos engines no próximo documento.
+
+        Args:
+            engines: Engines configurados, do mais barato ao mais caro
+
+        Returns:
+            List[str]: Engines mais baratos que compensam, seguidos da
+            referência; nos documentos de sondagem, todos os engines
+        """
+        *cheaper, reference = engines
+        self._documents += 1
+        if cheaper and self._documents % self.probe_every == 0:
+            return list(engines)
+
+        planned = []
+        for name in cheaper:
+            if self.pays_off(name, reference):
+                planned.append(name)
+            else:
+                self._counter(name)["skipped"] += 1
+        return planned + [reference]
+
+    def record(self, attempt: EngineAttempt) -> None:
+        """Registra uma tentativa."""
+        counter = self._counter(attempt.engine)
+        counter["attempts"] += 1
+        counter[attempt.outcome] += 1
+        counter["total_ms"] += attempt.elapsed_ms
+        if attempt.selected:
+            counter["selected"] += 1
+        self._recent[attempt.engine].append((attempt.outcome == ACCEPTED, attempt.elapsed_ms))
+
+    def mark_selected(self, engine: str) -> None:
+        """Conta o engine cujo resultado foi usado no documento."""
+        self._counter(engine)["selected"] += 1
+
+    def merge(self, attempts: Iterable[EngineAttempt]) -> None:
+        """Registra as tentativas feitas em outro processo."""
+        for attempt in attempts:
+            self.record(attempt)
+
+    def get_metrics(self) -> Dict[str, Dict[str, float]]:
+        """
+        Retorna as métricas por engine.
+
+        Returns:
+            Dict: Tentativas, resultados, taxa de acerto e tempo médio
+        """
+        metrics = {}
+        for engine, counter in self._counters.items():
+            attempts = counter["attempts"]
+            metrics[engine] = {
+                "attempts": attempts,
+                "accepted": counter[ACCEPTED],
+                "rejected": counter[REJECTED],
+                "failed": counter[FAILED],
+                "selected": counter["selected"],
+                "skipped": counter["skipped"],
+                "hit_rate": round(counter[ACCEPTED] / attempts, 3) if attempts else 0.0,
+                "avg_ms": round(counter["total_ms"] / attempts, 2) if attempts else 0.0,
+            }
+        return metrics
@@ -0,0 +1,29 @@
+"""add_order_list_cursor_indexes
+
+Revision ID: c4d81a7e5b92
+Revises: 7f3a9c21d4e8
+Create Date: 2026-10-17 09:40:12.503117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81a7e5b92'
+down_revision: Union[str, None] = '7f3a9c21d4e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Paginação por cursor em GET /orders: ORDER BY created_at DESC, id DESC
+    op.create_index('idx_orders_created_at_id', 'orders', ['created_at', 'id'], unique=False)
+    op.create_index('idx_orders_status_created_at_id', 'orders', ['status', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_orders_status_created_at_id', table_name='orders')
+    op.drop_index('idx_orders_created_at_id', table_name='orders')
@@ -3,6 +3,7 @@ Cache configuration and utilities for Redis caching
 """
 import json
 import pickle
+import time
 from typing import Any, Optional, Union
 from functools import wraps
 import redis.asyncio as redis
@@ -14,27 +15,34 @@ logger = logging.getLogger(__name__)
 # Redis connection instance
 _redis_client: Optional[redis.Redis] = None
 
+# After a failed connection, wait this many seconds before trying again
+REDIS_RETRY_INTERVAL = 60
+_redis_retry_at = 0.0
+
 
 async def get_redis_client() -> Optional[redis.Redis]:
-    """Get Redis client instance"""
-    global _redis_client
+    """Get Redis client instance (None when disabled or unavailable)"""
+    global _redis_client, _redis_retry_at
     
     if _redis_client is None:
+        # Only create Redis client in production with REDIS_URL configured
+        if settings.ENVIRONMENT != "production" or not settings.REDIS_URL:
+            return None
+        
+        # Back off after a failed connection instead of retrying on every call
+        if time.monotonic() < _redis_retry_at:
+            return None
+        
         try:
-            # Only create Redis client in production
-            if settings.ENVIRONMENT == "production":
-                redis_url = getattr(settings, 'REDIS_URL', 'redis://localhost:6379')
-                _redis_client = redis.from_url(redis_url, decode_responses=False)
-                
-                # Test connection
-                await _redis_client.ping()
-                logger.info("Redis connection established")
-            else:
-                logger.info("Redis disabled in development mode")
-                return None
+            _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=False)
+            
+            # Test connection
+            await _redis_client.ping()
+            logger.info("Redis connection established")
         except Exception as e:
-            logger.warning(f"Failed to connect to Redis: {e}")
+            logger.warning(f"Failed to connect to Redis: {e} (retrying in {REDIS_RETRY_INTERVAL}s)")
             _redis_client = None
+            _redis_retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
     
     return _redis_client
 
@@ -153,7 +161,8 @@ class CacheKeys:
     ORDER_DETAIL = "order:detail:{order_id}"
     ORDER_STATS = "orders:stats"
     USER_PROFILE = "user:profile:{user_id}"
-    PDF_PARSED = "pdf:parsed:{file_hash}"
+    PDF_PARSED = "pdf:parsed:v{parser_version}:{file_hash}"
+    PDF_PREVIEW = "pdf:preview:{preview_id}"
     
     @staticmethod
     def orders_list_key(page: int = 1, status: str = "", user_id: int = None) -> str:
@@ -166,11 +175,17 @@ class CacheKeys:
         return f"order:detail:{order_id}"
     
     @staticmethod
-    def pdf_cache_key(file_content: bytes) -> str:
-        """Generate key for PDF parsing cache"""
-        import hashlib
-        file_hash = hashlib.md5(file_content).hexdigest()
-        return f"pdf:parsed:{file_hash}"
+    def pdf_cache_key(file_content: bytes, parser_version: str = "1", file_hash: Optional[str] = None) -> str:
+        """Generate key for PDF parsing cache (content hash + parser version)"""
+        if file_hash is None:
+            import hashlib
+            file_hash = hashlib.sha256(file_content).hexdigest()
+        return f"pdf:parsed:v{parser_version}:{file_hash}"
+    
+    @staticmethod
+    def pdf_preview_key(preview_id: str) -> str:
+        """Generate key for a PDF preview held for /confirm"""
+        return f"pdf:preview:{preview_id}"
 
 
 # Cache invalidation helpers
@@ -37,6 +37,9 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "dev-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
+    PIN_PEPPER: str = "dev-pin-pepper-change-in-production"  # Chave do índice de busca de PIN
+    PASSWORD_HASH_WORKERS: int = 4  # Threads do pool de bcrypt
+    PASSWORD_HASH_MAX_CONCURRENCY: int = 4  # Hashes simultâneos; excedentes aguardam na fila
     
     # Admin
     ADMIN_PASSWORD: str = "thmpv321"
@@ -45,6 +48,31 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "text"  # "text" or "json"
     
+    # PDF
+    PDF_PARSER_WORKERS: int = 2  # Processos do pool de parsing (0 = thread no processo da API)
+    PDF_PARSE_TIMEOUT: int = 60  # Tempo máximo por PDF em segundos
+    PDF_PARALLEL_MIN_PAGES: int = 20  # Páginas a partir das quais o PDF é dividido entre os workers (0 = nunca)
+    PDF_TEXT_ENGINES: str = "pypdf2,pdfminer,pdfplumber"  # Engines de extração de texto, do mais barato ao mais caro; o último (referência) é tentado primeiro até outro compensar
+    PDF_CACHE_MAX_ENTRIES: int = 256  # Resultados de parsing mantidos em memória (0 = desativado)
+    PDF_CACHE_TTL: int = 60 * 60 * 24  # Validade de um resultado em cache (segundos)
+    PDF_IMPORT_JOB_TTL: int = 60 * 60  # Tempo que o estado de uma importação assíncrona fica disponível (segundos)
+    PDF_IMPORT_MAX_JOBS: int = 1000  # Importações mantidas em memória
+    PDF_IMPORT_MAX_CONCURRENT: int = 2  # Importações assíncronas em execução ao mesmo tempo
+    PDF_IMPORT_MAX_QUEUED: int = 50  # Importações aguardando execução (acima disso o upload é recusado)
+    PDF_MAX_UPLOAD_BYTES: int = 10 * 1024 * 1024  # Tamanho máximo de cada PDF enviado
+    PDF_UPLOAD_CHUNK_SIZE: int = 64 * 1024  # Bloco de leitura do upload
+    PDF_BATCH_MAX_FILES: int = 100  # Arquivos aceitos por upload em lote
+    PDF_PREVIEW_TTL: int = 60 * 60 * 2  # Validade do preview guardado para o /confirm (segundos)
+    PDF_PREVIEW_MAX_ENTRIES: int = 1000  # Previews mantidos em memória
+    
+    # Importação em massa de pedidos (JSONL/CSV)
+    ORDER_IMPORT_BATCH_SIZE: int = 1000  # Pedidos por lote (validação, consulta e transação)
+    ORDER_IMPORT_MAX_ERRORS: int = 100  # Rejeições detalhadas no resultado
+    ORDER_PROGRESS_RECONCILE_INTERVAL: int = 300  # Reconciliação dos contadores de progresso (segundos, 0 = desativada)
+    ORDER_PROGRESS_RECONCILE_WINDOW: int = 60 * 60 * 24  # Pedidos atualizados nesta janela são reconciliados (segundos, 0 = todos)
+    ORDER_DETAIL_CACHE_MAX_ENTRIES: int = 500  # Detalhes de pedidos mantidos em memória (0 = desativado)
+    ORDER_DETAIL_CACHE_TTL: int = 60 * 10  # Validade de um detalhe em cache (segundos)
+    
     # Caching
     REDIS_URL: Optional[str] = None
     CACHE_TTL: int = 3600  # 1 hour default
@@ -63,6 +91,10 @@ class Settings(BaseSettings):
         else:
             # Development: use default localhost origins
             return self.BACKEND_CORS_ORIGINS
+    
+    def get_pdf_text_engines(self) -> list[str]:
+        """Get PDF text extraction engines, cheapest first (the last one is the reference)"""
+        return [engine.strip() for engine in self.PDF_TEXT_ENGINES.split(",") if engine.strip()]
 
 
 @lru_cache()
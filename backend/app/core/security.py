@@ -1,5 +1,7 @@
+import hashlib
+import hmac
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Optional, Union
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
@@ -18,6 +20,12 @@ def get_password_hash(password: str) -> str:
     """Gera hash da senha"""
     return pwd_context.hash(password)
 
+def get_pin_lookup(pin: str) -> str:
+    """Gera chave de busca do PIN (HMAC-SHA256 com o pepper do servidor)"""
+    return hmac.new(
+        settings.PIN_PEPPER.encode("utf-8"), pin.encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
@@ -31,6 +39,25 @@ def create_access_token(
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+def _pdf_preview_key() -> str:
+    """Chave dos tokens de preview (derivada, não vale como token de acesso)"""
+    return hmac.new(
+        settings.SECRET_KEY.encode("utf-8"), b"pdf-preview", hashlib.sha256
+    ).hexdigest()
+
+def create_pdf_preview_token(preview_id: str, user_id: int, expires_delta: timedelta) -> str:
+    """Cria token assinado que referencia um preview de PDF guardado no servidor"""
+    expire = datetime.utcnow() + expires_delta
+    to_encode = {"exp": expire, "sub": preview_id, "uid": user_id}
+    return jwt.encode(to_encode, _pdf_preview_key(), algorithm=settings.ALGORITHM)
+
+def decode_pdf_preview_token(token: str) -> Optional[dict]:
+    """Decodifica token de preview de PDF (None se inválido ou expirado)"""
+    try:
+        return jwt.decode(token, _pdf_preview_key(), algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+
 def verify_token(token: str) -> dict:
     """Verifica e decodifica token JWT"""
     try:
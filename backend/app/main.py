@@ -13,6 +13,9 @@ from app.core.security_middleware import (
     validate_security_config
 )
 from app.core.cache import close_redis_client
+from app.services.password_hasher import password_hasher
+from app.services.pdf_parser_pool import pdf_parser_pool
+from app.services.order_progress_reconciler import order_progress_reconciler
 # Import all models to ensure they're registered with Base
 from app.models import User, Order, OrderItem, OrderAccess, PurchaseItem
 
@@ -121,6 +124,7 @@ class CORSErrorMiddleware(BaseHTTPMiddleware):
             response.headers["Access-Control-Allow-Credentials"] = "true"
             response.headers["Access-Control-Allow-Methods"] = "GET, POST, PUT, DELETE, OPTIONS"
             response.headers["Access-Control-Allow-Headers"] = "Content-Type, Authorization"
+            response.headers["Access-Control-Expose-Headers"] = "X-Next-Cursor, Preference-Applied, ETag"
         
         return response
 
@@ -139,6 +143,10 @@ async def startup_event():
     
     # Comentado temporariamente para evitar falha de conexão no startup
     # await init_db()
+    # Aquecer workers do parser de PDF
+    await pdf_parser_pool.warm_up()
+    # Reconciliação periódica dos contadores de progresso
+    order_progress_reconciler.start()
     logger.info("Application startup completed")
 
 
@@ -146,7 +154,10 @@ async def startup_event():
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down application...")
+    await order_progress_reconciler.stop()
     await close_redis_client()
+    password_hasher.shutdown()
+    pdf_parser_pool.shutdown()
     logger.info("Application shutdown completed")
 
 # Add security middleware
@@ -167,6 +178,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Preference-Applied", "ETag"],
 )
 
 # Include routers
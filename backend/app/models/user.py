@@ -1,13 +1,13 @@
 """Modelo de usuário do sistema."""
 from datetime import datetime
 from enum import Enum
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 
 from sqlalchemy import Column, Integer, String, DateTime, Enum as SQLEnum, Boolean
 from sqlalchemy.orm import relationship, validates
 
 from app.core.database import Base
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, get_pin_lookup
 
 if TYPE_CHECKING:
     from app.models.order import Order
@@ -32,6 +32,7 @@ class User(Base):
     name = Column(String(100), nullable=False)
     pin_hash = Column(String(255), nullable=False)
     pin_unique = Column(String(4), nullable=False, unique=True, index=True)  # PIN para unicidade
+    pin_lookup = Column(String(64), nullable=False, unique=True, index=True)  # HMAC do PIN para login
     role = Column(SQLEnum(UserRole), nullable=False)
     photo_url = Column(String(500), nullable=True)  # URL para foto do usuário
     is_active = Column(Boolean, default=True, nullable=False)
@@ -45,10 +46,13 @@ class User(Base):
             raise ValueError("Nome é obrigatório")
         
         # Validar e hash do PIN se fornecido
+        # (pin_hash pode vir pré-calculado pelo password_hasher, fora do event loop)
         if pin is not None:
             self._validate_pin(pin)
-            kwargs['pin_hash'] = get_password_hash(pin)
+            if not kwargs.get('pin_hash'):
+                kwargs['pin_hash'] = get_password_hash(pin)
             kwargs['pin_unique'] = pin  # Para garantir unicidade
+            kwargs['pin_lookup'] = get_pin_lookup(pin)  # Para busca indexada no login
         
         super().__init__(**kwargs)
     
@@ -71,6 +75,19 @@ class User(Base):
         if not pin.isdigit():
             raise ValueError("PIN deve conter apenas números")
     
+    def set_pin(self, pin: str, pin_hash: Optional[str] = None) -> None:
+        """
+        Altera o PIN do usuário mantendo hash, unicidade e chave de busca.
+        
+        Args:
+            pin: Novo PIN de 4 dígitos
+            pin_hash: Hash bcrypt já calculado para o PIN (opcional)
+        """
+        self._validate_pin(pin)
+        self.pin_hash = pin_hash or get_password_hash(pin)
+        self.pin_unique = pin
+        self.pin_lookup = get_pin_lookup(pin)
+    
     @property
     def pin(self):
         """Property para compatibilidade com testes (retorna None pois PIN é hasheado)."""
@@ -1,9 +1,12 @@
 """Repository para operações com pedidos."""
-from typing import Optional, List, Dict, Any
+import base64
+import json
+from typing import Optional, List, Dict, Any, Sequence, Tuple
 from datetime import datetime, timedelta
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import Row, Select, select, func, and_, or_, insert, update, case, literal, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
@@ -11,6 +14,12 @@ from app.models.order_access import OrderAccess
 from app.repositories.base import BaseRepository
 from app.schemas.pdf import PDFExtractedData
 
+# Colunas padrão de list_summaries (dados da listagem de pedidos)
+SUMMARY_COLUMNS = (
+    "id", "order_number", "client_name", "seller_name", "total_value",
+    "items_count", "items_separated", "items_not_sent", "created_at",
+)
+
 
 class OrderRepository(BaseRepository[Order]):
     """
@@ -35,6 +44,64 @@ class OrderRepository(BaseRepository[Order]):
         """
         return await self.get_by(order_number=order_number)
     
+    async def get_ids_by_order_numbers(self, order_numbers: List[str]) -> Dict[str, int]:
+        """
+        Busca os pedidos existentes entre vários números, em uma consulta.
+        
+        Args:
+            order_numbers: Números dos pedidos
+        
+        Returns:
+            Dict[str, int]: ID de cada número já cadastrado
+        """
+        if not order_numbers:
+            return {}
+        
+        query = select(Order.order_number, Order.id).where(
+            Order.order_number.in_(set(order_numbers))
+        )
+        result = await self.session.execute(query)
+        return {order_number: order_id for order_number, order_id in result.all()}
+    
+    async def get_revision(self, order_id: int) -> Optional[int]:
+        """
+        Busca só a revisão do pedido (consulta pela chave primária).
+        
+        Args:
+            order_id: ID do pedido
+            
+        Returns:
+            Optional[int]: Revisão do pedido ou None se não existir
+        """
+        result = await self.session.execute(select(Order.revision).where(Order.id == order_id))
+        return result.scalar_one_or_none()
+    
+    async def get_detail(self, order_id: int) -> Optional[Tuple[Order, List[OrderItem]]]:
+        """
+        Busca pedido e itens (ordem alfabética) em uma única consulta.
+        
+        Pedido, revisão e itens vêm da mesma linha do resultado: o detalhe
+        montado sempre corresponde à revisão lida, mesmo com alterações
+        concorrentes. Objetos já carregados na sessão são atualizados.
+        
+        Args:
+            order_id: ID do pedido
+            
+        Returns:
+            Optional[Tuple[Order, List[OrderItem]]]: Pedido e itens ou None
+        """
+        query = (
+            select(Order, OrderItem)
+            .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+            .where(Order.id == order_id)
+            .order_by(OrderItem.product_name)
+            .execution_options(populate_existing=True)
+        )
+        rows = (await self.session.execute(query)).all()
+        if not rows:
+            return None
+        return rows[0][0], [item for _, item in rows if item is not None]
+    
     async def get_with_items(self, id: int) -> Optional[Order]:
         """
         Busca pedido com seus itens.
@@ -144,7 +211,11 @@ class OrderRepository(BaseRepository[Order]):
     
     async def update_progress(self, order_id: int) -> Optional[Order]:
         """
-        Atualiza contadores de progresso do pedido.
+        Recalcula os contadores de progresso do pedido a partir dos itens.
+        
+        Contagem e atualização em um único UPDATE no banco, sem carregar os
+        itens. No dia a dia os contadores são mantidos por
+        apply_progress_delta; este método é a recontagem completa.
         
         Args:
             order_id: ID do pedido
@@ -152,45 +223,131 @@ class OrderRepository(BaseRepository[Order]):
         Returns:
             Optional[Order]: Pedido atualizado ou None
         """
-        order = await self.get_with_items(order_id)
-        if not order:
-            return None
+        # Grava alterações pendentes do pedido antes do UPDATE
+        await self.session.flush()
+        
+        separated, in_purchase, not_sent = self._item_counts()
+        return await self._set_progress(
+            Order.id == order_id, separated, in_purchase, not_sent
+        )
+    
+    async def apply_progress_delta(
+        self,
+        order_id: int,
+        separated: int = 0,
+        in_purchase: int = 0,
+        not_sent: int = 0
+    ) -> Optional[Order]:
+        """
+        Aplica variações aos contadores de progresso em um único UPDATE.
+        
+        Deve ser chamado na mesma transação das mudanças de estado dos
+        itens. O custo não depende do número de itens do pedido; o status é
+        promovido no próprio UPDATE (IN_PROGRESS ou COMPLETED) e a revisão
+        é incrementada mesmo com variações zero (itens mudaram, contadores não).
+        
+        Args:
+            order_id: ID do pedido
+            separated: Variação de itens separados
+            in_purchase: Variação de itens em compras
+            not_sent: Variação de itens não enviados
             
-        # Contar itens
-        items_separated = sum(1 for item in order.items if item.is_separated)
-        items_in_purchase = sum(1 for item in order.items if item.sent_to_purchase)
-        items_not_sent = sum(1 for item in order.items if item.not_sent)
-        
-        # Debug logging
-        import logging
-        logger = logging.getLogger(__name__)
-        logger.info(f"🔍 update_progress Debug for order {order_id}: "
-                   f"items_separated={items_separated}, items_in_purchase={items_in_purchase}, "
-                   f"items_not_sent={items_not_sent}, items_count={order.items_count}")
-        
-        # Atualizar contadores
-        order.items_separated = items_separated
-        order.items_in_purchase = items_in_purchase
-        order.items_not_sent = items_not_sent
-        
-        # Atualizar status se necessário
-        # Verificar se está completo sem usar a propriedade is_complete (evita lazy loading)
-        # Itens separados E não enviados contam como "completados" (alinhado com o frontend)
-        processed_items = items_separated + items_not_sent
-        is_complete = processed_items == order.items_count and order.items_count > 0
-        
-        logger.info(f"🔍 update_progress Complete check for order {order_id}: "
-                   f"processed_items={processed_items}, items_count={order.items_count}, "
-                   f"is_complete={is_complete}, progress_percentage={order.progress_percentage}")
-        
-        if is_complete:
-            order.status = OrderStatus.COMPLETED
-            order.completed_at = datetime.utcnow()
-        elif items_separated > 0 or items_in_purchase > 0 or items_not_sent > 0:
-            order.status = OrderStatus.IN_PROGRESS
+        Returns:
+            Optional[Order]: Pedido atualizado ou None
+        """
+        return await self._set_progress(
+            Order.id == order_id,
+            Order.items_separated + separated,
+            Order.items_in_purchase + in_purchase,
+            Order.items_not_sent + not_sent
+        )
+    
+    async def reconcile_progress(self, since: Optional[datetime] = None) -> List[int]:
+        """
+        Corrige contadores de progresso que divergem dos itens.
+        
+        Um único UPDATE recontando os itens de cada pedido e alterando só
+        os pedidos com diferença. Não faz commit.
+        
+        Args:
+            since: Só pedidos atualizados a partir desta data (None = todos)
             
-        await self.session.flush()
-        return order
+        Returns:
+            List[int]: IDs dos pedidos corrigidos
+        """
+        separated, in_purchase, not_sent = self._item_counts()
+        drift = or_(
+            Order.items_separated != separated,
+            Order.items_in_purchase != in_purchase,
+            Order.items_not_sent != not_sent
+        )
+        if since is not None:
+            drift = and_(Order.updated_at >= since, drift)
+        
+        result = await self.session.execute(
+            update(Order)
+            .where(drift)
+            .values(**self._progress_values(separated, in_purchase, not_sent))
+            .returning(Order.id)
+            .execution_options(synchronize_session=False)
+        )
+        return list(result.scalars().all())
+    
+    async def _set_progress(self, where, separated, in_purchase, not_sent) -> Optional[Order]:
+        """UPDATE dos contadores e do status de um pedido, devolvendo o pedido atualizado."""
+        result = await self.session.execute(
+            update(Order)
+            .where(where)
+            .values(**self._progress_values(separated, in_purchase, not_sent))
+            .returning(Order)
+            .execution_options(synchronize_session="fetch")
+        )
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    def _item_counts():
+        """Contagens dos itens de cada pedido (subconsultas correlacionadas)."""
+        def count(condition):
+            return (
+                select(func.count(OrderItem.id))
+                .where(OrderItem.order_id == Order.id, condition)
+                .scalar_subquery()
+            )
+        
+        return (
+            count(OrderItem.is_separated == True),
+            count(OrderItem.sent_to_purchase == True),
+            count(OrderItem.not_sent == True)
+        )
+    
+    @staticmethod
+    def _progress_values(separated, in_purchase, not_sent) -> Dict[str, Any]:
+        """
+        Valores do UPDATE de progresso: contadores e status calculado no SQL.
+        
+        Itens separados E não enviados contam como processados (compras não
+        contam): com todos processados o pedido é COMPLETED; com qualquer
+        contador positivo, IN_PROGRESS; senão o status não muda. A revisão
+        do pedido é incrementada.
+        """
+        status_type = Order.__table__.c.status.type
+        is_complete = and_(Order.items_count > 0, separated + not_sent == Order.items_count)
+        is_started = or_(separated > 0, in_purchase > 0, not_sent > 0)
+        return {
+            "items_separated": separated,
+            "items_in_purchase": in_purchase,
+            "items_not_sent": not_sent,
+            "revision": Order.revision + 1,
+            "status": case(
+                (is_complete, literal(OrderStatus.COMPLETED, status_type)),
+                (is_started, literal(OrderStatus.IN_PROGRESS, status_type)),
+                else_=Order.status
+            ),
+            "completed_at": case(
+                (and_(is_complete, Order.status != OrderStatus.COMPLETED), datetime.utcnow()),
+                else_=Order.completed_at
+            ),
+        }
     
     async def get_orders_with_active_access(self, user_id: int) -> List[Order]:
         """
@@ -270,7 +427,7 @@ class OrderRepository(BaseRepository[Order]):
             observations: Observações
             
         Returns:
-            Order: Pedido criado
+            Order: Pedido criado, com os itens (IDs preenchidos)
         """
         # Criar o pedido
         order = Order(
@@ -289,38 +446,101 @@ class OrderRepository(BaseRepository[Order]):
         self.session.add(order)
         await self.session.flush()  # Para ter o ID do pedido
         
-        # Criar os itens
-        for item_data in pdf_data.items:
-            item = OrderItem(
-                order_id=order.id,
-                product_code=item_data.product_code,
-                product_reference=item_data.product_reference,
-                product_name=item_data.product_name,
-                quantity=item_data.quantity,
-                unit_price=item_data.unit_price,
-                total_price=item_data.total_price
-            )
-            self.session.add(item)
+        # Criar os itens em lote: um executemany em vez de um INSERT por
+        # item, e os itens (com IDs) lidos de volta em uma consulta
+        await self.session.execute(insert(OrderItem), self._item_rows(order.id, pdf_data))
+        items = await self.session.scalars(
+            select(OrderItem).where(OrderItem.order_id == order.id).order_by(OrderItem.id)
+        )
+        set_committed_value(order, "items", list(items))
         
         await self.session.commit()
         return order
     
+    async def bulk_create_from_pdf_data(self, orders: List[PDFExtractedData]) -> Dict[str, int]:
+        """
+        Cria vários pedidos com seus itens, em dois comandos em lote.
+        
+        Não faz commit: o chamador define o tamanho da transação.
+        
+        Args:
+            orders: Dados dos pedidos (números ainda não cadastrados)
+            
+        Returns:
+            Dict[str, int]: ID de cada pedido criado, pelo número
+        """
+        if not orders:
+            return {}
+        
+        result = await self.session.execute(
+            insert(Order).returning(Order.order_number, Order.id),
+            [
+                {
+                    "order_number": pdf_data.order_number,
+                    "client_name": pdf_data.client_name,
+                    "seller_name": pdf_data.seller_name,
+                    "order_date": pdf_data.order_date,
+                    "total_value": pdf_data.total_value,
+                    "items_count": pdf_data.items_count,
+                    "status": OrderStatus.PENDING,
+                }
+                for pdf_data in orders
+            ]
+        )
+        order_ids = {order_number: order_id for order_number, order_id in result.all()}
+        
+        await self.session.execute(
+            insert(OrderItem),
+            [
+                row
+                for pdf_data in orders
+                for row in self._item_rows(order_ids[pdf_data.order_number], pdf_data)
+            ]
+        )
+        return order_ids
+    
+    @staticmethod
+    def _item_rows(order_id: int, pdf_data: PDFExtractedData) -> List[Dict[str, Any]]:
+        """Linhas de order_items de um pedido, para INSERT em lote."""
+        return [
+            {
+                "order_id": order_id,
+                "product_code": item_data.product_code,
+                "product_reference": item_data.product_reference,
+                "product_name": item_data.product_name,
+                "quantity": item_data.quantity,
+                "unit_price": item_data.unit_price,
+                "total_price": item_data.total_price,
+            }
+            for item_data in pdf_data.items
+        ]
+    
     async def list_paginated(
         self,
         offset: int = 0,
         limit: int = 20,
-        status_filter: Optional[str] = None
+        status_filter: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[Order]:
         """
-        Lista pedidos com paginação e filtros.
+        Lista pedidos com paginação e filtros, do mais recente ao mais antigo.
+        
+        Com `cursor`, a página começa logo após o último pedido da página
+        anterior (paginação por chave em created_at, id) e `offset` é
+        ignorado: o custo não cresce com a profundidade e a página não se
+        desloca quando novos pedidos chegam.
         
         Args:
             offset: Offset para paginação
             limit: Limite de resultados
             status_filter: Filtro por status
+            cursor: Cursor da página anterior (encode_cursor do último pedido)
             
         Returns:
             List[Order]: Lista de pedidos
+            
+        Raises:
+            ValueError: Se o cursor for inválido
         """
         try:
             from sqlalchemy.orm import selectinload
@@ -328,19 +548,8 @@ class OrderRepository(BaseRepository[Order]):
             query = (
                 select(Order)
                 .options(selectinload(Order.items))  # Eagerly load items relationship
-                .order_by(Order.created_at.desc())
             )
-            
-            # Aplicar filtro por status se fornecido
-            if status_filter:
-                try:
-                    status_enum = OrderStatus(status_filter)
-                    query = query.where(Order.status == status_enum)
-                except ValueError:
-                    # Ignora filtro inválido
-                    pass
-            
-            query = query.offset(offset).limit(limit)
+            query = self._paginate(query, offset, limit, status_filter, cursor)
             result = await self.session.execute(query)
             return list(result.scalars().all())
         except Exception as e:
@@ -349,6 +558,111 @@ class OrderRepository(BaseRepository[Order]):
             logger.error(f"Error in list_paginated: {str(e)}")
             raise
     
+    async def list_summaries(
+        self,
+        offset: int = 0,
+        limit: int = 20,
+        status_filter: Optional[str] = None,
+        cursor: Optional[str] = None,
+        columns: Sequence[str] = SUMMARY_COLUMNS
+    ) -> List[Row]:
+        """
+        Lista pedidos como linhas com apenas as colunas pedidas.
+        
+        Mesma ordem, filtros e paginação de list_paginated, mas sem
+        carregar itens nem montar objetos Order: para listagens que só
+        mostram dados do pedido. `id`, `created_at` (usados pelo cursor) e
+        `revision` (ETag da página) sempre vêm na linha.
+        
+        Args:
+            offset: Offset para paginação
+            limit: Limite de resultados
+            status_filter: Filtro por status
+            cursor: Cursor da página anterior (encode_cursor da última linha)
+            columns: Colunas de orders a selecionar
+            
+        Returns:
+            List[Row]: Linhas com os atributos das colunas selecionadas
+            
+        Raises:
+            ValueError: Se uma coluna não existir ou o cursor for inválido
+        """
+        table_columns = Order.__table__.columns
+        unknown = [column for column in columns if column not in table_columns]
+        if unknown:
+            raise ValueError(f"Unknown order columns: {', '.join(unknown)}")
+        
+        selected = ["id", "created_at", "revision"] + [
+            column for column in columns if column not in ("id", "created_at", "revision")
+        ]
+        query = select(*(getattr(Order, column) for column in selected))
+        query = self._paginate(query, offset, limit, status_filter, cursor)
+        result = await self.session.execute(query)
+        return list(result.all())
+    
+    def _paginate(
+        self,
+        query: Select,
+        offset: int,
+        limit: int,
+        status_filter: Optional[str],
+        cursor: Optional[str]
+    ) -> Select:
+        """Aplica ordenação, filtro de status e página (offset ou cursor) à listagem."""
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
+        
+        # Aplicar filtro por status se fornecido
+        if status_filter:
+            try:
+                status_enum = OrderStatus(status_filter)
+                query = query.where(Order.status == status_enum)
+            except ValueError:
+                # Ignora filtro inválido
+                pass
+        
+        if cursor:
+            created_at, order_id = self.decode_cursor(cursor)
+            query = query.where(tuple_(Order.created_at, Order.id) < tuple_(created_at, order_id))
+        else:
+            query = query.offset(offset)
+        
+        return query.limit(limit)
+    
+    @staticmethod
+    def encode_cursor(order: Order) -> str:
+        """
+        Cursor opaco para a página seguinte a `order` em list_paginated.
+        
+        Args:
+            order: Último pedido da página (ou linha de list_summaries)
+            
+        Returns:
+            str: Cursor (base64 url-safe)
+        """
+        payload = json.dumps([order.created_at.isoformat(), order.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+    
+    @staticmethod
+    def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+        """
+        Lê um cursor gerado por encode_cursor.
+        
+        Args:
+            cursor: Cursor recebido do cliente
+            
+        Returns:
+            Tuple[datetime, int]: created_at e id do último pedido da página
+            
+        Raises:
+            ValueError: Se o cursor for inválido
+        """
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, order_id = json.loads(payload)
+            return datetime.fromisoformat(created_at), int(order_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {cursor!r}") from e
+    
     async def recalculate_progress(self, order_id: int) -> Optional[Order]:
         """
         Recalcula o progresso de um pedido.
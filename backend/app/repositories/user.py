@@ -3,8 +3,10 @@ from typing import Optional, List
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.security import get_pin_lookup
 from app.models.user import User, UserRole
 from app.repositories.base import BaseRepository
+from app.services.password_hasher import password_hasher
 
 
 class UserRepository(BaseRepository[User]):
@@ -18,6 +20,36 @@ class UserRepository(BaseRepository[User]):
         """Inicializa o repository com o modelo User."""
         super().__init__(User, session)
     
+    async def create_user(self, pin: str, **kwargs) -> User:
+        """
+        Cria um usuário calculando o hash do PIN fora do event loop.
+        
+        Args:
+            pin: PIN do usuário
+            **kwargs: Demais campos do usuário
+            
+        Returns:
+            User: Usuário criado
+        """
+        pin_hash = await password_hasher.hash(pin)
+        return await self.create(pin=pin, pin_hash=pin_hash, **kwargs)
+    
+    async def update_pin(self, user: User, pin: str) -> User:
+        """
+        Altera o PIN de um usuário calculando o hash fora do event loop.
+        
+        Args:
+            user: Usuário a ser alterado
+            pin: Novo PIN
+            
+        Returns:
+            User: Usuário atualizado
+        """
+        pin_hash = await password_hasher.hash(pin)
+        user.set_pin(pin, pin_hash=pin_hash)
+        await self.session.flush()
+        return user
+    
     async def get_all_users(self) -> List[User]:
         """
         Busca todos os usuários para verificação de PIN.
@@ -50,7 +82,10 @@ class UserRepository(BaseRepository[User]):
     
     async def get_by_pin(self, pin: str) -> Optional[User]:
         """
-        Busca usuário pelo PIN (usando pin_unique).
+        Busca usuário pelo PIN (usando o índice pin_lookup).
+        
+        Uma única consulta indexada substitui a varredura de todos os
+        usuários com bcrypt; o hash ainda deve ser conferido pelo chamador.
         
         Args:
             pin: PIN do usuário
@@ -58,7 +93,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Optional[User]: Usuário encontrado ou None
         """
-        query = select(User).where(User.pin_unique == pin)
+        query = select(User).where(User.pin_lookup == get_pin_lookup(pin))
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
     
@@ -73,7 +108,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             bool: True se o PIN é único
         """
-        query = select(User).where(User.pin_unique == pin)
+        query = select(User).where(User.pin_lookup == get_pin_lookup(pin))
         
         if exclude_id:
             query = query.where(User.id != exclude_id)
@@ -93,7 +128,7 @@ class UserRepository(BaseRepository[User]):
         """
         user = await self.get_by_pin(pin)
         
-        if user and user.is_active:
+        if user and user.is_active and await password_hasher.verify(pin, user.pin_hash):
             return user
             
         return None
\ No newline at end of file
@@ -0,0 +1,277 @@
+"""
+Importação em massa de pedidos.
+
+Carrega pedidos históricos (migrações, backfills, recuperação de falhas) a
+partir de JSONL ou CSV no formato de PDFExtractedData, sem passar pelo
+fluxo de upload/confirmação de PDF.
+
+As linhas são lidas em fluxo e processadas em lotes: cada lote é validado
+em uma única chamada ao pydantic, os pedidos já cadastrados são
+descobertos com uma consulta para o lote inteiro e os novos pedidos e
+seus itens são inseridos em dois comandos, em uma transação por lote.
+"""
+import csv
+import json
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import OrderImportResult, OrderImportRowError, PDFExtractedData
+
+# Colunas do CSV: uma linha por item, repetindo os dados do pedido
+CSV_ORDER_COLUMNS = ("order_number", "client_name", "seller_name", "order_date", "total_value")
+CSV_ITEM_COLUMNS = ("product_code", "product_reference", "product_name", "quantity", "unit_price", "total_price")
+
+ProgressCallback = Callable[[OrderImportResult], Awaitable[None]]
+
+
+class OrderImportError(Exception):
+    """Exceção para arquivos de importação que não podem ser lidos."""
+    pass
+
+
+class SourceRow(NamedTuple):
+    """Pedido lido do arquivo, ainda não validado."""
+    line: int
+    data: Optional[dict]
+    error: Optional[str] = None
+
+
+def iter_jsonl(lines: Iterable[str]) -> Iterator[SourceRow]:
+    """
+    Lê pedidos de JSONL: um objeto PDFExtractedData por linha.
+
+    Args:
+        lines: Linhas do arquivo
+
+    Yields:
+        SourceRow: Um pedido por linha não vazia
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield SourceRow(line_number, None, f"JSON inválido: {e.msg}")
+            continue
+        if not isinstance(data, dict):
+            yield SourceRow(line_number, None, "Linha não é um objeto JSON")
+            continue
+        yield SourceRow(line_number, data)
+
+
+def iter_csv(lines: Iterable[str]) -> Iterator[SourceRow]:
+    """
+    Lê pedidos de CSV com cabeçalho: uma linha por item.
+
+    Linhas consecutivas com o mesmo order_number formam um pedido; os dados
+    do pedido vêm da primeira delas.
+
+    Args:
+        lines: Linhas do arquivo
+
+    Yields:
+        SourceRow: Um pedido por grupo de linhas
+
+    Raises:
+        OrderImportError: Se faltarem colunas no cabeçalho
+    """
+    reader = csv.DictReader(lines)
+    missing = [
+        column for column in CSV_ORDER_COLUMNS + CSV_ITEM_COLUMNS
+        if column not in (reader.fieldnames or [])
+    ]
+    if missing:
+        raise OrderImportError(f"Colunas ausentes no CSV: {', '.join(missing)}")
+
+    current: Optional[dict] = None
+    current_line = 0
+    for row in reader:
+        if current is None or row["order_number"] != current["order_number"]:
+            if current is not None:
+                yield SourceRow(current_line, current)
+            current = {column: row[column] for column in CSV_ORDER_COLUMNS}
+            current["items"] = []
+            current_line = reader.line_num
+        current["items"].append({column: row[column] for column in CSV_ITEM_COLUMNS})
+    if current is not None:
+        yield SourceRow(current_line, current)
+
+
+def read_rows(filename: str, lines: Iterable[str]) -> Iterator[SourceRow]:
+    """
+    Escolhe o leitor pela extensão do arquivo.
+
+    Args:
+        filename: Nome do arquivo (.jsonl, .ndjson ou .csv)
+        lines: Linhas do arquivo
+
+    Returns:
+        Iterator[SourceRow]: Pedidos lidos do arquivo
+
+    Raises:
+        OrderImportError: Se a extensão não for suportada
+    """
+    name = filename.lower()
+    if name.endswith((".jsonl", ".ndjson")):
+        return iter_jsonl(lines)
+    if name.endswith(".csv"):
+        return iter_csv(lines)
+    raise OrderImportError("Formato não suportado (use .jsonl ou .csv)")
+
+
+class OrderImporter:
+    """Importação de pedidos em lotes."""
+
+    _adapter = TypeAdapter(List[PDFExtractedData])
+
+    def __init__(
+        self,
+        batch_size: int = settings.ORDER_IMPORT_BATCH_SIZE,
+        max_errors: int = settings.ORDER_IMPORT_MAX_ERRORS
+    ):
+        """
+        Inicializa o importador.
+
+        Args:
+            batch_size: Pedidos por lote (validação, consulta e transação)
+            max_errors: Rejeições detalhadas no resultado (as demais só contam)
+        """
+        self.batch_size = max(1, batch_size)
+        self.max_errors = max_errors
+
+    async def run(
+        self,
+        rows: Iterable[SourceRow],
+        session: AsyncSession,
+        progress: Optional[ProgressCallback] = None
+    ) -> OrderImportResult:
+        """
+        Importa os pedidos, um lote por transação.
+
+        Pedidos já cadastrados ou repetidos no arquivo são ignorados. Um
+        erro no banco desfaz só o lote corrente; os anteriores continuam
+        gravados.
+
+        Args:
+            rows: Pedidos lidos do arquivo (iter_jsonl ou iter_csv)
+            session: Sessão do banco de dados
+            progress: Chamado após cada lote com os totais até o momento
+
+        Returns:
+            OrderImportResult: Totais da importação
+        """
+        repository = OrderRepository(session)
+        result = OrderImportResult(
+            total_rows=0, imported=0, items_imported=0, skipped_existing=0,
+            duplicates=0, invalid=0, elapsed_seconds=0.0
+        )
+        seen: Set[str] = set()
+        start = time.perf_counter()
+
+        batch: List[SourceRow] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                await self._import_batch(batch, session, repository, seen, result)
+                batch = []
+                result.elapsed_seconds = time.perf_counter() - start
+                if progress is not None:
+                    await progress(result)
+        if batch:
+            await self._import_batch(batch, session, repository, seen, result)
+
+        result.elapsed_seconds = time.perf_counter() - start
+        if progress is not None and batch:
+            await progress(result)
+        return result
+
+    async def _import_batch(
+        self,
+        batch: List[SourceRow],
+        session: AsyncSession,
+        repository: OrderRepository,
+        seen: Set[str],
+        result: OrderImportResult
+    ) -> None:
+        """Valida, filtra e grava um lote."""
+        result.total_rows += len(batch)
+
+        new_orders: List[PDFExtractedData] = []
+        for row, pdf_data in self._validate(batch, result):
+            if pdf_data.order_number in seen:
+                result.duplicates += 1
+                continue
+            seen.add(pdf_data.order_number)
+            new_orders.append(pdf_data)
+
+        existing = await repository.get_ids_by_order_numbers([pdf_data.order_number for pdf_data in new_orders])
+        if existing:
+            result.skipped_existing += len(existing)
+            new_orders = [pdf_data for pdf_data in new_orders if pdf_data.order_number not in existing]
+
+        try:
+            await repository.bulk_create_from_pdf_data(new_orders)
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+        result.imported += len(new_orders)
+        result.items_imported += sum(pdf_data.models_count for pdf_data in new_orders)
+
+    def _validate(
+        self,
+        batch: List[SourceRow],
+        result: OrderImportResult
+    ) -> List[Tuple[SourceRow, PDFExtractedData]]:
+        """
+        Valida o lote em uma chamada; rejeita os pedidos inválidos.
+
+        Se algum pedido falhar, os erros indicam quais (pelo índice na lista)
+        e os demais são validados de novo, também em uma chamada.
+        """
+        rejected: List[Tuple[SourceRow, str]] = []
+        candidates = []
+        for row in batch:
+            if row.error is not None:
+                rejected.append((row, row.error))
+            else:
+                candidates.append(row)
+
+        try:
+            validated = self._adapter.validate_python([row.data for row in candidates])
+        except ValidationError as e:
+            errors: Dict[int, str] = {}
+            for error in e.errors():
+                index, *location = error["loc"]
+                field = ".".join(str(part) for part in location)
+                errors.setdefault(index, f"{field}: {error['msg']}" if field else error["msg"])
+            rejected.extend((candidates[index], message) for index, message in errors.items())
+            candidates = [row for index, row in enumerate(candidates) if index not in errors]
+            validated = self._adapter.validate_python([row.data for row in candidates])
+
+        for row, message in sorted(rejected, key=lambda rejection: rejection[0].line):
+            self._reject(result, row, message)
+        return list(zip(candidates, validated))
+
+    def _reject(self, result: OrderImportResult, row: SourceRow, message: str) -> None:
+        """Conta um pedido rejeitado e guarda o motivo, até max_errors."""
+        result.invalid += 1
+        if len(result.errors) < self.max_errors:
+            order_number = row.data.get("order_number") if row.data else None
+            result.errors.append(OrderImportRowError(
+                line=row.line,
+                order_number=str(order_number) if order_number is not None else None,
+                message=message
+            ))
+
+
+# Instância global do importador
+order_importer = OrderImporter()
@@ -0,0 +1,115 @@
+"""
+Reconciliação periódica dos contadores de progresso dos pedidos.
+
+Os contadores de progresso (items_separated, items_in_purchase,
+items_not_sent) são mantidos por variação a cada mutação de itens, sem
+recontar o pedido. Se algum caminho alterar itens sem aplicar a variação
+(edição manual no banco, falha entre comandos), o contador diverge. Esta
+tarefa roda em segundo plano e, a cada `interval` segundos, reconta os
+pedidos atualizados na janela recente em um único UPDATE, corrigindo só
+os que divergem.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.database import get_session_maker
+from app.repositories.order import OrderRepository
+
+logger = logging.getLogger(__name__)
+
+
+class OrderProgressReconciler:
+    """Tarefa em segundo plano que corrige contadores de progresso divergentes."""
+
+    def __init__(self, interval: int = 300, window: int = 86400):
+        """
+        Inicializa a tarefa.
+
+        Args:
+            interval: Segundos entre execuções (0 = desativada)
+            window: Só pedidos atualizados nos últimos `window` segundos (0 = todos)
+        """
+        self.interval = interval
+        self.window = window
+        self._task: Optional[asyncio.Task] = None
+        self._runs = 0
+        self._orders_fixed = 0
+        self._failures = 0
+        self._last_run: Optional[datetime] = None
+        self._last_duration_ms = 0.0
+
+    async def reconcile(self) -> List[int]:
+        """
+        Executa uma reconciliação.
+
+        Returns:
+            List[int]: IDs dos pedidos corrigidos
+        """
+        since = datetime.utcnow() - timedelta(seconds=self.window) if self.window else None
+        start = time.perf_counter()
+        async with get_session_maker()() as session:
+            fixed = await OrderRepository(session).reconcile_progress(since=since)
+            await session.commit()
+
+        self._runs += 1
+        self._orders_fixed += len(fixed)
+        self._last_run = datetime.utcnow()
+        self._last_duration_ms = (time.perf_counter() - start) * 1000
+        if fixed:
+            logger.warning(f"Contadores de progresso corrigidos em {len(fixed)} pedidos: {fixed[:20]}")
+        return fixed
+
+    def start(self) -> None:
+        """Inicia a tarefa periódica (se ativada e ainda não iniciada)."""
+        if self.interval <= 0 or self._task is not None:
+            return
+        self._task = asyncio.create_task(self._loop())
+        logger.info(f"Reconciliação de progresso a cada {self.interval}s")
+
+    async def stop(self) -> None:
+        """Cancela a tarefa periódica."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self._failures += 1
+                logger.error(f"Erro na reconciliação de progresso: {e}")
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas da reconciliação.
+
+        Returns:
+            Dict[str, Any]: Execuções, pedidos corrigidos, falhas e última execução
+        """
+        return {
+            "running": self._task is not None,
+            "interval": self.interval,
+            "runs": self._runs,
+            "orders_fixed": self._orders_fixed,
+            "failures": self._failures,
+            "last_run": self._last_run.isoformat() if self._last_run else None,
+            "last_duration_ms": round(self._last_duration_ms, 2),
+        }
+
+
+# Instância global da tarefa
+order_progress_reconciler = OrderProgressReconciler(
+    interval=settings.ORDER_PROGRESS_RECONCILE_INTERVAL,
+    window=settings.ORDER_PROGRESS_RECONCILE_WINDOW
+)
@@ -0,0 +1,185 @@
+"""
+Upload em lote de PDFs.
+
+Recebe vários orçamentos em uma requisição e os processa em paralelo no
+pool de parsing. Arquivos repetidos no lote (mesmo conteúdo) são
+processados uma vez só; orçamentos com o mesmo número de pedido dentro do
+lote ou já cadastrados são sinalizados, consultando o banco uma única vez
+para o lote inteiro.
+"""
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, Tuple
+
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import BatchUploadFileResult, BatchUploadResponse, PDFPreviewResponse
+from app.services.pdf_import_jobs import build_pdf_preview
+from app.services.pdf_parse_cache import PDFParseCache, pdf_parse_cache
+from app.services.pdf_parser import PDFParseError
+from app.services.pdf_parser_pool import PDFParserPool, pdf_parser_pool
+from app.services.pdf_preview_store import PDFPreviewStore, pdf_preview_store
+
+logger = logging.getLogger(__name__)
+
+# Resultado de cada arquivo
+PARSED = "parsed"
+DUPLICATE_FILE = "duplicate_file"
+DUPLICATE_ORDER = "duplicate_order"
+EXISTING_ORDER = "existing_order"
+FAILED = "failed"
+
+
+class PDFBatchUploadService:
+    """Preview de vários PDFs em uma requisição."""
+
+    def __init__(
+        self,
+        pool: PDFParserPool = pdf_parser_pool,
+        cache: PDFParseCache = pdf_parse_cache,
+        previews: PDFPreviewStore = pdf_preview_store
+    ):
+        """
+        Inicializa o serviço.
+
+        Args:
+            pool: Pool de parsing
+            cache: Cache de resultados de parsing
+            previews: Store dos previews para o /confirm
+        """
+        self.pool = pool
+        self.cache = cache
+        self.previews = previews
+
+        # Métricas
+        self._batches = 0
+        self._files = 0
+        self._status_counts: Dict[str, int] = {
+            PARSED: 0, DUPLICATE_FILE: 0, DUPLICATE_ORDER: 0, EXISTING_ORDER: 0, FAILED: 0,
+        }
+
+    async def preview(
+        self,
+        files: List[Tuple[str, bytes]],
+        repository: OrderRepository,
+        user_id: int
+    ) -> BatchUploadResponse:
+        """
+        Processa os arquivos do lote.
+
+        Args:
+            files: Nome e conteúdo de cada arquivo, na ordem do envio
+            repository: Repository de pedidos (consulta dos já cadastrados)
+            user_id: Usuário que fez o upload (dono dos tokens de preview)
+
+        Returns:
+            BatchUploadResponse: Resultado por arquivo e totais do lote
+        """
+        results = []
+        first_by_hash: Dict[str, BatchUploadFileResult] = {}
+        unique: List[Tuple[BatchUploadFileResult, bytes]] = []
+
+        for filename, content in files:
+            content_hash = hashlib.sha256(content).hexdigest()
+            result = BatchUploadFileResult(filename=filename, content_hash=content_hash, status=PARSED)
+            first = first_by_hash.get(content_hash)
+            if first is not None:
+                result.status = DUPLICATE_FILE
+                result.duplicate_of = first.filename
+            else:
+                first_by_hash[content_hash] = result
+                unique.append((result, content))
+            results.append(result)
+
+        # Um parsing por conteúdo distinto; o pool limita a concorrência
+        previews = await asyncio.gather(*(self._parse(content) for _, content in unique))
+
+        first_by_order: Dict[str, BatchUploadFileResult] = {}
+        for (result, _), preview in zip(unique, previews):
+            result.preview = preview
+            if not preview.success:
+                result.status = FAILED
+                continue
+            order_number = preview.data.order_number
+            first = first_by_order.get(order_number)
+            if first is not None:
+                result.status = DUPLICATE_ORDER
+                result.duplicate_of = first.filename
+            else:
+                first_by_order[order_number] = result
+
+        existing = await repository.get_ids_by_order_numbers(list(first_by_order))
+        for order_number, order_id in existing.items():
+            result = first_by_order[order_number]
+            result.status = EXISTING_ORDER
+            result.existing_order_id = order_id
+
+        # Token do /confirm só para os arquivos prontos para confirmação
+        for result in first_by_order.values():
+            if result.status == PARSED:
+                result.preview.preview_token = await self.previews.put(result.preview.data, user_id)
+
+        # Cópias no lote repetem o resultado do primeiro arquivo
+        for result in results:
+            if result.status == DUPLICATE_FILE:
+                first = first_by_hash[result.content_hash]
+                result.preview = first.preview
+                result.existing_order_id = first.existing_order_id
+
+        self._record(results)
+        return BatchUploadResponse(
+            total=len(results),
+            parsed=sum(1 for result in results if result.status == PARSED),
+            duplicates=sum(1 for result in results if result.status in (DUPLICATE_FILE, DUPLICATE_ORDER)),
+            existing_orders=sum(1 for result in results if result.status == EXISTING_ORDER),
+            failed=sum(1 for result in results if result.status == FAILED),
+            results=results
+        )
+
+    async def _parse(self, content: bytes) -> PDFPreviewResponse:
+        """Preview de um arquivo; erros viram um preview sem sucesso."""
+        try:
+            extracted_data = await self.cache.get(content)
+            if extracted_data is None:
+                extracted_data = await self.pool.parse_bytes(content)
+                await self.cache.set(content, extracted_data)
+            return build_pdf_preview(extracted_data)
+        except PDFParseError as e:
+            return PDFPreviewResponse(
+                success=False,
+                message="Erro ao processar PDF",
+                data=None,
+                errors=[str(e)]
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error parsing PDF in batch upload: {str(e)}")
+            return PDFPreviewResponse(
+                success=False,
+                message="Erro interno ao processar PDF",
+                data=None,
+                errors=[str(e)]
+            )
+
+    def _record(self, results: List[BatchUploadFileResult]) -> None:
+        """Atualiza as métricas com o lote processado."""
+        self._batches += 1
+        self._files += len(results)
+        for result in results:
+            self._status_counts[result.status] += 1
+
+    def get_metrics(self) -> Dict[str, object]:
+        """
+        Retorna métricas dos uploads em lote.
+
+        Returns:
+            Dict[str, object]: Lotes, arquivos e arquivos por resultado
+        """
+        return {
+            "batches": self._batches,
+            "files": self._files,
+            "by_status": dict(self._status_counts),
+        }
+
+
+# Instância global do serviço
+pdf_batch_upload_service = PDFBatchUploadService()
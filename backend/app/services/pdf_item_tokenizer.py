@@ -0,0 +1,425 @@
+"""
+Tokenizador determinístico das linhas de item dos orçamentos.
+
+Reconhece a gramática `código / ref --> descrição / [extra /] UN / qtd /
+unitário / total` sem regex com grupos preguiçosos aninhados. O texto é
+dividido uma única vez nas barras; cada candidato a código é seguido por
+um número fixo de segmentos, verificados com operações de string. O tempo
+é linear no tamanho do texto, mesmo em linhas malformadas.
+
+Variantes, na ordem em que o parser as tenta:
+    strict: formato padrão (mesma gramática de PDFParser.PATTERNS['items'])
+    tolerant: aceita o marcador UN colado à referência ou à quantidade,
+        barras ausentes ou duplicadas e resíduos '<' (antigo fallback
+        tolerante)
+    legacy: aceita códigos de qualquer tamanho, sem exigir espaço antes
+        (antigo fallback legacy, usado pelos códigos de 3 dígitos)
+
+Os antigos fallbacks para `/<<UN` e `</< UN` não têm variante própria: o
+_normalize_text do parser já reescreve essas sequências antes da extração.
+
+O ItemStream aplica o mesmo tokenizador a um texto recebido em partes (ex.:
+página a página), devolvendo cada item assim que ele não depende mais do
+texto seguinte.
+"""
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+STRICT = "strict"
+TOLERANT = "tolerant"
+LEGACY = "legacy"
+
+# Ordem de tentativa: a próxima variante só é usada se a anterior não
+# produzir nenhum item válido
+ITEM_VARIANTS = (STRICT, TOLERANT, LEGACY)
+
+# Grupos: código, referência, descrição, extra, quantidade, unitário, total
+ItemGroups = Tuple[str, str, Optional[str], Optional[str], str, str, str]
+
+
+class ItemMatch(NamedTuple):
+    """Linha de item reconhecida pelo tokenizador."""
+
+    variant: str
+    groups: ItemGroups
+    start: int
+    end: int
+
+
+def _is_number_char(char: str) -> bool:
+    """Caractere válido em quantidades e valores ([\\d,\\.])."""
+    return char.isdecimal() or char == ',' or char == '.'
+
+
+def _is_decimal(value: str) -> bool:
+    """Segmento com apenas dígitos (\\s*\\d+\\s*)."""
+    return value.isdecimal()
+
+
+def _is_number(value: str) -> bool:
+    """Segmento com apenas dígitos, vírgulas e pontos (\\s*[\\d,\\.]+\\s*)."""
+    return bool(value) and all(_is_number_char(char) for char in value)
+
+
+def _is_unit(value: str) -> bool:
+    """Segmento com o marcador de unidade (\\s*UN\\s*)."""
+    return len(value) == 2 and value.upper() == "UN"
+
+
+def _split_reference(part: str) -> Tuple[str, Optional[str]]:
+    """
+    Separa referência e descrição no primeiro '-->'.
+
+    A referência precisa de ao menos um caractere e a descrição também,
+    como nos grupos `([^/]+?)(?:\\s*-->\\s*([^/]+?))?` do padrão original.
+    """
+    stripped = part.lstrip()
+    if not stripped:
+        return part, None
+    arrow = stripped.find('-->', 1)
+    if arrow == -1 or arrow + 3 >= len(stripped):
+        return stripped.strip(), None
+    return stripped[:arrow].strip(), stripped[arrow + 3:].strip()
+
+
+def _split_unit_marker(segment: str) -> Optional[Tuple[str, Optional[str]]]:
+    """
+    Localiza o marcador UN no fim de um segmento (variante tolerante).
+
+    Aceita a quantidade colada após o marcador (`REF UN 5`) e resíduos
+    '<' antes dele (`REF <<UN`). O marcador precisa ser um token: início
+    do segmento, espaço ou '<' antes dele.
+
+    Returns:
+        Tupla (texto antes do marcador, quantidade colada ou None), ou None
+    """
+    body = segment.rstrip()
+    quantity = None
+
+    digits = len(body)
+    while digits and body[digits - 1].isdecimal():
+        digits -= 1
+    if digits < len(body):
+        quantity = body[digits:]
+        body = body[:digits].rstrip()
+
+    if len(body) < 2 or body[-2:].upper() != "UN":
+        return None
+    prefix = body[:-2]
+    if prefix and not (prefix[-1].isspace() or prefix[-1] == '<'):
+        return None
+
+    # Até dois resíduos '<' entre a referência e o marcador (<?<?)
+    head = prefix.rstrip()
+    for _ in range(2):
+        if head.endswith('<'):
+            head = head[:-1].rstrip()
+    # Mantém um separador: a descrição após '-->' pode ser só espaço
+    return head + (' ' if len(prefix) > len(head) else ''), quantity
+
+
+class _NeedMoreText(Exception):
+    """Candidato depende de um segmento ainda não fechado (texto parcial)."""
+
+
+class ItemTokenizer:
+    """
+    Tokenizador de itens sobre um texto já normalizado e limpo.
+
+    Cada segmento entre barras é lido no máximo um número constante de
+    vezes por candidato, e cada barra gera no máximo um candidato.
+    """
+
+    def __init__(self, text: str, complete: bool = True):
+        """
+        Inicializa o tokenizador.
+
+        Args:
+            text: Texto com as linhas de item
+            complete: Se False, o texto é um prefixo do documento: a
+                tokenização para no primeiro candidato que depende de um
+                segmento não fechado e registra a posição em `pending`
+        """
+        self.text = text
+        self.complete = complete
+        # (início do código, fim do item anterior) do candidato adiado
+        self.pending: Optional[Tuple[int, int]] = None
+        self._slashes: List[int] = []
+        position = text.find('/')
+        while position != -1:
+            self._slashes.append(position)
+            position = text.find('/', position + 1)
+
+    def tokenize(self, variant: str = STRICT, last_end: int = 0) -> Iterator[ItemMatch]:
+        """
+        Percorre o texto devolvendo os itens reconhecidos, sem sobreposição.
+
+        Args:
+            variant: Variante da gramática (strict, tolerant ou legacy)
+            last_end: Fim do item anterior (início da busca)
+
+        Yields:
+            ItemMatch: Variante, grupos e posição de cada item
+        """
+        parse = self._parse_tolerant if variant == TOLERANT else self._parse_strict
+        for index, slash in enumerate(self._slashes):
+            if slash < last_end:
+                continue
+            code = self._code_before(slash, last_end, variant)
+            if code is None:
+                continue
+            try:
+                parsed = parse(index)
+            except _NeedMoreText:
+                self.pending = (code[1], last_end)
+                return
+            if parsed is None:
+                continue
+            groups, end = parsed
+            yield ItemMatch(variant, (code[0],) + groups, code[1], end)
+            last_end = end
+
+    def _code_before(self, slash: int, last_end: int, variant: str) -> Optional[Tuple[str, int]]:
+        """
+        Lê o código de produto imediatamente antes da barra.
+
+        Returns:
+            Tupla (código, posição inicial) ou None
+        """
+        text = self.text
+        end = slash
+        while end > last_end and text[end - 1].isspace():
+            end -= 1
+        start = end
+        while start > last_end and text[start - 1].isdecimal():
+            start -= 1
+        if start == end:
+            return None
+        if start > 0 and text[start - 1].isdecimal():
+            return None  # O número começa antes do fim do item anterior
+
+        if variant != LEGACY:
+            # (?:^|\s)(\d{4,5}): código de 4-5 dígitos precedido de espaço
+            if not 4 <= end - start <= 5:
+                return None
+            if start > 0 and (start - 1 < last_end or not text[start - 1].isspace()):
+                return None
+        return text[start:end], start
+
+    def _segment(self, index: int, offset: int) -> Optional[Tuple[str, int, bool]]:
+        """
+        Segmento `offset` após a barra `index`.
+
+        Returns:
+            Tupla (conteúdo, posição inicial, fechado por barra) ou None
+        """
+        position = index + offset - 1
+        if not self.complete and position + 1 >= len(self._slashes):
+            raise _NeedMoreText
+        if position >= len(self._slashes):
+            return None
+        start = self._slashes[position] + 1
+        if position + 1 < len(self._slashes):
+            return self.text[start:self._slashes[position + 1]], start, True
+        return self.text[start:], start, False
+
+    def _closed(self, index: int, offset: int) -> Optional[str]:
+        """Conteúdo sem espaços de um segmento seguido de barra."""
+        segment = self._segment(index, offset)
+        if segment is None or not segment[2]:
+            return None
+        return segment[0].strip()
+
+    def _total(self, index: int, offset: int) -> Optional[Tuple[str, int]]:
+        """Valor total no início do segmento: \\s*([\\d,\\.]+)."""
+        segment = self._segment(index, offset)
+        if segment is None:
+            return None
+        content, start, _ = segment
+        begin = len(content) - len(content.lstrip())
+        finish = begin
+        while finish < len(content) and _is_number_char(content[finish]):
+            finish += 1
+        if finish == begin:
+            return None
+        return content[begin:finish], start + finish
+
+    def _tail(self, index: int, offset: int, quantity: Optional[str] = None):
+        """
+        Lê `qtd / unitário / total` a partir do segmento `offset`.
+
+        Se a quantidade já foi lida (colada ao marcador UN), o segmento
+        `offset` é o valor unitário.
+        """
+        if quantity is None:
+            quantity = self._closed(index, offset)
+            if quantity is None or not _is_decimal(quantity):
+                return None
+            offset += 1
+        unit_price = self._closed(index, offset)
+        if unit_price is None or not _is_number(unit_price):
+            return None
+        total = self._total(index, offset + 1)
+        if total is None:
+            return None
+        return quantity, unit_price, total[0], total[1]
+
+    def _parse_strict(self, index: int):
+        """
+        Gramática padrão após a barra do código.
+
+        Layouts tentados na ordem do padrão original: com campo extra
+        (`ref / extra / UN / ...`) e sem ele (`ref / UN / ...`).
+        """
+        first = self._segment(index, 1)
+        if first is None or not first[2] or not first[0]:
+            return None
+        reference, description = _split_reference(first[0])
+
+        for extra_offset, unit_offset in ((2, 3), (None, 2)):
+            unit = self._closed(index, unit_offset)
+            if unit is None or not _is_unit(unit):
+                continue
+            extra = None
+            if extra_offset is not None:
+                extra = self._closed(index, extra_offset)
+            tail = self._tail(index, unit_offset + 1)
+            if tail is None:
+                continue
+            quantity, unit_price, total, end = tail
+            return (reference, description, extra, quantity, unit_price, total), end
+        return None
+
+    def _parse_tolerant(self, index: int):
+        """
+        Gramática tolerante: marcador UN sem barras ou com resíduos '<'.
+
+        Ordem: marcador no fim da referência, no fim do campo extra
+        (ou sozinho no segmento seguinte) e, por último, após o extra,
+        com ou sem uma barra duplicada.
+        """
+        first = self._segment(index, 1)
+        if first is None or not first[2] or not first[0]:
+            return None
+
+        # 1) `ref UN / qtd / ...` ou `ref UN qtd / unitário / ...`
+        marker = _split_unit_marker(first[0])
+        if marker is not None and marker[0].strip():
+            prefix, quantity = marker
+            tail = self._tail(index, 2, quantity)
+            if tail is not None:
+                reference, description = _split_reference(prefix)
+                return (reference, description, None) + tail[:3], tail[3]
+
+        reference, description = _split_reference(first[0])
+
+        # 2) `ref / [extra] UN / ...`  3) `ref / extra / UN / ...`
+        # 4) `ref / extra // UN / ...` (barra duplicada antes do marcador)
+        for unit_offset in (2, 3, 4):
+            segment = self._segment(index, unit_offset)
+            if segment is None or not segment[2]:
+                continue
+            marker = _split_unit_marker(segment[0])
+            if marker is None:
+                continue
+            prefix, quantity = marker
+            if unit_offset == 2:
+                extra = prefix.strip()
+            elif prefix.strip():
+                continue
+            elif unit_offset == 4 and self._segment(index, 3)[0] != "":
+                continue
+            else:
+                extra = self._closed(index, 2)
+            tail = self._tail(index, unit_offset + 1, quantity)
+            if tail is None:
+                continue
+            return (reference, description, extra) + tail[:3], tail[3]
+        return None
+
+
+class ItemStream:
+    """
+    Tokenização incremental de um texto recebido em partes.
+
+    Cada item é devolvido assim que todos os segmentos que decidem o
+    candidato estão fechados; o resultado final é idêntico ao do
+    ItemTokenizer sobre o texto completo. O buffer guarda apenas o trecho
+    a partir do último candidato pendente (uma ou duas linhas de item).
+    """
+
+    def __init__(self, variant: str = STRICT):
+        """
+        Inicializa o stream.
+
+        Args:
+            variant: Variante da gramática
+        """
+        self.variant = variant
+        self._buffer = ""
+        self._last_end = 0
+
+    def feed(self, text: str) -> List[ItemMatch]:
+        """
+        Acrescenta texto e devolve os itens já decididos.
+
+        Args:
+            text: Próximo trecho do texto
+
+        Returns:
+            List[ItemMatch]: Itens reconhecidos (posições relativas ao buffer)
+        """
+        self._buffer += text
+        return self._scan(complete=False)
+
+    def close(self) -> List[ItemMatch]:
+        """
+        Finaliza o texto e devolve os itens restantes.
+
+        Returns:
+            List[ItemMatch]: Itens reconhecidos no trecho final
+        """
+        matches = self._scan(complete=True)
+        self._buffer = ""
+        self._last_end = 0
+        return matches
+
+    def _scan(self, complete: bool) -> List[ItemMatch]:
+        """Tokeniza o buffer e descarta o trecho que não influencia o restante."""
+        tokenizer = ItemTokenizer(self._buffer, complete)
+        matches = list(tokenizer.tokenize(self.variant, self._last_end))
+        if matches:
+            self._last_end = matches[-1].end
+
+        # Corte preservando um caractere de contexto à esquerda, para que
+        # _code_before decida exatamente como no texto completo
+        if tokenizer.pending is not None:
+            code_start, last_end = tokenizer.pending
+            cut = max(code_start - 1, 0)
+            new_last_end = 1 if last_end == code_start and code_start > 0 else 0
+        else:
+            slash = self._buffer.rfind('/', self._last_end)
+            if slash != -1:
+                # Nenhum código futuro atravessa uma barra
+                cut, new_last_end = slash, 0
+            elif self._last_end > 0:
+                cut, new_last_end = self._last_end - 1, 1
+            else:
+                cut, new_last_end = 0, 0
+
+        self._buffer = self._buffer[cut:]
+        self._last_end = new_last_end
+        return matches
+
+
+def tokenize_items(text: str, variant: str = STRICT) -> List[ItemMatch]:
+    """
+    Atalho para tokenizar um texto em uma variante.
+
+    Args:
+        text: Texto com as linhas de item
+        variant: Variante da gramática
+
+    Returns:
+        List[ItemMatch]: Itens reconhecidos
+    """
+    return list(ItemTokenizer(text).tokenize(variant))
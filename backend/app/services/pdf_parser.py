@@ -5,17 +5,47 @@ Este módulo é responsável por extrair informações de PDFs de pedidos
 da PMCELL São Paulo, incluindo dados do cliente, vendedor, produtos e valores.
 """
 import re
+import time
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Any, NamedTuple, Optional, Sequence, Tuple
 import logging
 
-import pdfplumber
 import PyPDF2
 
+from app.services.pdf_item_tokenizer import ITEM_VARIANTS, STRICT, ItemMatch, ItemStream, ItemTokenizer
+from app.services.pdf_parse_stats import CLEAN, EXTRACT, ITEMS, METADATA, NORMALIZE, QUALITY, VALIDATE, ParseStats
+from app.services.pdf_text_engines import (
+    ACCEPTED,
+    DEFAULT_ENGINE_ORDER,
+    FAILED,
+    PDFPLUMBER,
+    REJECTED,
+    EngineAttempt,
+    EngineStats,
+    TextEngine,
+    TextExtractionError,
+    get_engine,
+)
+
 
 logger = logging.getLogger(__name__)
 
+# Callback de progresso: (páginas processadas, itens encontrados)
+ProgressCallback = Callable[[int, int], None]
+
+
+class _EngineResult(NamedTuple):
+    """Resultado de um engine na extração adaptativa."""
+    text: str
+    data: Dict[str, Any]
+    error: Optional["PDFParseError"]
+    accepted: bool
+    pages: int
+    counters: Dict[str, int]
+    item_variant: Optional[str]
+
 
 class PDFParseError(Exception):
     """Exceção customizada para erros de parsing de PDF."""
@@ -26,9 +56,25 @@ class PDFParser:
     """
     Parser de PDF para extração de dados de pedidos.
     
-    Utiliza pdfplumber como biblioteca principal e PyPDF2 como fallback.
+    O texto é extraído por engines plugáveis (pdf_text_engines): PyPDF2,
+    pdfminer em modo rápido e pdfplumber (referência). A ordem de tentativa
+    vem de EngineStats.plan; um engine só é trocado pelo seguinte quando o
+    orçamento extraído não fecha (verificação de qualidade).
+    
+    O texto é processado página a página: cada página é extraída,
+    normalizada, limpa e tokenizada antes da seguinte, e o cache de layout
+    do pdfplumber é liberado logo após a leitura. O pico de memória não
+    cresce com o número de páginas; apenas o texto bruto (alguns KB por
+    página) é mantido para os campos do cabeçalho.
     """
     
+    # Versão do parser: incrementar sempre que a extração mudar de resultado,
+    # para invalidar os resultados já armazenados no cache de parsing
+    PARSER_VERSION = "2"
+    
+    # Diferença máxima (R$) na conferência de valores da verificação de qualidade
+    QUALITY_TOLERANCE = 0.01
+    
     # Patterns regex para extração de dados
     PATTERNS = {
         'order_number': r'Orçamento\s*N[ºo°]?:?\s*(\d+)',
@@ -36,7 +82,9 @@ class PDFParser:
         'seller': r'Vendedor:\s*([^\n]+?)(?:\s*Validade\s*do\s*Orçamento|$)',
         'date': r'Data:\s*(\d{2}/\d{2}/\d{2})',
         'total_value': r'VALOR\s+A\s+PAGAR\s*R\$\s*([\d\.,]+)',
-        # Padrão melhorado para itens - mantém compatibilidade
+        'discount': r'DESCONTO\s*R\$\s*([\d\.,]+)',
+        # Gramática dos itens (referência para diagnóstico); a extração usa o
+        # ItemTokenizer, que reconhece o mesmo formato sem backtracking
         'items': r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*(?:/\s*([^/]*?))?\s*/\s*UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)'
     }
     
@@ -67,25 +115,82 @@ class PDFParser:
             r'TOTAL\s*R\$\s*([\d\.,]+)',
             r'VALOR\s*TOTAL\s*R\$\s*([\d\.,]+)',
         ],
-        # Padrões específicos para itens com diferentes estruturas
-        'items': [
-            # Padrão principal atualizado (tolerante a variações)
-            r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*(?:/\s*([^/]*?))?\s*/?<?/?<?\s*UN\s*/?\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
-            # Padrão para formatação com /<<UN
-            r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*/<<UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
-            # Padrão para formatação com </< UN
-            r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*</<\s*UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
-            # Padrão legacy para compatibilidade com PDFs antigos
-            r'(\d+)\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*(?:/\s*([^/]*?))?\s*/\s*UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
-        ]
     }
     
-    def extract(self, pdf_path: Path) -> Dict[str, Any]:
+    # Linhas descartadas na limpeza (cabeçalhos, metadados, formatação)
+    # IMPORTANTE: Não remover linhas com dados essenciais (Orçamento Nº, Cliente, Vendedor, etc.)
+    SKIP_LINE_PATTERNS = (
+        r'PMCELL\s+São\s+Paulo',             # Cabeçalho da empresa
+        r'V\.\s+Zabin\s+Tecnologia',         # Nome da empresa
+        r'CNPJ:\s*\d+',                      # CNPJ
+        r'I\.E:\s*\d+',                      # Inscrição estadual
+        r'Rua\s+Comendador',                 # Endereço
+        r'Condição\s+de\s+Pagto',            # Condição de pagamento
+        r'Forma\s+de\s+Pagto',               # Forma de pagamento
+        r'Validade\s+do\s+Orçamento',        # Validade
+        r'Código\s+Produto\s+Unid',          # Cabeçalho da tabela
+        r'\s*\d+\s+dia\(s\)\s*$',           # Linha isolada com dias
+        r'\d{1,2}\s+dia\(s\)\s*$',          # Variação da linha de dias
+        r'\s*\d+\s*-\s*\d+\s+dia\(s\)',     # Padrão como "25 - 0 dia(s)"
+        r'Página\s+\d+\s*$',                 # Marcadores de página
+        r'Orçamento\s*N[ºo°]?:?\s*\d+',      # Linha de orçamento (conflita com extração)
+        r'Código:\s*\d+.*Data:',             # Linha com código e data
+        r'Cliente:\s*[\d\.].*Forma\s*de',     # Linha de cliente completa
+        r'Vendedor:.*Validade',              # Linha de vendedor completa
+    )
+    
+    # Classificador de linhas: uma única alternação ancorada no início da
+    # linha, compilada uma vez. A ordem das alternativas define a prioridade.
+    LINE_CLASSIFIER = re.compile(
+        r'(?P<skip>' + '|'.join(f'(?:{p})' for p in SKIP_LINE_PATTERNS) + r')'
+        r'|(?P<item_start>\d{5}\s*/)'
+        r'|(?P<item_code>\d{5})',
+        re.IGNORECASE
+    )
+    
+    # Continuação de item: trecho com unidade ou com quantidade e preços
+    ITEM_CONTINUATION = re.compile(r'/\s*UN\s*/|/\s*\d+\s*/\s*[\d,\.]+\s*/\s*[\d,\.]+')
+    
+    # Linhas fora de itens preservadas: metadados e informações de valores
+    IMPORTANT_LINE = re.compile(
+        r'Orçamento\s*N[ºo°]?:?\s*\d+'       # Número do orçamento
+        r'|Cliente:\s*'                       # Cliente
+        r'|Vendedor:\s*'                      # Vendedor
+        r'|Data:\s*\d{2}/\d{2}/\d{2}'         # Data
+        r'|VALOR\s+TOTAL\s*R\$'               # Valor total
+        r'|VALOR\s+A\s+PAGAR'                 # Valor a pagar
+        r'|DESCONTO\s*R\$',                   # Desconto
+        re.IGNORECASE
+    )
+    
+    # Estrutura mínima de uma linha de item
+    ITEM_LINE_CODE = re.compile(r'\d{3,5}\s*/')
+    ITEM_LINE_UNIT = re.compile(r'/\s*UN\s*/')
+    NUMBER_TOKEN = re.compile(r'[\d,\.]+')
+    
+    def __init__(self, engines: Optional[Sequence[str]] = None, engine_stats: Optional[EngineStats] = None):
+        """
+        Inicializa o parser.
+        
+        Args:
+            engines: Nomes dos engines de extração, do mais barato ao mais
+                caro; o último é a referência (padrão: DEFAULT_ENGINE_ORDER)
+            engine_stats: Estatísticas usadas na seleção adaptativa
+        """
+        self.engines = tuple(engines or DEFAULT_ENGINE_ORDER)
+        for name in self.engines:
+            get_engine(name)  # Falha cedo com engine desconhecido
+        self.engine_stats = engine_stats or EngineStats()
+        self.last_attempts: List[EngineAttempt] = []
+        self.last_stats: Optional[ParseStats] = None
+    
+    def extract(self, pdf_path: Path, order: Optional[Sequence[str]] = None) -> Dict[str, Any]:
         """
         Extrai dados de um PDF de pedido.
         
         Args:
             pdf_path: Caminho para o arquivo PDF
+            order: Ordem de tentativa dos engines (padrão: EngineStats.plan)
             
         Returns:
             Dict contendo os dados extraídos
@@ -99,23 +204,127 @@ class PDFParser:
         if not str(pdf_path).lower().endswith('.pdf'):
             raise PDFParseError("Invalid PDF file")
         
+        # Uma única leitura do disco; os dois backends usam o mesmo buffer
+        return self.extract_bytes(pdf_path.read_bytes(), order=order)
+    
+    def extract_bytes(
+        self,
+        content: bytes,
+        progress: Optional[ProgressCallback] = None,
+        order: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrai dados de um PDF em memória, sem arquivo temporário.
+        
+        Args:
+            content: Conteúdo do arquivo PDF
+            progress: Chamado a cada página processada com
+                (páginas processadas, itens encontrados)
+            order: Ordem de tentativa dos engines (padrão: EngineStats.plan)
+            
+        Returns:
+            Dict contendo os dados extraídos
+            
+        Raises:
+            PDFParseError: Se houver erro na extração
+        """
+        if not content:
+            raise PDFParseError("Arquivo PDF vazio")
+        
+        return self.extract_stream(BytesIO(content), progress, order)
+    
+    def extract_stream(
+        self,
+        stream: BinaryIO,
+        progress: Optional[ProgressCallback] = None,
+        order: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Extrai dados de um PDF a partir de um stream binário posicionável.
+        
+        Args:
+            stream: Stream com o conteúdo do PDF (ex.: BytesIO)
+            progress: Chamado a cada página processada com
+                (páginas processadas, itens encontrados)
+            order: Ordem de tentativa dos engines (padrão: EngineStats.plan)
+            
+        Returns:
+            Dict contendo os dados extraídos
+            
+        Raises:
+            PDFParseError: Se houver erro na extração
+        """
+        self.last_attempts = []
+        self.last_stats = None
+        data, stats = self.extract_adaptive(lambda engine: engine.iter_pages(stream), progress, order)
+        self.last_attempts = stats.attempts
+        self.last_stats = stats
+        return data
+    
+    def extract_adaptive(
+        self,
+        read_pages: Callable[[TextEngine], Iterable[str]],
+        progress: Optional[ProgressCallback] = None,
+        order: Optional[Sequence[str]] = None
+    ) -> Tuple[Dict[str, Any], ParseStats]:
+        """
+        Extrai os dados tentando os engines na ordem de EngineStats.plan.
+        
+        O resultado de um engine é aceito se passar na verificação de
+        qualidade (_passes_quality_check); senão o próximo engine é tentado.
+        Se nenhum passar, vale o resultado do último engine que extraiu
+        texto. Engines fora da ordem só são tentados se nenhum outro
+        extrair texto.
+        
+        Args:
+            read_pages: Função que devolve o texto das páginas com um engine
+                (engine.iter_pages no modo sequencial; workers no paralelo)
+            progress: Chamado a cada página processada com (páginas
+                processadas, itens encontrados); recomeça do zero quando o
+                próximo engine é tentado
+            order: Ordem de tentativa definida fora do parser (ex.: pelo
+                pool, com as estatísticas de todos os workers); None =
+                self.engine_stats.plan
+            
+        Returns:
+            Tupla (dados extraídos, estatísticas do parsing com as
+            tentativas de cada engine)
+            
+        Raises:
+            PDFParseError: Se houver erro na extração
+        """
+        start = time.perf_counter()
+        stats = ParseStats()
         try:
-            # Tenta extrair com pdfplumber primeiro
-            text = self._extract_with_pdfplumber(pdf_path)
-            if not text.strip():
-                # Fallback para PyPDF2
-                text = self._extract_with_pypdf2(pdf_path)
-                
-            if not text.strip():
-                raise PDFParseError("Não foi possível extrair texto do PDF")
-                
-            # Extrai os dados usando patterns
-            data = self._extract_data_from_text(text)
+            attempts = stats.attempts
+            fallback: Optional[Tuple[int, _EngineResult]] = None
+            planned = list(order) if order is not None else self.engine_stats.plan(self.engines)
+            skipped = [name for name in self.engines if name not in planned]
             
-            # Valida os dados extraídos
-            self.validate(data)
+            for name in planned:
+                result = self._try_engine(name, read_pages, stats, progress)
+                if result is None:
+                    continue
+                fallback = (len(attempts) - 1, result)
+                if result.accepted:
+                    break
+            
+            # Engines pulados ainda são tentados se nenhum outro extraiu texto
+            for name in skipped if fallback is None else ():
+                result = self._try_engine(name, read_pages, stats, progress)
+                if result is not None:
+                    fallback = (len(attempts) - 1, result)
+                    break
+            
+            if fallback is None:
+                raise PDFParseError("Não foi possível extrair texto do PDF")
+            index, result = fallback
+            if result.error is not None:
+                raise result.error
+            self._select(stats, index, result)
             
-            return data
+            stats.total_ms = (time.perf_counter() - start) * 1000
+            return result.data, stats
             
         except PDFParseError:
             raise
@@ -123,51 +332,295 @@ class PDFParser:
             logger.error(f"Erro ao processar PDF: {str(e)}")
             raise PDFParseError(f"Erro ao processar PDF: {str(e)}")
     
-    def _extract_with_pdfplumber(self, pdf_path: Path) -> str:
-        """Extrai texto usando pdfplumber."""
+    def _try_engine(
+        self,
+        name: str,
+        read_pages,
+        stats: ParseStats,
+        progress: Optional[ProgressCallback] = None
+    ) -> Optional["_EngineResult"]:
+        """
+        Extrai com um engine e aplica a verificação de qualidade.
+        
+        Returns:
+            _EngineResult ou None se o engine falhar ou não extrair texto
+        """
+        start = time.perf_counter()
+        pages: List[str] = []
+        reported = 0
+        stats.reset_counters()
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                text = ""
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                return text
+            with stats.timer(EXTRACT):
+                page_texts = read_pages(get_engine(name))
+            items = []
+            for item in stats.timed(self._iter_items(stats.timed(page_texts, EXTRACT), pages, stats), ITEMS):
+                items.append(item)
+                if progress is not None and len(pages) > reported:
+                    reported = len(pages)
+                    progress(reported, len(items))
+            if progress is not None:
+                progress(len(pages), len(items))
+        except TextExtractionError as e:
+            logger.warning(str(e))
+            items = []
+            pages = []
+        text = "".join(pages)
+        
+        if not text.strip():
+            result, outcome = None, FAILED
+        else:
+            # Metadados extraídos e validados uma única vez por engine
+            try:
+                data, error = self._build_data(text, items, stats), None
+            except PDFParseError as e:
+                data, error = {}, e
+            accepted = error is None and self._passes_quality_check(text, data, stats)
+            result = _EngineResult(
+                text, data, error, accepted, len(pages), dict(stats.counters), stats.item_variant
+            )
+            outcome = ACCEPTED if accepted else REJECTED
+        
+        attempt = EngineAttempt(name, outcome, (time.perf_counter() - start) * 1000, False)
+        stats.attempts.append(attempt)
+        self.engine_stats.record(attempt)
+        logger.debug(f"Text engine {name}: {outcome} in {attempt.elapsed_ms:.1f}ms")
+        return result
+    
+    def _select(self, stats: ParseStats, index: int, result: "_EngineResult") -> None:
+        """Marca a tentativa cujo resultado foi usado e guarda seus contadores."""
+        attempt = stats.attempts[index] = stats.attempts[index]._replace(selected=True)
+        self.engine_stats.mark_selected(attempt.engine)
+        
+        stats.engine = attempt.engine
+        stats.counters = result.counters
+        stats.item_variant = result.item_variant
+        stats.counters.update(
+            pages=result.pages,
+            chars=len(result.text),
+            lines=result.text.count('\n'),
+            items=len(result.data.get('items', ())),
+        )
+    
+    def _passes_quality_check(
+        self,
+        text: str,
+        data: Dict[str, Any],
+        stats: Optional[ParseStats] = None
+    ) -> bool:
+        """
+        Verifica se o texto de um engine produziu um orçamento consistente.
+        
+        Cada item precisa de quantidade × unitário = total, e a soma dos
+        itens menos o desconto precisa fechar com o VALOR A PAGAR. Texto
+        fora de ordem (colunas intercaladas, números colados) não fecha.
+        
+        Args:
+            text: Texto bruto extraído pelo engine
+            data: Dados já montados e validados a partir do texto (_build_data)
+            stats: Estatísticas que recebem o tempo da verificação
+        """
+        items = data['items']
+        stats = stats or ParseStats()
+        
+        with stats.timer(QUALITY):
+            tolerance = self.QUALITY_TOLERANCE
+            for item in items:
+                if abs(item['quantity'] * item['unit_price'] - item['total_price']) > tolerance:
+                    return False
+            
+            discount = self._parse_money_value(self._extract_with_pattern(text, 'discount')) or 0.0
+            items_total = sum(item['total_price'] for item in items)
+            return abs(items_total - discount - data['total_value']) <= tolerance
+    
+    def extract_from_pages(self, page_texts: Iterable[str]) -> Dict[str, Any]:
+        """
+        Extrai os dados a partir do texto já extraído de cada página.
+        
+        Itens quebrados entre páginas são unidos como na extração
+        sequencial. Não aplica a verificação de qualidade.
+        
+        Args:
+            page_texts: Texto de cada página, na ordem do documento
+            
+        Returns:
+            Dict contendo os dados extraídos
+            
+        Raises:
+            PDFParseError: Se houver erro na extração
+        """
+        try:
+            pages: List[str] = []
+            stats = ParseStats()
+            items = list(self._iter_items(page_texts, pages, stats))
+            return self._build_data("".join(pages), items, stats)
+            
+        except PDFParseError:
+            raise
         except Exception as e:
-            logger.warning(f"Erro com pdfplumber: {e}")
-            return ""
+            logger.error(f"Erro ao processar PDF: {str(e)}")
+            raise PDFParseError(f"Erro ao processar PDF: {str(e)}")
     
-    def _extract_with_pypdf2(self, pdf_path: Path) -> str:
-        """Extrai texto usando PyPDF2 como fallback."""
+    def extract_page_texts(
+        self,
+        content: bytes,
+        first_page: int,
+        last_page: int,
+        engine: str = PDFPLUMBER
+    ) -> List[str]:
+        """
+        Extrai o texto de um intervalo de páginas (modo paralelo).
+        
+        Args:
+            content: Conteúdo do arquivo PDF
+            first_page: Primeira página (1 = primeira do documento)
+            last_page: Última página, inclusive
+            engine: Nome do engine de extração
+            
+        Returns:
+            List[str]: Texto das páginas com conteúdo, na ordem do documento
+            
+        Raises:
+            PDFParseError: Se o engine falhar
+        """
+        page_numbers = list(range(first_page, last_page + 1))
         try:
-            with open(pdf_path, 'rb') as file:
-                reader = PyPDF2.PdfReader(file)
-                text = ""
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-                return text
+            return list(get_engine(engine).iter_pages(BytesIO(content), page_numbers))
+        except TextExtractionError as e:
+            raise PDFParseError(f"Erro ao processar PDF: {e}")
+    
+    @staticmethod
+    def count_pages(content: bytes) -> int:
+        """
+        Conta as páginas do PDF sem extrair o conteúdo.
+        
+        Returns:
+            int: Número de páginas (0 se o arquivo não puder ser lido)
+        """
+        try:
+            return len(PyPDF2.PdfReader(BytesIO(content)).pages)
         except Exception as e:
-            logger.warning(f"Erro com PyPDF2: {e}")
-            return ""
-    
-    def _extract_data_from_text(self, text: str) -> Dict[str, Any]:
-        """Extrai dados estruturados do texto do PDF."""
-        # Normaliza texto para corrigir problemas de formatação
-        normalized_text = self._normalize_text(text)
-        # Para metadados, usa texto original; para itens, usa texto limpo
-        cleaned_text = self._clean_extracted_text(normalized_text)
-        
-        data = {
-            'order_number': self._extract_with_pattern(text, 'order_number'),
-            'client_name': self._clean_text(self._extract_with_pattern(text, 'client')),
-            'seller_name': self._clean_text(self._extract_with_pattern(text, 'seller')),
-            'order_date': self._parse_date(self._extract_with_pattern(text, 'date')),
-            'total_value': self._parse_money_value(self._extract_with_pattern(text, 'total_value')),
-            'items': self._extract_items(cleaned_text)
-        }
+            logger.debug(f"Não foi possível contar as páginas: {e}")
+            return 0
+    
+    def sniff_order_number(self, content: bytes) -> Optional[str]:
+        """
+        Lê só a primeira página e procura o número do orçamento.
+        
+        Usa apenas o pattern principal (sem fallbacks), para não confundir
+        outro número com o do orçamento. Tenta os engines do mais barato ao
+        mais caro até encontrar o número.
+        
+        Args:
+            content: Conteúdo do arquivo PDF
+        
+        Returns:
+            Optional[str]: Número do orçamento ou None se não encontrado
+        """
+        for name in self.engines:
+            try:
+                page_texts = list(get_engine(name).iter_pages(BytesIO(content), [1]))
+            except TextExtractionError as e:
+                logger.debug(f"Leitura rápida com {name} falhou: {e}")
+                continue
+            match = re.search(self.PATTERNS['order_number'], "".join(page_texts), re.IGNORECASE)
+            if match:
+                return match.group(1)
+        return None
+        
+    def _build_data(
+        self,
+        text: str,
+        items: List[Dict[str, Any]],
+        stats: Optional[ParseStats] = None
+    ) -> Dict[str, Any]:
+        """Monta e valida o resultado a partir do texto bruto e dos itens."""
+        if not text.strip():
+            raise PDFParseError("Não foi possível extrair texto do PDF")
+        stats = stats or ParseStats()
+            
+        # Extrai os metadados usando patterns
+        with stats.timer(METADATA):
+            data = self._extract_metadata(text, stats)
+        data['items'] = items
+        
+        # Valida os dados extraídos
+        with stats.timer(VALIDATE):
+            self.validate(data)
         
         return data
     
+    def _extract_metadata(self, text: str, stats: Optional[ParseStats] = None) -> Dict[str, Any]:
+        """Extrai os campos do cabeçalho e o valor total do texto original."""
+        return {
+            'order_number': self._extract_with_pattern(text, 'order_number', stats),
+            'client_name': self._clean_text(self._extract_with_pattern(text, 'client', stats)),
+            'seller_name': self._clean_text(self._extract_with_pattern(text, 'seller', stats)),
+            'order_date': self._parse_date(self._extract_with_pattern(text, 'date', stats)),
+            'total_value': self._parse_money_value(self._extract_with_pattern(text, 'total_value', stats)),
+        }
+    
+    def _iter_items(
+        self,
+        page_texts: Iterable[str],
+        pages: List[str],
+        stats: Optional[ParseStats] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Pipeline página a página: normalização, limpeza e tokenização.
+        
+        Os itens da variante padrão são emitidos assim que reconhecidos. As
+        linhas limpas só são guardadas enquanto nenhum item foi encontrado,
+        para a cascata de variantes tolerantes no fim do documento.
+        
+        Args:
+            page_texts: Texto de cada página
+            pages: Lista que recebe o texto bruto de cada página
+            stats: Estatísticas que recebem o tempo de normalização e
+                limpeza e os contadores de itens descartados
+            
+        Yields:
+            Dict: Item extraído (sem códigos duplicados)
+        """
+        stats = stats or ParseStats()
+        
+        def recorded() -> Iterator[str]:
+            for page_text in page_texts:
+                pages.append(page_text)
+                yield page_text
+        
+        lines = (
+            line
+            for chunk in stats.timed(self._iter_normalized_chunks(recorded()), NORMALIZE)
+            for line in chunk.split('\n')
+        )
+        
+        item_stream = ItemStream(STRICT)
+        fallback_lines: Optional[List[str]] = []
+        seen_codes = set()
+        separator = ""
+        
+        def emit(matches: List[ItemMatch]) -> Iterator[Dict[str, Any]]:
+            nonlocal fallback_lines
+            for item in self._items_from_matches(matches, stats):
+                fallback_lines = None
+                stats.item_variant = STRICT
+                if item['product_code'] not in seen_codes:
+                    seen_codes.add(item['product_code'])
+                    yield item
+        
+        for line in stats.timed(self._iter_clean_lines(lines), CLEAN):
+            if fallback_lines is not None:
+                fallback_lines.append(line)
+            yield from emit(item_stream.feed(separator + line))
+            separator = "\n"
+        yield from emit(item_stream.close())
+        
+        if fallback_lines:
+            # Nenhum item na gramática padrão: tenta as variantes tolerantes
+            logger.debug("No items with tokenizer variant strict, trying fallbacks")
+            stats.count("item_fallbacks")
+            yield from self._extract_items('\n'.join(fallback_lines), ITEM_VARIANTS[1:], stats)
+    
     def _normalize_text(self, text: str) -> str:
         """
         Normaliza texto extraído para corrigir problemas de formatação comum.
@@ -190,12 +643,64 @@ class PDFParser:
         logger.debug(f"Text normalized: {len(text)} chars")
         return text
     
+    def _iter_normalized_chunks(self, pages: Iterable[str]) -> Iterator[str]:
+        """
+        Normaliza o texto em partes, com o mesmo resultado de _normalize_text
+        sobre o texto completo.
+        
+        Cada parte termina em uma quebra de linha cuja linha anterior não
+        termina em '<', '/' ou espaço: nenhuma substituição de
+        _normalize_text atravessa esse ponto. O restante é levado para a
+        página seguinte.
+        """
+        pending = ""
+        for page_text in pages:
+            pending += page_text
+            cut = self._normalize_cut(pending)
+            if cut:
+                yield self._normalize_text(pending[:cut])
+                pending = pending[cut:]
+        if pending:
+            yield self._normalize_text(pending)
+    
+    @staticmethod
+    def _normalize_cut(text: str) -> int:
+        """Posição após a última quebra de linha segura para normalizar."""
+        newline = text.rfind('\n')
+        while newline > 0:
+            last = text[newline - 1]
+            if not (last.isspace() or last == '<' or last == '/'):
+                return newline + 1
+            newline = text.rfind('\n', 0, newline - 1)
+        return 0
+    
     def _clean_extracted_text(self, text: str) -> str:
         """
         Limpa texto extraído de artefatos de PDF como cabeçalhos, rodapés e formatação.
+        
+        Cada linha é rotulada em uma única passada pelo LINE_CLASSIFIER
+        (descartar, início de item, código sem barra ou comum).
         """
-        lines = text.split('\n')
-        cleaned_lines = []
+        cleaned_lines = list(self._iter_clean_lines(text.split('\n')))
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            item_count = sum(1 for line in cleaned_lines if self._is_valid_item_line(line))
+            logger.debug(f"Text cleaning found {item_count} valid item lines")
+        
+        return '\n'.join(cleaned_lines)
+    
+    def _iter_clean_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        Gera as linhas limpas a partir das linhas normalizadas.
+        
+        O item em andamento é mantido entre as linhas recebidas, de modo que
+        um item quebrado no fim de uma página continua na página seguinte.
+        """
+        classify = self.LINE_CLASSIFIER.match
+        is_continuation = self.ITEM_CONTINUATION.search
+        is_important = self.IMPORTANT_LINE.search
+        is_valid_item = self._is_valid_item_line
+        
         current_item = ""
         
         for line in lines:
@@ -203,118 +708,40 @@ class PDFParser:
             if not line:
                 continue
             
-            # Padrões para ignorar (cabeçalhos, metadados, formatação)
-            # IMPORTANTE: Não remover linhas com dados essenciais (Orçamento Nº, Cliente, Vendedor, etc.)
-            skip_patterns = [
-                r'^PMCELL\s+São\s+Paulo',             # Cabeçalho da empresa
-                r'^V\.\s+Zabin\s+Tecnologia',         # Nome da empresa
-                r'^CNPJ:\s*\d+',                      # CNPJ
-                r'^I\.E:\s*\d+',                      # Inscrição estadual
-                r'^Rua\s+Comendador',                 # Endereço
-                r'^Condição\s+de\s+Pagto',            # Condição de pagamento
-                r'^Forma\s+de\s+Pagto',               # Forma de pagamento
-                r'^Validade\s+do\s+Orçamento',        # Validade
-                r'^Código\s+Produto\s+Unid',          # Cabeçalho da tabela
-                r'^\s*\d+\s+dia\(s\)\s*$',           # Linha isolada com dias
-                r'^\d{1,2}\s+dia\(s\)\s*$',          # Variação da linha de dias
-                r'^\s*\d+\s*-\s*\d+\s+dia\(s\)',     # Padrão como "25 - 0 dia(s)"
-                r'^Página\s+\d+\s*$',                 # Marcadores de página
-                r'^Orçamento\s*N[ºo°]?:?\s*\d+',      # Linha de orçamento (conflita com extração)
-                r'^Código:\s*\d+.*Data:',             # Linha com código e data
-                r'^Cliente:\s*[\d\.].*Forma\s*de',     # Linha de cliente completa
-                r'^Vendedor:.*Validade',              # Linha de vendedor completa
-            ]
-            
-            should_skip = False
-            for pattern in skip_patterns:
-                if re.search(pattern, line, re.IGNORECASE):
-                    should_skip = True
-                    break
+            match = classify(line)
+            label = match.lastgroup if match else None
             
-            if should_skip:
+            if label == 'skip':
                 continue
             
             # Se a linha começa com código de 5 dígitos seguido de /, é início de item
-            if re.match(r'^\d{5}\s*/', line):
+            if label == 'item_start':
                 # Finaliza item anterior se existir
-                if current_item and self._is_valid_item_line(current_item):
-                    cleaned_lines.append(current_item)
+                if current_item and is_valid_item(current_item):
+                    yield current_item
                     logger.debug(f"Added completed item: {current_item[:50]}...")
                 elif current_item:
                     logger.debug(f"Discarded invalid item: {current_item[:50]}...")
                 current_item = line
                 logger.debug(f"Started new item: {line[:50]}...")
             elif current_item:
-                # Verifica se é continuação válida de item
-                if (re.search(r'/\s*UN\s*/', line) or 
-                    re.search(r'/\s*\d+\s*/\s*[\d,\.]+\s*/\s*[\d,\.]+', line)):
+                # Continuação válida de item ou descrição quebrada. Artefatos
+                # (páginas, cabeçalhos) já foram descartados pelo classificador.
+                if is_continuation(line) or label != 'item_code':
                     current_item += " " + line
-                elif not re.match(r'^\d{5}', line):
-                    # Verifica se não é um artefato antes de adicionar à descrição
-                    # Não adicionar marcadores de página, cabeçalhos, etc.
-                    artifact_patterns = [
-                        r'^Página\s+\d+\s*$',                 # Marcadores de página
-                        r'^PMCELL\s+São\s+Paulo',             # Cabeçalho da empresa
-                        r'^V\.\s+Zabin\s+Tecnologia',         # Nome da empresa
-                        r'^CNPJ:\s*\d+',                      # CNPJ
-                        r'^I\.E:\s*\d+',                      # Inscrição estadual
-                        r'^Rua\s+Comendador',                 # Endereço
-                        r'^Código\s+Produto\s+Unid',          # Cabeçalho da tabela
-                        r'^\s*\d+\s+dia\(s\)\s*$',           # Linha isolada com dias
-                        r'^Orçamento\s*N[ºo°]?:?\s*\d+',      # Linha de orçamento
-                        r'^Código:\s*\d+.*Data:',             # Linha com código e data
-                        r'^Cliente:\s*[\d\.].*Forma\s*de',     # Linha de cliente completa
-                        r'^Vendedor:.*Validade',              # Linha de vendedor completa
-                    ]
-                    
-                    is_artifact = any(re.search(pattern, line, re.IGNORECASE) 
-                                    for pattern in artifact_patterns)
-                    
-                    if not is_artifact:
-                        # Possível continuação de item (descrição quebrada)
-                        current_item += " " + line
-                    else:
-                        # É um artefato - finalizar item atual se válido
-                        if self._is_valid_item_line(current_item):
-                            cleaned_lines.append(current_item)
-                            logger.debug(f"Added item before artifact: {current_item[:50]}...")
-                        elif current_item:
-                            logger.debug(f"Discarded invalid item before artifact: {current_item[:50]}...")
-                        current_item = ""
-            else:
-                # Linha independente que pode ser item completo ou metadados
-                if self._is_valid_item_line(line):
-                    cleaned_lines.append(line)
-                else:
-                    # Preserva linhas importantes: metadados e informações de valores
-                    important_patterns = [
-                        r'Orçamento\s*N[ºo°]?:?\s*\d+',      # Número do orçamento
-                        r'Cliente:\s*',                       # Cliente
-                        r'Vendedor:\s*',                      # Vendedor 
-                        r'Data:\s*\d{2}/\d{2}/\d{2}',        # Data
-                        r'VALOR\s+TOTAL\s*R\$',              # Valor total
-                        r'VALOR\s+A\s+PAGAR',                # Valor a pagar
-                        r'DESCONTO\s*R\$',                   # Desconto
-                    ]
-                    
-                    is_important = any(re.search(pattern, line, re.IGNORECASE) 
-                                     for pattern in important_patterns)
-                    
-                    if is_important:
-                        cleaned_lines.append(line)
+            elif is_valid_item(line):
+                # Linha independente que é um item completo
+                yield line
+            elif is_important(line):
+                # Preserva linhas importantes: metadados e informações de valores
+                yield line
         
         # Adiciona último item se válido
-        if current_item and self._is_valid_item_line(current_item):
-            cleaned_lines.append(current_item)
+        if current_item and is_valid_item(current_item):
+            yield current_item
             logger.debug(f"Added final item: {current_item[:50]}...")
         elif current_item:
             logger.debug(f"Discarded final invalid item: {current_item[:50]}...")
-        
-        # Debug: Log quantos itens foram encontrados
-        item_count = sum(1 for line in cleaned_lines if self._is_valid_item_line(line))
-        logger.debug(f"Text cleaning found {item_count} valid item lines")
-        
-        return '\n'.join(cleaned_lines)
     
     def _is_valid_item_line(self, line: str) -> bool:
         """
@@ -324,9 +751,9 @@ class PDFParser:
             return False
         
         # Deve ter estrutura básica de item: código + referência + UN + preços
-        has_code = re.search(r'^\d{3,5}\s*/', line)
-        has_unit = re.search(r'/\s*UN\s*/', line)
-        has_prices = len(re.findall(r'[\d,\.]+', line)) >= 3  # quantidade + 2 preços mínimo
+        has_code = self.ITEM_LINE_CODE.match(line)
+        has_unit = self.ITEM_LINE_UNIT.search(line)
+        has_prices = len(self.NUMBER_TOKEN.findall(line)) >= 3  # quantidade + 2 preços mínimo
         
         # Não deve conter artefatos de cabeçalho
         has_artifacts = (
@@ -336,7 +763,7 @@ class PDFParser:
             len(line.split()) < 4  # Muito poucos campos
         )
         
-        return has_code and has_unit and has_prices and not has_artifacts
+        return bool(has_code and has_unit and has_prices and not has_artifacts)
     
     def _is_suspicious_match(self, groups: tuple) -> bool:
         """
@@ -403,7 +830,12 @@ class PDFParser:
         except (ValueError, TypeError):
             return False
     
-    def _extract_with_pattern(self, text: str, pattern_name: str) -> Optional[str]:
+    def _extract_with_pattern(
+        self,
+        text: str,
+        pattern_name: str,
+        stats: Optional[ParseStats] = None
+    ) -> Optional[str]:
         """Extrai dados usando um pattern específico, com fallback."""
         # Tenta padrão principal primeiro
         pattern = self.PATTERNS.get(pattern_name)
@@ -418,27 +850,31 @@ class PDFParser:
             match = re.search(fallback_pattern, text, re.IGNORECASE | re.MULTILINE)
             if match:
                 logger.debug(f"Used fallback pattern for {pattern_name}: {fallback_pattern}")
+                if stats is not None:
+                    stats.count("metadata_fallbacks")
                 return match.group(1).strip()
         
         return None
     
-    def _extract_items(self, text: str) -> List[Dict[str, Any]]:
-        """Extrai lista de itens do pedido com padrões melhorados."""
+    def _extract_items(
+        self,
+        text: str,
+        variants: Tuple[str, ...] = ITEM_VARIANTS,
+        stats: Optional[ParseStats] = None
+    ) -> List[Dict[str, Any]]:
+        """Extrai lista de itens do pedido com o tokenizador de itens."""
         items = []
+        tokenizer = ItemTokenizer(text)
         
-        # Tenta padrão principal primeiro
-        pattern = self.PATTERNS['items']
-        items.extend(self._extract_items_with_pattern(text, pattern))
-        
-        # Se não encontrou itens suficientes, tenta fallbacks
-        if len(items) == 0:
-            fallback_patterns = self.FALLBACK_PATTERNS.get('items', [])
-            for fallback_pattern in fallback_patterns:
-                found_items = self._extract_items_with_pattern(text, fallback_pattern)
-                if found_items:
-                    logger.debug(f"Used fallback pattern for items: {fallback_pattern}")
-                    items.extend(found_items)
-                    break  # Para no primeiro padrão que funcionar
+        # Tenta a gramática padrão primeiro; as variantes tolerantes só
+        # são usadas se a anterior não encontrar nenhum item válido
+        for variant in variants:
+            items = self._extract_items_with_variant(tokenizer, variant, stats)
+            if items:
+                logger.debug(f"Items extracted with tokenizer variant: {variant}")
+                if stats is not None:
+                    stats.item_variant = variant
+                break
         
         # Remove duplicatas baseado no código do produto
         seen_codes = set()
@@ -450,81 +886,58 @@ class PDFParser:
         
         return unique_items
     
-    def _extract_items_with_pattern(self, text: str, pattern: str) -> List[Dict[str, Any]]:
-        """Extrai itens usando um padrão específico."""
-        items = []
-        
-        for match in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE):
-            try:
-                # O padrão melhorado pode ter diferentes números de grupos
-                groups = match.groups()
-                
-                # Validação adicional: ignorar matches suspeitos
-                if self._is_suspicious_match(groups):
-                    logger.debug(f"Skipping suspicious match: {groups}")
-                    continue
-                
-                # Análise dos grupos baseada no padrão usado
-                if len(groups) >= 7:  # Padrão universal com 7 grupos
-                    product_code = groups[0].strip()
-                    product_reference = groups[1].strip()
-                    product_description = groups[2].strip() if groups[2] else ""
-                    extra_field = groups[3].strip() if groups[3] else ""
-                    quantity = groups[4].strip()
-                    unit_price = groups[5].strip()
-                    total_price = groups[6].strip()
-                    
-                    # Combina referência e descrição
-                    if product_description:
-                        combined_name = f"{product_reference} - {product_description}"
-                        if extra_field:
-                            combined_name += f" ({extra_field})"
-                    else:
-                        combined_name = product_reference
-                        
-                elif len(groups) >= 6:  # Padrão sem descrição separada (6-7 grupos)
-                    product_code = groups[0].strip()
-                    product_reference = groups[1].strip()
-                    quantity = groups[2].strip()
-                    unit_price = groups[3].strip()
-                    total_price = groups[4].strip()
-                    
-                    combined_name = product_reference
-                    
-                elif len(groups) == 5:  # Padrão simples usado em testes
-                    product_code = groups[0].strip()
-                    product_reference = groups[1].strip()
-                    # Para 5 grupos: código, ref, quantidade, preço_unit, preço_total
-                    quantity = groups[2].strip()
-                    unit_price = groups[3].strip()
-                    total_price = groups[4].strip()
-                    
-                    combined_name = product_reference
-                    
-                else:
-                    logger.warning(f"Unexpected number of groups in item pattern: {len(groups)}")
-                    continue
-                
-                # Validação final do item construído
-                if not self._is_valid_item_data(product_code, product_reference, quantity, unit_price, total_price):
-                    logger.debug(f"Skipping invalid item: code={product_code}, ref={product_reference}")
-                    continue
-                
-                item = {
-                    'product_code': product_code,
-                    'product_reference': product_reference,
-                    'product_name': combined_name,
-                    'quantity': int(quantity),
-                    'unit_price': self._parse_money_value(unit_price),
-                    'total_price': self._parse_money_value(total_price)
-                }
-                items.append(item)
-                
-            except (ValueError, IndexError) as e:
-                logger.warning(f"Error parsing item from match {match.groups()}: {e}")
+    def _extract_items_with_variant(
+        self,
+        tokenizer: ItemTokenizer,
+        variant: str,
+        stats: Optional[ParseStats] = None
+    ) -> List[Dict[str, Any]]:
+        """Extrai itens usando uma variante da gramática do tokenizador."""
+        return list(self._items_from_matches(tokenizer.tokenize(variant), stats))
+    
+    def _items_from_matches(
+        self,
+        matches: Iterable[ItemMatch],
+        stats: Optional[ParseStats] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Valida os itens reconhecidos pelo tokenizador e monta seus dados."""
+        for match in matches:
+            groups = match.groups
+            
+            # Validação adicional: ignorar matches suspeitos
+            if self._is_suspicious_match(groups):
+                logger.debug(f"Skipping suspicious match: {groups}")
+                if stats is not None:
+                    stats.count("suspicious_items")
+                continue
+            
+            product_code, product_reference, product_description, extra_field, quantity, unit_price, total_price = (
+                group.strip() if group else "" for group in groups
+            )
+            
+            # Combina referência e descrição
+            if product_description:
+                combined_name = f"{product_reference} - {product_description}"
+                if extra_field:
+                    combined_name += f" ({extra_field})"
+            else:
+                combined_name = product_reference
+            
+            # Validação final do item construído
+            if not self._is_valid_item_data(product_code, product_reference, quantity, unit_price, total_price):
+                logger.debug(f"Skipping invalid item: code={product_code}, ref={product_reference}")
+                if stats is not None:
+                    stats.count("invalid_items")
                 continue
             
-        return items
+            yield {
+                'product_code': product_code,
+                'product_reference': product_reference,
+                'product_name': combined_name,
+                'quantity': int(quantity),
+                'unit_price': self._parse_money_value(unit_price),
+                'total_price': self._parse_money_value(total_price)
+            }
     
     def _extract_items_from_line(self, line: str) -> List[Dict[str, Any]]:
         """Extrai item de uma linha específica (usado nos testes)."""
@@ -0,0 +1,154 @@
+"""
+Previews de PDF guardados no servidor até a confirmação do pedido.
+
+O /upload guarda os dados extraídos e já validados (PDFExtractedData) e
+devolve um token assinado e com validade. O /confirm recebe só o token e
+os campos de logística, sem reenviar o pedido inteiro: os dados vêm do
+servidor, sem nova validação e sem possibilidade de alteração pelo
+cliente. O token vale apenas para o usuário que fez o upload e é
+descartado quando o pedido é criado.
+
+Os previews ficam em um LRU local e no Redis (quando disponível), para
+que a confirmação funcione em qualquer instância da API.
+"""
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.cache import Cache, CacheKeys
+from app.core.config import settings
+from app.core.security import create_pdf_preview_token, decode_pdf_preview_token
+from app.schemas.pdf import PDFExtractedData
+
+logger = logging.getLogger(__name__)
+
+
+class PDFPreviewStore:
+    """Previews validados, referenciados por token assinado."""
+
+    def __init__(self, ttl: int = 7200, max_entries: int = 1000):
+        """
+        Inicializa o store.
+
+        Args:
+            ttl: Validade do token e do preview em segundos
+            max_entries: Máximo de previews no LRU local
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[str, Tuple[float, PDFExtractedData]]" = OrderedDict()
+
+        # Métricas
+        self._stored = 0
+        self._hits = 0
+        self._redis_hits = 0
+        self._misses = 0
+        self._invalid_tokens = 0
+        self._evictions = 0
+
+    async def put(self, data: PDFExtractedData, user_id: int) -> str:
+        """
+        Guarda um preview.
+
+        Args:
+            data: Dados extraídos e validados
+            user_id: Usuário que fez o upload
+
+        Returns:
+            str: Token assinado que referencia o preview
+        """
+        preview_id = uuid.uuid4().hex
+        self._set_local(preview_id, data)
+        await Cache.set(CacheKeys.pdf_preview_key(preview_id), data, self.ttl)
+        self._stored += 1
+        return create_pdf_preview_token(preview_id, user_id, timedelta(seconds=self.ttl))
+
+    async def get(self, token: str, user_id: int) -> Optional[PDFExtractedData]:
+        """
+        Busca o preview de um token.
+
+        Args:
+            token: Token devolvido pelo upload
+            user_id: Usuário que está confirmando
+
+        Returns:
+            Optional[PDFExtractedData]: Dados do preview ou None se o token
+                for inválido, expirado, de outro usuário ou já usado
+        """
+        preview_id = self._preview_id(token, user_id)
+        if preview_id is None:
+            return None
+
+        entry = self._entries.get(preview_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self._entries.move_to_end(preview_id)
+            self._hits += 1
+            return entry[1]
+
+        data = await Cache.get(CacheKeys.pdf_preview_key(preview_id))
+        if data is not None:
+            self._redis_hits += 1
+            self._set_local(preview_id, data)
+            return data
+
+        self._misses += 1
+        return None
+
+    async def discard(self, token: str) -> None:
+        """
+        Remove o preview de um token (pedido criado).
+
+        Args:
+            token: Token devolvido pelo upload
+        """
+        payload = decode_pdf_preview_token(token)
+        if payload is None:
+            return
+        self._entries.pop(payload["sub"], None)
+        await Cache.delete(CacheKeys.pdf_preview_key(payload["sub"]))
+
+    def _preview_id(self, token: str, user_id: int) -> Optional[str]:
+        """ID do preview se o token for válido e do usuário."""
+        payload = decode_pdf_preview_token(token)
+        if payload is None or payload.get("uid") != user_id:
+            self._invalid_tokens += 1
+            return None
+        return payload["sub"]
+
+    def _set_local(self, preview_id: str, data: PDFExtractedData) -> None:
+        """Guarda no LRU local, removendo o menos usado se necessário."""
+        if self.max_entries <= 0:
+            return
+        self._entries[preview_id] = (time.monotonic() + self.ttl, data)
+        self._entries.move_to_end(preview_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do store.
+
+        Returns:
+            Dict[str, Any]: Previews guardados, acertos, erros e remoções
+        """
+        return {
+            "entries": len(self._entries),
+            "stored": self._stored,
+            "hits": self._hits,
+            "redis_hits": self._redis_hits,
+            "misses": self._misses,
+            "invalid_tokens": self._invalid_tokens,
+            "evictions": self._evictions,
+        }
+
+
+# Instância global do store
+pdf_preview_store = PDFPreviewStore(
+    ttl=settings.PDF_PREVIEW_TTL,
+    max_entries=settings.PDF_PREVIEW_MAX_ENTRIES
+)
@@ -0,0 +1,7 @@
+"""
+Benchmarks de desempenho do backend.
+
+Cada módulo pode ser executado diretamente a partir do diretório backend:
+
+    python -m benchmarks.bench_login
+"""
@@ -0,0 +1,145 @@
+"""
+Teste de carga: latência do ping WebSocket durante uma rajada de logins.
+
+Um cliente WebSocket simulado envia `ping` a cada intervalo fixo enquanto
+N logins concorrentes são processados. Mede-se o atraso até o `pong`,
+comparando o bcrypt síncrono no event loop (comportamento antigo) com o
+password_hasher em pool de threads.
+
+Uso:
+    python -m benchmarks.bench_hashing_load
+    python -m benchmarks.bench_hashing_load --logins 50 --interval-ms 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.v1.websocket import handle_client_message
+from app.core.database import Base
+from app.core.security import get_pin_lookup, verify_password
+from app.models import User, UserRole
+from app.repositories.user import UserRepository
+from app.schemas.auth import LoginRequest
+from app.services.auth import AuthService
+from app.services.password_hasher import password_hasher
+from app.services.websocket import connection_manager
+
+PINGER_USER_ID = 999_999
+
+
+class FakeWebSocket:
+    """WebSocket simulado que registra o instante de cada pong."""
+
+    def __init__(self):
+        self.pong_times = []
+
+    async def send_text(self, text: str):
+        self.pong_times.append(time.perf_counter())
+
+
+async def blocking_login(session, pin: str):
+    """Login com bcrypt síncrono no event loop (comportamento antigo)."""
+    user = await UserRepository(session).get_by_pin(pin)
+    return user if user and verify_password(pin, user.pin_hash) else None
+
+
+async def pooled_login(session, pin: str):
+    """Login pelo AuthService, com bcrypt no password_hasher."""
+    return await AuthService(session).login(LoginRequest(pin=pin))
+
+
+async def pinger(websocket: FakeWebSocket, interval: float, stop: asyncio.Event, delays: list):
+    """Envia pings periódicos e mede o atraso até o pong."""
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        await handle_client_message(PINGER_USER_ID, "ping", {"timestamp": expected})
+        delays.append((websocket.pong_times[-1] - expected) * 1000)
+
+
+async def run_burst(session_maker, pins, login_func, interval: float):
+    """Executa a rajada de logins medindo o ping em paralelo."""
+    websocket = FakeWebSocket()
+    connection_manager.active_connections[PINGER_USER_ID] = websocket
+    connection_manager.connection_metadata[PINGER_USER_ID] = {
+        "user_name": "pinger", "connected_at": None, "current_order": None
+    }
+
+    async def one_login(pin):
+        async with session_maker() as session:
+            return await login_func(session, pin)
+
+    delays = []
+    stop = asyncio.Event()
+    ping_task = asyncio.create_task(pinger(websocket, interval, stop, delays))
+    await asyncio.sleep(interval * 3)  # Linha de base antes da rajada
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one_login(pin) for pin in pins))
+    burst_ms = (time.perf_counter() - start) * 1000
+
+    stop.set()
+    await ping_task
+    del connection_manager.active_connections[PINGER_USER_ID]
+    del connection_manager.connection_metadata[PINGER_USER_ID]
+
+    assert all(results), "Todos os logins deveriam ser bem-sucedidos"
+    return burst_ms, delays
+
+
+async def run(logins: int, interval_ms: int):
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+    pins = [f"{i:04d}" for i in range(logins)]
+    hashes = await asyncio.gather(*(password_hasher.hash(pin) for pin in pins))
+    async with session_maker() as session:
+        await session.execute(insert(User), [
+            {
+                "name": f"Usuário {pin}",
+                "pin_hash": pin_hash,
+                "pin_unique": pin,
+                "pin_lookup": get_pin_lookup(pin),
+                "role": UserRole.SEPARATOR,
+                "is_active": True,
+            }
+            for pin, pin_hash in zip(pins, hashes)
+        ])
+        await session.commit()
+
+    interval = interval_ms / 1000
+    print(f"{logins} logins concorrentes, ping a cada {interval_ms} ms")
+    print(f"{'modo':>12} {'rajada (ms)':>12} {'ping p50':>10} {'ping p95':>10} {'ping máx':>10}")
+    for name, login_func in (("síncrono", blocking_login), ("pool", pooled_login)):
+        burst_ms, delays = await run_burst(session_maker, pins, login_func, interval)
+        delays.sort()
+        p95 = delays[min(len(delays) - 1, int(len(delays) * 0.95))]
+        print(f"{name:>12} {burst_ms:12.0f} {statistics.median(delays):10.1f} "
+              f"{p95:10.1f} {delays[-1]:10.1f}")
+
+    print(f"métricas do pool: {password_hasher.get_metrics()}")
+    password_hasher.shutdown()
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--interval-ms", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.interval_ms))
+
+
+if __name__ == "__main__":
+    main()
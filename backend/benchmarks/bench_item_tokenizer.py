@@ -0,0 +1,87 @@
+"""
+Benchmark de pior caso da extração de itens: regex em cascata vs tokenizador.
+
+Gera linhas malformadas (sem marcador UN válido) de tamanho crescente e
+mede a cascata de regex anterior (padrão principal + fallbacks, todos
+executados quando nenhum item é encontrado) contra o ItemTokenizer.
+Tamanhos em que a cascata passa do limite de tempo não são repetidos.
+
+Uso:
+    python -m benchmarks.bench_item_tokenizer
+    python -m benchmarks.bench_item_tokenizer --sizes 100 200 400 --limit 10
+"""
+import argparse
+import os
+import re
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_item_tokenizer import ITEM_VARIANTS, ItemTokenizer
+from app.services.pdf_parser import PDFParser
+
+# Padrões usados antes do tokenizador (principal + FALLBACK_PATTERNS['items'])
+LEGACY_ITEM_PATTERNS = [
+    PDFParser.PATTERNS['items'],
+    r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*(?:/\s*([^/]*?))?\s*/?<?/?<?\s*UN\s*/?\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
+    r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*/<<UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
+    r'(?:^|\s)(\d{4,5})\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*</<\s*UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
+    r'(\d+)\s*/\s*([^/]+?)(?:\s*-->\s*([^/]+?))?\s*(?:/\s*([^/]*?))?\s*/\s*UN\s*/\s*(\d+)\s*/\s*([\d,\.]+)\s*/\s*([\d,\.]+)',
+]
+
+# Entradas adversariais: N caracteres de "recheio" em uma linha de item
+CASES = {
+    "espaços": lambda n: "12345 / a" + " \n" * (n // 2) + "/ x",
+    "espaços x2": lambda n: "12345 / a --> b" + " " * (n // 2) + "/ c" + " " * (n // 2) + "/ UN / x",
+    "setas": lambda n: "12345 / " + "a -->" * (n // 5) + " / x",
+    "marcador un": lambda n: "12345 / a " + "un " * (n // 3) + "/ x",
+    "códigos": lambda n: "12345 / " * (n // 8),
+}
+
+
+def legacy_scan(text: str) -> int:
+    """Cascata anterior: todos os padrões rodam quando não há itens."""
+    found = 0
+    for pattern in LEGACY_ITEM_PATTERNS:
+        found += sum(1 for _ in re.finditer(pattern, text, re.IGNORECASE | re.MULTILINE))
+    return found
+
+
+def tokenizer_scan(text: str) -> int:
+    """Tokenizador: todas as variantes sobre o mesmo texto."""
+    tokenizer = ItemTokenizer(text)
+    return sum(len(list(tokenizer.tokenize(variant))) for variant in ITEM_VARIANTS)
+
+
+def timed(func, text: str) -> float:
+    """Tempo de uma execução em ms."""
+    start = time.perf_counter()
+    func(text)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 200, 400, 800, 5000])
+    parser.add_argument("--limit", type=float, default=5.0,
+                        help="Limite (s) da cascata por caso; tamanhos maiores são pulados")
+    args = parser.parse_args()
+
+    print(f"{'caso':>12} {'N':>7} {'regex (ms)':>12} {'tokenizador (ms)':>17}")
+    for name, generate in CASES.items():
+        legacy_skipped = False
+        for size in args.sizes:
+            text = generate(size)
+            if legacy_skipped:
+                legacy = "pulado"
+            else:
+                elapsed = timed(legacy_scan, text)
+                legacy = f"{elapsed:.1f}"
+                legacy_skipped = elapsed > args.limit * 1000
+            print(f"{name:>12} {size:7d} {legacy:>12} {timed(tokenizer_scan, text):17.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark de latência do login por PIN.
+
+Compara a varredura antiga (bcrypt contra todos os usuários) com a busca
+indexada por pin_lookup, variando a quantidade de usuários cadastrados.
+
+Uso:
+    python -m benchmarks.bench_login
+    python -m benchmarks.bench_login --sizes 10 100 1000 --legacy-max 100
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.security import get_password_hash, get_pin_lookup, verify_password
+from app.models import User, UserRole
+from app.repositories.user import UserRepository
+from app.schemas.auth import LoginRequest
+from app.services.auth import AuthService
+
+
+async def seed_users(session: AsyncSession, count: int) -> str:
+    """
+    Cria `count` usuários e retorna o PIN do último (pior caso da varredura).
+
+    Apenas o usuário alvo recebe um hash próprio; os demais compartilham um
+    hash fictício para que a preparação não custe `count` execuções de bcrypt.
+    """
+    dummy_hash = get_password_hash("99999")
+    rows = []
+    for i in range(count - 1):
+        pin = f"{i:04d}"
+        rows.append({
+            "name": f"Usuário {i}",
+            "pin_hash": dummy_hash,
+            "pin_unique": pin,
+            "pin_lookup": get_pin_lookup(pin),
+            "role": UserRole.SEPARATOR,
+            "is_active": True,
+        })
+    target_pin = f"{count - 1:04d}"
+    rows.append({
+        "name": "Usuário alvo",
+        "pin_hash": get_password_hash(target_pin),
+        "pin_unique": target_pin,
+        "pin_lookup": get_pin_lookup(target_pin),
+        "role": UserRole.SEPARATOR,
+        "is_active": True,
+    })
+    await session.execute(insert(User), rows)
+    await session.commit()
+    return target_pin
+
+
+async def legacy_login(session: AsyncSession, pin: str):
+    """Reproduz o login antigo: bcrypt contra cada usuário até encontrar."""
+    users = await UserRepository(session).get_all_users()
+    for user in users:
+        if verify_password(pin, user.pin_hash):
+            return user
+    return None
+
+
+async def measure(func, repeat: int) -> float:
+    """Executa `func` `repeat` vezes e retorna a mediana em milissegundos."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+async def run(sizes, legacy_max: int, repeat: int):
+    print(f"{'usuários':>10} {'indexado (ms)':>15} {'varredura (ms)':>16}")
+    for size in sizes:
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+
+        async with session_maker() as session:
+            pin = await seed_users(session, size)
+            service = AuthService(session)
+            indexed = await measure(lambda: service.login(LoginRequest(pin=pin)), repeat)
+
+            legacy = None
+            if size <= legacy_max:
+                legacy = await measure(lambda: legacy_login(session, pin), max(1, repeat // 5))
+
+        await engine.dispose()
+        legacy_str = f"{legacy:16.1f}" if legacy is not None else f"{'-':>16}"
+        print(f"{size:>10} {indexed:15.1f} {legacy_str}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--legacy-max", type=int, default=100,
+                        help="Maior quantidade de usuários para medir a varredura antiga")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.sizes, args.legacy_max, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
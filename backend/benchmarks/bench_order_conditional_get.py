@@ -0,0 +1,156 @@
+"""
+Benchmark das leituras condicionais (ETag / If-None-Match) de pedidos.
+
+Simula o polling dos tablets pelo app (ASGI, sem rede) quando nada mudou:
+
+    detalhe     GET /orders/{id}/detail de pedidos com 10, 200 e 2.000 itens
+    listagem    GET /orders (página de --per-page pedidos)
+
+Cada um sem If-None-Match (resposta completa) e com o ETag da resposta
+anterior (304). Mostra a mediana do tempo da requisição, o tamanho do
+corpo e o número de comandos enviados ao banco.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_conditional_get
+    python -m benchmarks.bench_order_conditional_get --sizes 200 2000 --runs 20
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.deps import get_async_session, get_current_user
+from app.main import app
+from app.models import User, UserRole
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import PDFExtractedData
+
+_order_numbers = itertools.count(100000)
+
+
+def build_pdf_data(items: int) -> PDFExtractedData:
+    """Pedido com `items` itens e número único."""
+    return PDFExtractedData(
+        order_number=str(next(_order_numbers)),
+        client_name="Cliente Benchmark",
+        seller_name="Vendedor Benchmark",
+        order_date=datetime.now(),
+        total_value=items * 10.0,
+        items=[
+            {
+                "product_code": str(10000 + index),
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 1,
+                "unit_price": 10.0,
+                "total_price": 10.0,
+            }
+            for index in range(items)
+        ]
+    )
+
+
+async def measure(url: str, args):
+    """Mede as leituras completas e condicionais em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    statements = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        statements[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    async def session_dependency():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    async def timed(client: httpx.AsyncClient, path: str, headers, expected: int):
+        timings = []
+        for _ in range(args.runs):
+            statements[0] = 0
+            start = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            timings.append((time.perf_counter() - start) * 1000)
+            if response.status_code != expected:
+                raise RuntimeError(f"{path}: {response.status_code} {response.text[:200]}")
+        return statistics.median(timings), len(response.content), statements[0], response.headers["ETag"]
+
+    rows = []
+    try:
+        async with session_maker() as session:
+            user = User(name="Benchmark", pin_hash="-", pin_unique="-", pin_lookup="-", role=UserRole.SEPARATOR)
+            session.add(user)
+            await session.commit()
+            order_ids = {}
+            for size in args.sizes:
+                order = await OrderRepository(session).create_from_pdf_data(build_pdf_data(size))
+                order_ids[size] = order.id
+            for _ in range(args.per_page):
+                await OrderRepository(session).create_from_pdf_data(build_pdf_data(1))
+
+        app.dependency_overrides[get_async_session] = session_dependency
+        app.dependency_overrides[get_current_user] = lambda: user
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            targets = [(f"detalhe {size}", f"/api/v1/orders/{order_ids[size]}/detail") for size in args.sizes]
+            targets.append((f"listagem {args.per_page}", f"/api/v1/orders?per_page={args.per_page}"))
+            for name, path in targets:
+                elapsed, body, count, etag = await timed(client, path, {}, 200)
+                rows.append((name, "completa", elapsed, body, count))
+                elapsed, body, count, _ = await timed(client, path, {"If-None-Match": etag}, 304)
+                rows.append((name, "304", elapsed, body, count))
+    finally:
+        app.dependency_overrides.clear()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{'banco':>9} {'recurso':>14} {'resposta':>9} {'tempo (ms)':>11} {'bytes':>9} {'comandos':>9}")
+    for database, url in databases:
+        for name, mode, elapsed, body_bytes, statements in await measure(url, args):
+            print(f"{database:>9} {name:>14} {mode:>9} {elapsed:11.2f} {body_bytes:>9} {statements:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    # Logs por requisição do app distorcem o tempo
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
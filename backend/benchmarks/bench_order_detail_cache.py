@@ -0,0 +1,173 @@
+"""
+Benchmark do cache do detalhe de pedidos com vários tablets no mesmo pedido.
+
+Simula --tablets tablets abrindo o mesmo pedido (2.000 itens por padrão)
+depois de cada alteração: a cada rodada um PATCH separa um item (e
+invalida o cache) e cada tablet faz GET /orders/{id}/detail, pelo app
+(ASGI, sem rede). Compara:
+
+    sem cache   order_detail_cache desativado: pedido e itens lidos por GET
+    com cache   LRU local (o Redis não é usado no benchmark)
+
+Mostra a mediana do tempo por GET, os comandos por GET e quantas vezes os
+itens do pedido foram lidos do banco por rodada.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_detail_cache
+    python -m benchmarks.bench_order_detail_cache --items 2000 --tablets 12 --rounds 10
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+import httpx
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.deps import get_async_session, get_current_user
+from app.main import app
+from app.models import User, UserRole
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import PDFExtractedData
+from app.services.order_detail_cache import order_detail_cache
+
+
+def build_pdf_data(items: int) -> PDFExtractedData:
+    """Pedido com `items` itens."""
+    return PDFExtractedData(
+        order_number="100000",
+        client_name="Cliente Benchmark",
+        seller_name="Vendedor Benchmark",
+        order_date=datetime.now(),
+        total_value=items * 10.0,
+        items=[
+            {
+                "product_code": str(10000 + index),
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 1,
+                "unit_price": 10.0,
+                "total_price": 10.0,
+            }
+            for index in range(items)
+        ]
+    )
+
+
+async def measure(url: str, args):
+    """Mede as rodadas sem e com cache em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    statements = [0]
+    item_reads = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(conn, cursor, statement, *args):
+        statements[0] += 1
+        if statement.lstrip().startswith("SELECT") and "order_items" in statement:
+            item_reads[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+    max_entries = order_detail_cache.max_entries
+    users = []
+
+    async def session_dependency():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    rows = []
+    try:
+        async with session_maker() as session:
+            for index in range(args.tablets):
+                session.add(User(
+                    name=f"Tablet {index}", pin_hash="-", pin_unique=f"-{index}", pin_lookup=f"-{index}",
+                    role=UserRole.SEPARATOR
+                ))
+            await session.commit()
+            users = list((await session.execute(select(User))).scalars().all())
+            order = await OrderRepository(session).create_from_pdf_data(build_pdf_data(args.items))
+            order_id, item_ids = order.id, [item.id for item in order.items]
+
+        app.dependency_overrides[get_async_session] = session_dependency
+        current = {"user": None}
+        app.dependency_overrides[get_current_user] = lambda: current["user"]
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            for name, entries in (("sem cache", 0), ("com cache", max_entries or 500)):
+                order_detail_cache.max_entries = entries
+                order_detail_cache.clear()
+                timings, polls, reads, total_statements = [], 0, 0, 0
+                for round_number in range(args.rounds):
+                    current["user"] = users[0]
+                    response = await client.patch(
+                        f"/api/v1/orders/{order_id}/items?response=delta",
+                        json={"updates": [{"item_id": item_ids[0], "separated": round_number % 2 == 0}]}
+                    )
+                    if response.status_code != 200:
+                        raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
+                    for user in users:
+                        current["user"] = user
+                        statements[0] = item_reads[0] = 0
+                        start = time.perf_counter()
+                        response = await client.get(f"/api/v1/orders/{order_id}/detail")
+                        timings.append((time.perf_counter() - start) * 1000)
+                        if response.status_code != 200:
+                            raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
+                        polls += 1
+                        reads += item_reads[0]
+                        total_statements += statements[0]
+                rows.append((
+                    name, statistics.median(timings), total_statements / polls, reads / args.rounds
+                ))
+    finally:
+        order_detail_cache.max_entries = max_entries
+        order_detail_cache.clear()
+        app.dependency_overrides.clear()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{args.items} itens, {args.tablets} tablets, {args.rounds} alterações")
+    print(f"{'banco':>9} {'cache':>10} {'tempo/GET (ms)':>15} {'comandos/GET':>13} {'leituras de itens/rodada':>25}")
+    for database, url in databases:
+        for name, elapsed, statements, reads in await measure(url, args):
+            print(f"{database:>9} {name:>10} {elapsed:15.2f} {statements:13.1f} {reads:25.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=2000)
+    parser.add_argument("--tablets", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    # Logs por requisição do app distorcem o tempo
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
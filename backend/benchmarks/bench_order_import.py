@@ -0,0 +1,129 @@
+"""
+Benchmark da importação em massa de pedidos contra a criação um a um.
+
+Gera N pedidos em JSONL (formato de PDFExtractedData) e mede:
+
+    um a um   o caminho do /confirm para cada pedido: validação do
+              pedido, consulta do número e create_from_pdf_data
+              (um commit por pedido), em uma amostra de --sample pedidos
+    lote      OrderImporter.run com o arquivo inteiro (validação em lote,
+              uma consulta e uma transação por lote)
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_import
+    python -m benchmarks.bench_order_import --orders 100000 --items 5 --batch-size 2000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import PDFExtractedData
+from app.services.order_import import OrderImporter, iter_jsonl
+
+
+def build_lines(orders: int, items: int, first_number: int = 100000):
+    """Linhas JSONL de `orders` pedidos com `items` itens cada."""
+    for number in range(first_number, first_number + orders):
+        yield json.dumps({
+            "order_number": str(number),
+            "client_name": "Cliente Benchmark",
+            "seller_name": "Vendedor Benchmark",
+            "order_date": "2024-03-01T10:00:00",
+            "total_value": items * 10.0,
+            "items": [
+                {
+                    "product_code": str(10000 + index),
+                    "product_reference": f"REF-{index}",
+                    "product_name": f"Produto {index}",
+                    "quantity": 1,
+                    "unit_price": 10.0,
+                    "total_price": 10.0,
+                }
+                for index in range(items)
+            ],
+        })
+
+
+async def one_by_one(session: AsyncSession, lines) -> float:
+    """Tempo (s) criando um pedido por vez."""
+    repository = OrderRepository(session)
+    start = time.perf_counter()
+    for line in lines:
+        pdf_data = PDFExtractedData.model_validate_json(line)
+        if await repository.get_by_order_number(pdf_data.order_number) is None:
+            await repository.create_from_pdf_data(pdf_data)
+    return time.perf_counter() - start
+
+
+async def bulk(session: AsyncSession, lines, batch_size: int) -> float:
+    """Tempo (s) da importação em lotes."""
+    start = time.perf_counter()
+    result = await OrderImporter(batch_size=batch_size).run(iter_jsonl(lines), session)
+    elapsed = time.perf_counter() - start
+    if result.invalid:
+        raise RuntimeError(f"{result.invalid} pedidos inválidos: {result.errors[:3]}")
+    return elapsed
+
+
+async def measure(url: str, args):
+    """Mede os dois caminhos em um banco; devolve pedidos/s de cada um."""
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with session_maker() as session:
+            sample_s = await one_by_one(session, list(build_lines(args.sample, args.items, first_number=1)))
+        async with session_maker() as session:
+            bulk_s = await bulk(session, build_lines(args.orders, args.items), args.batch_size)
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return args.sample / sample_s, args.orders / bulk_s, bulk_s
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{args.orders} pedidos, {args.items} itens por pedido, lotes de {args.batch_size}")
+    print(f"{'banco':>9} {'um a um (/s)':>13} {'lote (/s)':>10} {'lote (s)':>9} {'um a um est. (s)':>17} {'speedup':>8}")
+    for database, url in databases:
+        single_rate, bulk_rate, bulk_s = await measure(url, args)
+        print(
+            f"{database:>9} {single_rate:13.0f} {bulk_rate:10.0f} {bulk_s:9.1f} "
+            f"{args.orders / single_rate:17.1f} {bulk_rate / single_rate:7.1f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--sample", type=int, default=2000, help="Pedidos criados um a um (a taxa é extrapolada)")
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Benchmark da resposta de PATCH /orders/{id}/items: completa contra compacta.
+
+Para pedidos de 10, 200 e 2.000 itens, envia pelo app (ASGI, sem rede) um
+lote que altera um item e mede as duas formas de resposta:
+
+    completa  padrão: registra o acesso, recarrega pedido e todos os itens
+              e monta OrderDetailResponse (get_order_detail)
+    delta     Prefer: return=minimal: só o item alterado e os contadores,
+              a partir dos objetos já na sessão
+
+Mostra a mediana do tempo da requisição, o tamanho do corpo da resposta e
+o número de comandos enviados ao banco.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_items_response
+    python -m benchmarks.bench_order_items_response --sizes 200 2000 --runs 20
+"""
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+import httpx
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.core.deps import get_async_session, get_current_user
+from app.main import app
+from app.models import User, UserRole
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import PDFExtractedData
+
+_order_numbers = itertools.count(100000)
+
+
+def build_pdf_data(items: int) -> PDFExtractedData:
+    """Pedido com `items` itens e número único."""
+    return PDFExtractedData(
+        order_number=str(next(_order_numbers)),
+        client_name="Cliente Benchmark",
+        seller_name="Vendedor Benchmark",
+        order_date=datetime.now(),
+        total_value=items * 10.0,
+        items=[
+            {
+                "product_code": str(10000 + index),
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 1,
+                "unit_price": 10.0,
+                "total_price": 10.0,
+            }
+            for index in range(items)
+        ]
+    )
+
+
+async def measure(url: str, sizes, runs: int):
+    """Mede as duas respostas em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    statements = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        statements[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+    async def session_dependency():
+        async with session_maker() as session:
+            yield session
+            await session.commit()
+
+    rows = []
+    try:
+        async with session_maker() as session:
+            user = User(name="Benchmark", pin_hash="-", pin_unique="-", pin_lookup="-", role=UserRole.SEPARATOR)
+            session.add(user)
+            await session.commit()
+
+        app.dependency_overrides[get_async_session] = session_dependency
+        app.dependency_overrides[get_current_user] = lambda: user
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            for size in sizes:
+                async with session_maker() as session:
+                    order = await OrderRepository(session).create_from_pdf_data(build_pdf_data(size))
+                    order_id, item_ids = order.id, [item.id for item in order.items]
+
+                for name, headers in (("completa", {}), ("delta", {"Prefer": "return=minimal"})):
+                    timings, sizes_bytes = [], []
+                    for run in range(runs):
+                        # Alterna separar/desfazer para sempre haver uma transição real
+                        body = {"updates": [{"item_id": item_ids[0], "separated": run % 2 == 0}]}
+                        statements[0] = 0
+                        start = time.perf_counter()
+                        response = await client.patch(f"/api/v1/orders/{order_id}/items", json=body, headers=headers)
+                        timings.append((time.perf_counter() - start) * 1000)
+                        if response.status_code != 200:
+                            raise RuntimeError(f"{response.status_code}: {response.text[:200]}")
+                        sizes_bytes.append(len(response.content))
+                    rows.append((size, name, statistics.median(timings), max(sizes_bytes), statements[0]))
+    finally:
+        app.dependency_overrides.clear()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{'banco':>9} {'itens':>6} {'resposta':>9} {'tempo (ms)':>11} {'bytes':>9} {'comandos':>9}")
+    for database, url in databases:
+        for size, name, elapsed, body_bytes, statements in await measure(url, args.sizes, args.runs):
+            print(f"{database:>9} {size:>6} {name:>9} {elapsed:11.2f} {body_bytes:>9} {statements:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    # Logs por requisição do app distorcem o tempo
+    logging.disable(logging.INFO)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Benchmark da atualização em lote de itens (PATCH /orders/{id}/items).
+
+Mede a fase de gravação do endpoint (antes de montar a resposta com
+get_order_detail) em lotes de 1, 50 e 500 itens:
+
+    um a um   caminho anterior: get do item, mark_separated (outro get),
+              get do pedido por item separado, send_to_purchase,
+              commit e recálculo do progresso
+    lote      get_item_states (uma consulta) e apply_batch_update
+              (um UPDATE por transição, PurchaseItem em lote), contadores
+              por variação (apply_progress_delta) e um commit
+
+Os lotes misturam as ações: separar, não enviado e enviar para compras.
+Mostra a mediana do tempo e o número de comandos enviados ao banco.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_items_update
+    python -m benchmarks.bench_order_items_update --sizes 1 50 500 --runs 5
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import User, UserRole
+from app.repositories.order import OrderRepository
+from app.repositories.order_item import OrderItemRepository
+from app.schemas.orders import OrderItemUpdate
+from app.schemas.pdf import PDFExtractedData
+
+_order_numbers = itertools.count(100000)
+
+
+def build_pdf_data(items: int) -> PDFExtractedData:
+    """Pedido com `items` itens e número único."""
+    return PDFExtractedData(
+        order_number=str(next(_order_numbers)),
+        client_name="Cliente Benchmark",
+        seller_name="Vendedor Benchmark",
+        order_date=datetime.now(),
+        total_value=items * 10.0,
+        items=[
+            {
+                "product_code": str(10000 + index),
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 1,
+                "unit_price": 10.0,
+                "total_price": 10.0,
+            }
+            for index in range(items)
+        ]
+    )
+
+
+def build_updates(item_ids):
+    """Lote com as ações alternadas entre separar, não enviado e compras."""
+    actions = ({"separated": True}, {"not_sent": True}, {"sent_to_purchase": True})
+    return [
+        OrderItemUpdate(item_id=item_id, **actions[index % len(actions)])
+        for index, item_id in enumerate(item_ids)
+    ]
+
+
+async def update_one_by_one(session: AsyncSession, order_id: int, updates, user_id: int):
+    """Caminho anterior: uma atualização por vez."""
+    order_repo = OrderRepository(session)
+    item_repo = OrderItemRepository(session)
+    await order_repo.get(order_id)
+    for update in updates:
+        item = await item_repo.get(update.item_id)
+        if not item or item.order_id != order_id:
+            raise RuntimeError(f"Item {update.item_id} não encontrado")
+        if update.separated:
+            await item_repo.mark_separated(update.item_id, user_id)
+            await order_repo.get(order_id)
+        if update.sent_to_purchase:
+            await item_repo.send_to_purchase(update.item_id, user_id)
+        if update.not_sent:
+            item.not_sent = True
+            item.not_sent_at = datetime.utcnow()
+            item.not_sent_by_id = user_id
+    await session.commit()
+    await order_repo.recalculate_progress(order_id)
+    await session.commit()
+
+
+async def update_batch(session: AsyncSession, order_id: int, updates, user_id: int):
+    """Caminho atual: agrupado por transição."""
+    order_repo = OrderRepository(session)
+    item_repo = OrderItemRepository(session)
+    await order_repo.get(order_id)
+    states = await item_repo.get_item_states(order_id, [update.item_id for update in updates])
+    if len(states) != len({update.item_id for update in updates}):
+        raise RuntimeError("Item não encontrado")
+    changes = await item_repo.apply_batch_update(updates, states, user_id)
+    await order_repo.apply_progress_delta(order_id, **item_repo.progress_delta(changes))
+    await session.commit()
+
+
+async def measure(url: str, sizes, runs: int):
+    """Mede os dois caminhos em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    statements = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        statements[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rows = []
+    try:
+        async with session_maker() as session:
+            user = User(name="Benchmark", pin_hash="-", pin_unique="-", pin_lookup="-", role=UserRole.SEPARATOR)
+            session.add(user)
+            await session.commit()
+            user_id = user.id
+
+        for size in sizes:
+            for name, apply in (("um a um", update_one_by_one), ("lote", update_batch)):
+                timings = []
+                for _ in range(runs):
+                    # Pedido novo a cada execução: todos os itens começam pendentes
+                    async with session_maker() as session:
+                        order = await OrderRepository(session).create_from_pdf_data(build_pdf_data(size))
+                        order_id, item_ids = order.id, [item.id for item in order.items]
+                    updates = build_updates(item_ids)
+                    async with session_maker() as session:
+                        statements[0] = 0
+                        start = time.perf_counter()
+                        await apply(session, order_id, updates, user_id)
+                        timings.append((time.perf_counter() - start) * 1000)
+                rows.append((size, name, statistics.median(timings), statements[0]))
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{'banco':>9} {'itens':>6} {'caminho':>8} {'tempo (ms)':>11} {'comandos':>9}")
+    for database, url in databases:
+        for size, name, elapsed, statements in await measure(url, args.sizes, args.runs):
+            print(f"{database:>9} {size:>6} {name:>8} {elapsed:11.2f} {statements:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 50, 500])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
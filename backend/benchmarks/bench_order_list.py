@@ -0,0 +1,148 @@
+"""
+Benchmark da listagem de pedidos: paginação por offset contra cursor.
+
+Popula a tabela de pedidos (1M por padrão) e mede
+OrderRepository.list_paginated em várias profundidades:
+
+    offset sem índice  OFFSET/LIMIT antes da migração (sem índice em created_at)
+    offset             OFFSET/LIMIT com o índice (created_at, id)
+    cursor             cursor da página anterior (WHERE (created_at, id) < ...)
+
+Mostra a mediana do tempo por página, em ms.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_list
+    python -m benchmarks.bench_order_list --orders 200000 --depths 0 1000 100000
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Order, OrderStatus
+from app.repositories.order import OrderRepository
+
+INDEXES = ("idx_orders_created_at_id", "idx_orders_status_created_at_id")
+
+
+async def populate(session: AsyncSession, orders: int, chunk: int = 50000) -> None:
+    """Insere `orders` pedidos; vários pedidos por segundo, para haver empates em created_at."""
+    start = datetime(2020, 1, 1)
+    for first in range(0, orders, chunk):
+        await session.execute(insert(Order), [
+            {
+                "order_number": str(number),
+                "client_name": "Cliente Benchmark",
+                "seller_name": "Vendedor Benchmark",
+                "order_date": start,
+                "total_value": 100.0,
+                "items_count": 0,
+                "status": OrderStatus.PENDING,
+                "created_at": start + timedelta(seconds=number // 3),
+            }
+            for number in range(first, min(first + chunk, orders))
+        ])
+        await session.commit()
+
+
+async def timed(coro_factory, runs: int) -> float:
+    """Mediana (ms) de `runs` execuções."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await coro_factory()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def measure(url: str, args):
+    """Mede as três variantes em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    rows = []
+    try:
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            await populate(session, args.orders)
+            if url.startswith("postgresql"):
+                await session.execute(text("ANALYZE orders"))
+            repository = OrderRepository(session)
+            depths = [depth for depth in args.depths if depth < args.orders]
+
+            results = {depth: {} for depth in depths}
+            for depth in depths:
+                # Cursor da página anterior (último pedido antes da profundidade)
+                cursor = None
+                if depth:
+                    previous = await repository.list_paginated(offset=depth - 1, limit=1)
+                    cursor = repository.encode_cursor(previous[0])
+                results[depth]["offset"] = await timed(
+                    lambda: repository.list_paginated(offset=depth, limit=args.per_page), args.runs
+                )
+                results[depth]["cursor"] = await timed(
+                    lambda: repository.list_paginated(limit=args.per_page, cursor=cursor), args.runs
+                )
+                session.expunge_all()
+
+            for index in INDEXES:
+                await session.execute(text(f"DROP INDEX {index}"))
+            await session.commit()
+            for depth in depths:
+                results[depth]["offset sem índice"] = await timed(
+                    lambda: repository.list_paginated(offset=depth, limit=args.per_page), args.runs
+                )
+                session.expunge_all()
+
+            for depth in depths:
+                rows.append((depth, results[depth]))
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{args.orders} pedidos, {args.per_page} por página (mediana de {args.runs}, ms)")
+    print(f"{'banco':>9} {'profundidade':>13} {'offset sem índice':>18} {'offset':>9} {'cursor':>9}")
+    for database, url in databases:
+        for depth, result in await measure(url, args):
+            print(
+                f"{database:>9} {depth:>13} {result['offset sem índice']:18.2f} "
+                f"{result['offset']:9.2f} {result['cursor']:9.2f}"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=1000000)
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--depths", type=int, nargs="+", default=[0, 1000, 100000, 500000, 999980])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
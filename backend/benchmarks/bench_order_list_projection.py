@@ -0,0 +1,186 @@
+"""
+Benchmark da listagem de pedidos: objetos com itens contra projeção.
+
+Cria pedidos com muitos itens (100 x 200 por padrão) e mede uma página
+da listagem de pedidos em três formas:
+
+    objetos    list_paginated: Order com selectinload dos itens (como antes)
+    projeção   list_summaries com as colunas da listagem (GET /orders)
+    fields     list_summaries com id, order_number e progresso
+               (GET /orders?fields=id,order_number,progress_percentage)
+
+Mostra a mediana do tempo (consulta + montagem da resposta), os comandos
+enviados ao banco e os objetos ORM montados por página.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_list_projection
+    python -m benchmarks.bench_order_list_projection --orders 100 --items 200 --runs 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Order, OrderItem, OrderStatus
+from app.repositories.order import OrderRepository
+from app.schemas.orders import OrderListItem
+
+
+async def populate(session: AsyncSession, orders: int, items: int) -> None:
+    """Insere `orders` pedidos com `items` itens cada."""
+    for number in range(orders):
+        order_id = (await session.execute(insert(Order).returning(Order.id), {
+            "order_number": str(100000 + number),
+            "client_name": "Cliente Benchmark",
+            "seller_name": "Vendedor Benchmark",
+            "order_date": datetime.now(),
+            "total_value": items * 10.0,
+            "items_count": items,
+            "items_separated": number % items,
+            "status": OrderStatus.PENDING,
+            "created_at": datetime.now(),
+        })).scalar_one()
+        await session.execute(insert(OrderItem), [
+            {
+                "order_id": order_id,
+                "product_code": str(10000 + index),
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 1,
+                "unit_price": 10.0,
+                "total_price": 10.0,
+            }
+            for index in range(items)
+        ])
+    await session.commit()
+
+
+async def list_objects(repository: OrderRepository, limit: int):
+    """Caminho anterior: objetos Order com itens."""
+    orders = await repository.list_paginated(limit=limit)
+    return [
+        OrderListItem(
+            id=order.id,
+            order_number=order.order_number,
+            client_name=order.client_name,
+            seller_name=order.seller_name,
+            total_value=order.total_value,
+            items_count=order.items_count,
+            progress_percentage=order.progress_percentage,
+            created_at=order.created_at
+        ) for order in orders
+    ]
+
+
+async def list_projection(repository: OrderRepository, limit: int):
+    """Caminho atual: só as colunas da listagem."""
+    rows = await repository.list_summaries(limit=limit)
+    return [
+        OrderListItem(
+            id=row.id,
+            order_number=row.order_number,
+            client_name=row.client_name,
+            seller_name=row.seller_name,
+            total_value=row.total_value,
+            items_count=row.items_count,
+            progress_percentage=Order.calculate_progress(row.items_count, row.items_separated, row.items_not_sent),
+            created_at=row.created_at
+        ) for row in rows
+    ]
+
+
+async def list_sparse(repository: OrderRepository, limit: int):
+    """Caminho atual com fields: só as colunas dos campos pedidos."""
+    rows = await repository.list_summaries(
+        limit=limit, columns=["order_number", "items_count", "items_separated", "items_not_sent"]
+    )
+    return [
+        OrderListItem(
+            id=row.id,
+            order_number=row.order_number,
+            progress_percentage=Order.calculate_progress(row.items_count, row.items_separated, row.items_not_sent)
+        ) for row in rows
+    ]
+
+
+async def measure(url: str, args):
+    """Mede as três formas em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    statements = [0]
+    objects = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        statements[0] += 1
+
+    @event.listens_for(Base, "load", propagate=True)
+    def count_object(*args):
+        objects[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rows = []
+    try:
+        async with session_maker() as session:
+            await populate(session, args.orders, args.items)
+
+        for name, list_page in (("objetos", list_objects), ("projeção", list_projection), ("fields", list_sparse)):
+            timings = []
+            for _ in range(args.runs):
+                # Sessão nova por requisição, como no endpoint
+                async with session_maker() as session:
+                    repository = OrderRepository(session)
+                    statements[0] = objects[0] = 0
+                    start = time.perf_counter()
+                    await list_page(repository, args.orders)
+                    timings.append((time.perf_counter() - start) * 1000)
+            rows.append((name, statistics.median(timings), statements[0], objects[0]))
+    finally:
+        event.remove(Base, "load", count_object)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{args.orders} pedidos por página, {args.items} itens por pedido (mediana de {args.runs})")
+    print(f"{'banco':>9} {'forma':>9} {'tempo (ms)':>11} {'comandos':>9} {'objetos ORM':>12}")
+    for database, url in databases:
+        for name, elapsed, statements, objects in await measure(url, args):
+            print(f"{database:>9} {name:>9} {elapsed:11.2f} {statements:>9} {objects:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--orders", type=int, default=100)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark da atualização dos contadores de progresso por clique.
+
+Para pedidos de 10, 200 e 2.000 itens, mede a atualização dos contadores
+depois de separar um item:
+
+    itens     caminho anterior: carrega o pedido com todos os itens
+              (selectinload) e reconta em Python
+    recontagem  update_progress: recontagem em um UPDATE no banco
+    variação  apply_progress_delta: UPDATE orders SET contador = contador + d
+
+Mostra a mediana do tempo e o número de comandos enviados ao banco.
+
+Roda no SQLite em memória e, com --postgres-url, também no Postgres
+(o banco precisa existir; as tabelas são criadas e removidas).
+
+Uso:
+    python -m benchmarks.bench_order_progress
+    python -m benchmarks.bench_order_progress --sizes 10 2000 --runs 20
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import statistics
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Order, OrderItem, OrderStatus
+from app.repositories.order import OrderRepository
+from app.schemas.pdf import PDFExtractedData
+
+_order_numbers = itertools.count(100000)
+
+
+def build_pdf_data(items: int) -> PDFExtractedData:
+    """Pedido com `items` itens e número único."""
+    return PDFExtractedData(
+        order_number=str(next(_order_numbers)),
+        client_name="Cliente Benchmark",
+        seller_name="Vendedor Benchmark",
+        order_date=datetime.now(),
+        total_value=items * 10.0,
+        items=[
+            {
+                "product_code": str(10000 + index),
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 1,
+                "unit_price": 10.0,
+                "total_price": 10.0,
+            }
+            for index in range(items)
+        ]
+    )
+
+
+async def recount_items(repository: OrderRepository, order_id: int) -> None:
+    """Caminho anterior: pedido com todos os itens, contagem em Python."""
+    order = await repository.get_with_items(order_id)
+    order.items_separated = sum(1 for item in order.items if item.is_separated)
+    order.items_in_purchase = sum(1 for item in order.items if item.sent_to_purchase)
+    order.items_not_sent = sum(1 for item in order.items if item.not_sent)
+    if order.items_separated + order.items_not_sent == order.items_count:
+        order.status = OrderStatus.COMPLETED
+        order.completed_at = datetime.utcnow()
+    else:
+        order.status = OrderStatus.IN_PROGRESS
+    await repository.session.flush()
+
+
+async def recount_sql(repository: OrderRepository, order_id: int) -> None:
+    """Recontagem completa no banco."""
+    await repository.update_progress(order_id)
+
+
+async def delta(repository: OrderRepository, order_id: int) -> None:
+    """Caminho atual: variação dos contadores."""
+    await repository.apply_progress_delta(order_id, separated=1)
+
+
+async def measure(url: str, sizes, runs: int):
+    """Mede os três caminhos em um banco; devolve linhas da tabela."""
+    engine = create_async_engine(url)
+    statements = [0]
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def count_statement(*args):
+        statements[0] += 1
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    session_maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    rows = []
+    try:
+        for size in sizes:
+            async with session_maker() as session:
+                order = await OrderRepository(session).create_from_pdf_data(build_pdf_data(size))
+                order_id, item_ids = order.id, [item.id for item in order.items]
+
+            for name, update_counters in (("itens", recount_items), ("recontagem", recount_sql), ("variação", delta)):
+                timings = []
+                for run in range(runs):
+                    # Um clique: separa um item e atualiza os contadores na mesma transação
+                    async with session_maker() as session:
+                        statements[0] = 0
+                        start = time.perf_counter()
+                        await session.execute(
+                            update(OrderItem)
+                            .where(OrderItem.id == item_ids[run % size])
+                            .values(is_separated=True)
+                        )
+                        await update_counters(OrderRepository(session), order_id)
+                        await session.commit()
+                        timings.append((time.perf_counter() - start) * 1000)
+                rows.append((size, name, statistics.median(timings), statements[0]))
+
+                # Volta os itens e os contadores ao estado inicial
+                async with session_maker() as session:
+                    await session.execute(update(OrderItem).values(is_separated=False))
+                    await session.execute(
+                        update(Order).values(items_separated=0, status=OrderStatus.PENDING, completed_at=None)
+                    )
+                    await session.commit()
+    finally:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+    return rows
+
+
+async def run(args):
+    databases = [("sqlite", "sqlite+aiosqlite:///:memory:")]
+    if args.postgres_url:
+        databases.append(("postgres", args.postgres_url))
+
+    print(f"{'banco':>9} {'itens':>6} {'caminho':>11} {'tempo (ms)':>11} {'comandos':>9}")
+    for database, url in databases:
+        for size, name, elapsed, statements in await measure(url, args.sizes, args.runs):
+            print(f"{database:>9} {size:>6} {name:>11} {elapsed:11.2f} {statements:>9}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 200, 2000])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--postgres-url", default=os.environ.get("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
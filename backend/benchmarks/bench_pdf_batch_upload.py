@@ -0,0 +1,103 @@
+"""
+Benchmark de vazão do upload em lote contra uploads sequenciais.
+
+Gera N orçamentos sintéticos distintos e mede o tempo de parede de:
+
+    sequencial  um upload por vez, como em /orders/upload seguido da
+                verificação do pedido existente em /orders/confirm
+                (parsing + uma consulta por arquivo)
+    lote        PDFBatchUploadService.preview com todos os arquivos
+                (parsing concorrente no pool + uma consulta para o lote)
+
+O cache de parsing é desativado para que todo arquivo seja processado. O
+ganho depende das CPUs disponíveis (mostradas no cabeçalho).
+
+Uso:
+    python -m benchmarks.bench_pdf_batch_upload
+    python -m benchmarks.bench_pdf_batch_upload --files 50 --workers 4 --pages 2
+"""
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.repositories.order import OrderRepository
+from app.services.pdf_batch_upload import PDFBatchUploadService
+from app.services.pdf_import_jobs import build_pdf_preview
+from app.services.pdf_parse_cache import PDFParseCache
+from app.services.pdf_parser_pool import PDFParserPool
+from app.services.pdf_preview_store import PDFPreviewStore
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+PREVIEWS = PDFPreviewStore()
+
+
+async def sequential(files, pool: PDFParserPool, repository: OrderRepository) -> float:
+    """Tempo (s) de um upload por vez."""
+    start = time.perf_counter()
+    for _, content in files:
+        preview = build_pdf_preview(await pool.parse_bytes(content))
+        await PREVIEWS.put(preview.data, user_id=1)
+        await repository.get_by_order_number(preview.data.order_number)
+    return time.perf_counter() - start
+
+
+async def batch(files, pool: PDFParserPool, repository: OrderRepository) -> float:
+    """Tempo (s) de um upload em lote."""
+    service = PDFBatchUploadService(pool=pool, cache=PDFParseCache(max_entries=0), previews=PREVIEWS)
+    start = time.perf_counter()
+    response = await service.preview(files, repository, user_id=1)
+    elapsed = time.perf_counter() - start
+    if response.parsed != len(files):
+        raise RuntimeError(f"{response.parsed} de {len(files)} arquivos processados")
+    return elapsed
+
+
+async def run(args):
+    files = [
+        (f"orcamento-{number}.pdf", build_quote_pdf(args.pages, args.items_per_page, str(30000 + number)))
+        for number in range(args.files)
+    ]
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    pool = PDFParserPool(max_workers=args.workers, timeout=3600)
+    try:
+        await pool.warm_up()
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+            repository = OrderRepository(session)
+            sequential_s = await sequential(files, pool, repository)
+            batch_s = await batch(files, pool, repository)
+    finally:
+        pool.shutdown()
+        await engine.dispose()
+
+    print(f"CPUs disponíveis: {len(os.sched_getaffinity(0))}, workers: {args.workers}")
+    print(f"{'modo':>11} {'arquivos':>9} {'tempo (s)':>10} {'arquivos/s':>11}")
+    for mode, elapsed in (("sequencial", sequential_s), ("lote", batch_s)):
+        print(f"{mode:>11} {args.files:>9} {elapsed:10.2f} {args.files / elapsed:11.1f}")
+    print(f"speedup: {sequential_s / batch_s:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--items-per-page", type=int, default=40)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
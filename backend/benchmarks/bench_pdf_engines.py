@@ -0,0 +1,89 @@
+"""
+Benchmark dos engines de extração de texto e da seleção adaptativa.
+
+Para cada PDF, mede o tempo de extração de cada engine isolado e se o
+resultado passa na verificação de qualidade do parser. Em seguida processa
+o conjunto várias vezes com um único PDFParser (seleção adaptativa) e
+mostra o tempo médio por documento e as estatísticas de cada engine.
+
+Uso:
+    python -m benchmarks.bench_pdf_engines
+    python -m benchmarks.bench_pdf_engines --pdf orcamento.pdf --rounds 20
+"""
+import argparse
+import glob
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_parser import PDFParser, PDFParseError
+from app.services.pdf_text_engines import DEFAULT_ENGINE_ORDER
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+def load_documents(paths):
+    """PDFs informados (ou os da raiz do backend) e um orçamento sintético."""
+    documents = [(os.path.basename(path), open(path, "rb").read())
+                 for path in paths or sorted(glob.glob("*.pdf"))]
+    documents.append(("sintetico-20p", build_quote_pdf(pages=20)))
+    return documents
+
+
+def measure_engine(engine: str, content: bytes, runs: int):
+    """Mediana do tempo (ms) e resultado da verificação de qualidade."""
+    parser = PDFParser(engines=[engine])
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            parser.extract_bytes(content)
+        except PDFParseError:
+            return None, "erro"
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), parser.last_attempts[0].outcome
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pdf", nargs="*", default=None)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    documents = load_documents(args.pdf)
+
+    print(f"{'documento':>24} {'engine':>10} {'tempo (ms)':>11} {'resultado':>10}")
+    for name, content in documents:
+        for engine in DEFAULT_ENGINE_ORDER:
+            elapsed, outcome = measure_engine(engine, content, args.runs)
+            shown = f"{elapsed:11.1f}" if elapsed is not None else f"{'-':>11}"
+            print(f"{name:>24} {engine:>10} {shown} {outcome:>10}")
+
+    adaptive = PDFParser()
+    reference = PDFParser(engines=["pdfplumber"])
+    timings = {"adaptativo": [], "pdfplumber": []}
+    for _ in range(args.rounds):
+        for _, content in documents:
+            for label, current in (("adaptativo", adaptive), ("pdfplumber", reference)):
+                start = time.perf_counter()
+                current.extract_bytes(content)
+                timings[label].append((time.perf_counter() - start) * 1000)
+
+    print()
+    for label, values in timings.items():
+        print(f"{label:>12}: {statistics.mean(values):8.1f} ms/documento")
+    print()
+    print(f"{'engine':>10} {'tentativas':>10} {'aceitos':>8} {'usados':>7} "
+          f"{'pulados':>8} {'acerto':>7} {'média (ms)':>11}")
+    for engine, metrics in adaptive.engine_stats.get_metrics().items():
+        print(f"{engine:>10} {metrics['attempts']:>10} {metrics['accepted']:>8} "
+              f"{metrics['selected']:>7} {metrics['skipped']:>8} "
+              f"{metrics['hit_rate']:7.2f} {metrics['avg_ms']:11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark de latência da ingestão do PDF: arquivo temporário vs memória.
+
+Compara o caminho antigo do upload (grava NamedTemporaryFile, fsync,
+extract pelo caminho, unlink) com o caminho em memória (extract_bytes)
+para cada PDF de fixture.
+
+Uso:
+    python -m benchmarks.bench_pdf_ingestion
+    python -m benchmarks.bench_pdf_ingestion --runs 50
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_parser import PDFParser
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "pdfs"
+PDF_FILES = ["sample_order.pdf", "multipage.pdf"]
+
+
+def write_temp_file(content: bytes) -> Path:
+    """Grava o upload em um arquivo temporário, como o endpoint fazia."""
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+        temp_file.write(content)
+        temp_file.flush()
+        os.fsync(temp_file.fileno())
+        return Path(temp_file.name)
+
+
+def via_temp_file(parser: PDFParser, content: bytes):
+    """Caminho antigo: grava o upload em disco e reabre pelo caminho."""
+    temp_path = write_temp_file(content)
+    try:
+        return parser.extract(temp_path)
+    finally:
+        temp_path.unlink()
+
+
+def temp_file_io_only(parser: PDFParser, content: bytes):
+    """Apenas o custo de E/S do caminho antigo, sem parsing."""
+    temp_path = write_temp_file(content)
+    temp_path.read_bytes()
+    temp_path.unlink()
+
+
+def in_memory(parser: PDFParser, content: bytes):
+    """Caminho novo: um único buffer em memória."""
+    return parser.extract_bytes(content)
+
+
+def measure(func, parser: PDFParser, content: bytes, runs: int):
+    """Mede a latência (ms) de cada execução."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(parser, content)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=30)
+    args = parser.parse_args()
+
+    pdf_parser = PDFParser()
+    print(f"{'arquivo':>18} {'modo':>14} {'p50 (ms)':>10} {'p95 (ms)':>10}")
+    for name in PDF_FILES:
+        content = (FIXTURES / name).read_bytes()
+        in_memory(pdf_parser, content)  # Aquecimento
+        modes = (
+            ("arquivo temp.", via_temp_file),
+            ("memória", in_memory),
+            ("só E/S temp.", temp_file_io_only),
+        )
+        for mode, func in modes:
+            timings = sorted(measure(func, pdf_parser, content, args.runs))
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            print(f"{name:>18} {mode:>14} {statistics.median(timings):10.2f} {p95:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
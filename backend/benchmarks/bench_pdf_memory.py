@@ -0,0 +1,95 @@
+"""
+Benchmark de memória do parsing de PDFs longos: texto completo vs página a página.
+
+Gera orçamentos sintéticos com N páginas e mede o pico de RSS de cada
+parsing em um processo novo. O modo anterior mantém o layout de todas as
+páginas em cache do pdfplumber até o fim e concatena o texto; o modo atual
+(PDFParser.extract_bytes) processa e libera uma página por vez.
+
+Uso:
+    python -m benchmarks.bench_pdf_memory
+    python -m benchmarks.bench_pdf_memory --pages 10 50 200 --legacy-max-pages 100
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import time
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+import pdfplumber
+
+from app.services.pdf_parser import PDFParser
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+def legacy_extract(parser: PDFParser, content: bytes):
+    """Extração anterior: todas as páginas em cache e texto concatenado."""
+    with pdfplumber.open(BytesIO(content)) as pdf:
+        text = ""
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text += page_text + "\n"
+        return parser.extract_from_pages([text])
+
+
+def streaming_extract(parser: PDFParser, content: bytes):
+    """Extração atual, página a página."""
+    return parser.extract_bytes(content)
+
+
+MODES = {
+    "anterior": legacy_extract,
+    "streaming": streaming_extract,
+}
+
+
+def _max_rss_mb() -> float:
+    """Pico de RSS do processo atual em MB (ru_maxrss em KB no Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def measure_in_child(mode: str, pages: int, items_per_page: int):
+    """Executa um parsing no processo worker e devolve RSS e tempo."""
+    content = build_quote_pdf(pages, items_per_page)
+    parser = PDFParser()
+    before = _max_rss_mb()
+    start = time.perf_counter()
+    data = MODES[mode](parser, content)
+    elapsed = time.perf_counter() - start
+    return before, _max_rss_mb(), elapsed, len(data["items"])
+
+
+def measure(mode: str, pages: int, items_per_page: int):
+    """Mede em um processo novo, para que o pico de RSS seja só deste parsing."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(measure_in_child, mode, pages, items_per_page).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--items-per-page", type=int, default=40)
+    parser.add_argument("--legacy-max-pages", type=int, default=50,
+                        help="maior documento medido no modo anterior (memória cresce ~5 MB/página)")
+    args = parser.parse_args()
+
+    print(f"{'páginas':>8} {'modo':>10} {'itens':>6} {'RSS base (MB)':>14} "
+          f"{'pico RSS (MB)':>14} {'tempo (s)':>10}")
+    for pages in args.pages:
+        for mode in MODES:
+            if mode == "anterior" and pages > args.legacy_max_pages:
+                continue
+            before, peak, elapsed, items = measure(mode, pages, args.items_per_page)
+            print(f"{pages:>8} {mode:>10} {items:>6} {before:14.1f} {peak:14.1f} {elapsed:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de speedup da extração paralela por intervalos de páginas.
+
+Mede o tempo de parede de PDFParserPool.parse_bytes em orçamentos
+sintéticos de 20, 100 e 500 páginas com 1 a 8 workers. Com 1 worker o
+documento é processado sequencialmente (referência do speedup); com mais
+workers as páginas são divididas em um intervalo por worker. O speedup
+real é limitado pelo número de CPUs disponíveis (mostrado no cabeçalho).
+
+Uso:
+    python -m benchmarks.bench_pdf_parallel
+    python -m benchmarks.bench_pdf_parallel --pages 20 100 --workers 1 2 4 --runs 3
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_parser_pool import PDFParserPool
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+async def measure(content: bytes, workers: int, runs: int) -> float:
+    """Mediana do tempo de parede (s) com o pool aquecido."""
+    pool = PDFParserPool(max_workers=workers, timeout=3600, parallel_min_pages=1)
+    try:
+        await pool.warm_up()
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            await pool.parse_bytes(content)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+    finally:
+        pool.shutdown()
+
+
+async def run(args):
+    print(f"CPUs disponíveis: {len(os.sched_getaffinity(0))}")
+    print(f"{'páginas':>8} {'workers':>8} {'tempo (s)':>10} {'speedup':>8}")
+    for pages in args.pages:
+        content = build_quote_pdf(pages, args.items_per_page)
+        baseline = None
+        for workers in args.workers:
+            elapsed = await measure(content, workers, args.runs)
+            baseline = baseline or elapsed
+            print(f"{pages:>8} {workers:>8} {elapsed:10.2f} {baseline / elapsed:7.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--pages", type=int, nargs="+", default=[20, 100, 500])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--items-per-page", type=int, default=40)
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
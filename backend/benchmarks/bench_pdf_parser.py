@@ -0,0 +1,218 @@
+"""
+Benchmark por etapa do PDFParser em orçamentos sintéticos, com comparação contra baseline.
+
+Gera orçamentos no layout da PMCELL (1 a 2.000 itens, 1 a 100 páginas,
+parte deles com os resíduos `/<<UN` e `</<` no marcador de unidade) e mede
+a mediana de cada etapa do parser:
+
+    extract.<engine>  texto das páginas com cada engine de extração
+    normalize         _normalize_text
+    clean             _clean_extracted_text
+    items             _extract_items (cascata de variantes)
+    metadata          _extract_metadata
+    quality           _passes_quality_check (conferência de valores)
+    total             extract_bytes de ponta a ponta (seleção adaptativa)
+
+Os resultados podem ser gravados em JSON (--output) e comparados com um
+resultado anterior (--baseline): uma etapa é regressão quando fica mais
+de --threshold mais lenta e a diferença passa de --min-delta-ms. Com
+regressões o processo termina com código 1.
+
+Uso:
+    python -m benchmarks.bench_pdf_parser
+    python -m benchmarks.bench_pdf_parser --output resultado.json
+    python -m benchmarks.bench_pdf_parser --baseline benchmarks/baselines/pdf_parser.json
+    python -m benchmarks.bench_pdf_parser --scenarios small large --runs 5
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from io import BytesIO
+from typing import Any, Callable, Dict, List, NamedTuple
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_parser import PDFParser
+from app.services.pdf_text_engines import DEFAULT_ENGINE_ORDER, PDFPLUMBER, get_engine
+from benchmarks.synthetic_quote import build_pdf, distributed_quote_lines
+
+
+class Scenario(NamedTuple):
+    """Orçamento sintético medido."""
+
+    name: str
+    items: int
+    pages: int
+    artifact_every: int
+
+
+SCENARIOS = [
+    Scenario("tiny", 1, 1, 0),
+    Scenario("small", 40, 1, 0),
+    Scenario("medium", 200, 5, 10),
+    Scenario("large", 1000, 25, 10),
+    Scenario("huge", 2000, 100, 5),
+]
+
+
+def _median_ms(function: Callable[[], Any], runs: int) -> float:
+    """Mediana do tempo de execução em milissegundos."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure_scenario(scenario: Scenario, runs: int) -> Dict[str, float]:
+    """
+    Mede as etapas do parser em um orçamento sintético.
+
+    Returns:
+        Dict[str, float]: Mediana (ms) de cada etapa
+    """
+    content = build_pdf(distributed_quote_lines(
+        scenario.items, scenario.pages, artifact_every=scenario.artifact_every
+    ))
+    parser = PDFParser()
+    timings = {}
+
+    for engine in DEFAULT_ENGINE_ORDER:
+        timings[f"extract.{engine}"] = _median_ms(
+            lambda: list(get_engine(engine).iter_pages(BytesIO(content))), runs
+        )
+
+    text = "".join(get_engine(PDFPLUMBER).iter_pages(BytesIO(content)))
+    normalized = parser._normalize_text(text)
+    cleaned = parser._clean_extracted_text(normalized)
+    items = parser._extract_items(cleaned)
+    if len(items) != scenario.items:
+        raise RuntimeError(f"{scenario.name}: {len(items)} itens extraídos, {scenario.items} esperados")
+
+    timings["normalize"] = _median_ms(lambda: parser._normalize_text(text), runs)
+    timings["clean"] = _median_ms(lambda: parser._clean_extracted_text(normalized), runs)
+    timings["items"] = _median_ms(lambda: parser._extract_items(cleaned), runs)
+    timings["metadata"] = _median_ms(lambda: parser._extract_metadata(text), runs)
+    data = parser._build_data(text, items)
+    timings["quality"] = _median_ms(lambda: parser._passes_quality_check(text, data), runs)
+    # Parser novo a cada execução: mede a escolha de engine sem histórico
+    timings["total"] = _median_ms(lambda: PDFParser().extract_bytes(content), runs)
+    return {stage: round(value, 3) for stage, value in timings.items()}
+
+
+def run_benchmark(scenarios: List[Scenario], runs: int) -> Dict[str, Any]:
+    """Mede todos os cenários e monta o resultado em formato JSON."""
+    results = {}
+    for scenario in scenarios:
+        results[scenario.name] = {
+            "items": scenario.items,
+            "pages": scenario.pages,
+            "artifact_every": scenario.artifact_every,
+            "stages_ms": measure_scenario(scenario, runs),
+        }
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "parser_version": PDFParser.PARSER_VERSION,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": len(os.sched_getaffinity(0)),
+            "runs": runs,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_delta_ms: float):
+    """
+    Compara cada etapa com a baseline.
+
+    Args:
+        current: Resultado atual
+        baseline: Resultado de referência
+        threshold: Aumento relativo tolerado (0.25 = 25%)
+        min_delta_ms: Diferença absoluta mínima para contar como regressão
+
+    Returns:
+        List[Dict]: Uma linha por etapa presente nos dois resultados
+    """
+    rows = []
+    for name, scenario in current["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(name)
+        if reference is None:
+            continue
+        for stage, value in scenario["stages_ms"].items():
+            before = reference["stages_ms"].get(stage)
+            if before is None:
+                continue
+            ratio = value / before if before else float("inf")
+            rows.append({
+                "scenario": name,
+                "stage": stage,
+                "baseline_ms": before,
+                "current_ms": value,
+                "ratio": ratio,
+                "regression": ratio > 1 + threshold and value - before > min_delta_ms,
+            })
+    return rows
+
+
+def print_results(result: Dict[str, Any]) -> None:
+    """Tabela com as etapas de cada cenário."""
+    print(f"{'cenário':>8} {'itens':>6} {'págs':>5} {'etapa':>20} {'tempo (ms)':>11}")
+    for name, scenario in result["scenarios"].items():
+        for stage, value in scenario["stages_ms"].items():
+            print(f"{name:>8} {scenario['items']:>6} {scenario['pages']:>5} {stage:>20} {value:11.2f}")
+
+
+def print_comparison(rows) -> None:
+    """Tabela com a variação de cada etapa em relação à baseline."""
+    print(f"{'cenário':>8} {'etapa':>20} {'baseline':>10} {'atual':>10} {'razão':>7}")
+    for row in rows:
+        flag = "  REGRESSÃO" if row["regression"] else ""
+        print(f"{row['scenario']:>8} {row['stage']:>20} {row['baseline_ms']:10.2f} "
+              f"{row['current_ms']:10.2f} {row['ratio']:6.2f}x{flag}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scenarios", nargs="+", choices=[scenario.name for scenario in SCENARIOS],
+                        default=[scenario.name for scenario in SCENARIOS])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", help="grava o resultado em JSON")
+    parser.add_argument("--baseline", help="JSON de referência para detectar regressões")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    scenarios = [scenario for scenario in SCENARIOS if scenario.name in args.scenarios]
+    result = run_benchmark(scenarios, args.runs)
+    print_results(result)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(result, output, indent=2)
+            output.write("\n")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        rows = compare(result, baseline, args.threshold, args.min_delta_ms)
+        print()
+        print_comparison(rows)
+        regressions = [row for row in rows if row["regression"]]
+        if regressions:
+            print(f"\n{len(regressions)} etapa(s) mais lenta(s) que a baseline")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Benchmark de vazão do pool de processos do parser de PDF.
+
+Envia N jobs concorrentes com os PDFs de fixture e mede PDFs por segundo
+para diferentes quantidades de workers, comparando com o parsing inline.
+
+Uso:
+    python -m benchmarks.bench_pdf_pool
+    python -m benchmarks.bench_pdf_pool --jobs 200 --workers 1 4 8
+"""
+import argparse
+import asyncio
+import os
+import time
+from pathlib import Path
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_parser import PDFParser
+from app.services.pdf_parser_pool import PDFParserPool
+
+FIXTURES = Path(__file__).parent.parent / "tests" / "fixtures" / "pdfs"
+PDF_FILES = [FIXTURES / "sample_order.pdf", FIXTURES / "multipage.pdf"]
+
+
+def run_inline(jobs: int) -> float:
+    """Parsing sequencial no processo atual (comportamento antigo)."""
+    parser = PDFParser()
+    start = time.perf_counter()
+    for i in range(jobs):
+        parser.extract(PDF_FILES[i % len(PDF_FILES)])
+    return time.perf_counter() - start
+
+
+async def run_pool(workers: int, jobs: int) -> float:
+    """Parsing concorrente no pool com `workers` processos."""
+    pool = PDFParserPool(max_workers=workers, timeout=120)
+    await pool.warm_up()
+    start = time.perf_counter()
+    await asyncio.gather(*(pool.parse(PDF_FILES[i % len(PDF_FILES)]) for i in range(jobs)))
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    return elapsed
+
+
+async def run(jobs: int, worker_counts):
+    print(f"{jobs} PDFs, CPUs disponíveis: {os.cpu_count()}")
+    print(f"{'modo':>10} {'tempo (s)':>10} {'PDFs/s':>10}")
+    elapsed = run_inline(jobs)
+    print(f"{'inline':>10} {elapsed:10.2f} {jobs / elapsed:10.1f}")
+    for workers in worker_counts:
+        elapsed = await run_pool(workers, jobs)
+        print(f"{f'{workers} proc':>10} {elapsed:10.2f} {jobs / elapsed:10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = parser.parse_args()
+    asyncio.run(run(args.jobs, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Micro-benchmark da limpeza de texto do parser (_clean_extracted_text).
+
+Compara o classificador de linhas pré-compilado com a implementação
+anterior, que montava listas de padrões e chamava re.search linha a linha.
+Os textos são sintéticos, no formato dos orçamentos, com N linhas.
+
+Uso:
+    python -m benchmarks.bench_text_cleaning
+    python -m benchmarks.bench_text_cleaning --lines 5000 --runs 20
+"""
+import argparse
+import os
+import random
+import re
+import statistics
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("DEBUG", "False")
+
+from app.services.pdf_parser import PDFParser
+
+HEADER = [
+    "PMCELL São Paulo",
+    "V. Zabin Tecnologia e Comércio Eireli",
+    "CNPJ: 29734462000133 I.E: 138848726110",
+    "Rua Comendador Abdo Schahin, 62 - Loja 4",
+    "Orçamento Nº: {order}",
+    "Código: 1234 Data: 05/08/25",
+    "Cliente: CLIENTE TESTE LTDA Forma de Pagto: PIX",
+    "Vendedor: VENDEDOR TESTE Validade do Orçamento: 7 dia(s)",
+    "Código Produto Unid. Quant. Valor Total",
+]
+
+
+def _debug(*args, **kwargs):
+    """Substitui o logger.debug da implementação anterior."""
+
+
+def generate_text(lines: int, seed: int = 42) -> str:
+    """
+    Gera um texto sintético de orçamento com aproximadamente N linhas.
+
+    Inclui cabeçalhos repetidos a cada página, itens em uma linha e itens
+    com a descrição quebrada em várias linhas.
+    """
+    rnd = random.Random(seed)
+    out = [line.format(order=rnd.randint(10000, 99999)) for line in HEADER]
+    page = 1
+    while len(out) < lines:
+        code = rnd.randint(10000, 99999)
+        qty = rnd.randint(1, 50)
+        price = rnd.randint(100, 99999) / 100
+        values = f"/ UN / {qty} / {price:.2f} / {qty * price:.2f}".replace(".", ",")
+        if rnd.random() < 0.3:
+            out.append(f"{code} / REF{code} --> CAPA SILICONE")
+            out.append("MODELO COM DESCRIÇÃO LONGA")
+            out.append(values)
+        else:
+            out.append(f"{code} / REF{code} --> PELICULA 3D {values}")
+        if len(out) % 40 == 0:
+            page += 1
+            out.append(f"Página {page}")
+            out.append(HEADER[0])
+            out.append(HEADER[-1])
+    out.append("VALOR TOTAL R$ 12.345,67")
+    out.append("VALOR A PAGAR R$ 12.345,67")
+    return "\n".join(out[:lines])
+
+
+def legacy_clean_extracted_text(text: str) -> str:
+    """
+    Implementação anterior de PDFParser._clean_extracted_text (referência).
+    """
+    lines = text.split('\n')
+    cleaned_lines = []
+    current_item = ""
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        # Padrões para ignorar (cabeçalhos, metadados, formatação)
+        # IMPORTANTE: Não remover linhas com dados essenciais (Orçamento Nº, Cliente, Vendedor, etc.)
+        skip_patterns = [
+            r'^PMCELL\s+São\s+Paulo',             # Cabeçalho da empresa
+            r'^V\.\s+Zabin\s+Tecnologia',         # Nome da empresa
+            r'^CNPJ:\s*\d+',                      # CNPJ
+            r'^I\.E:\s*\d+',                      # Inscrição estadual
+            r'^Rua\s+Comendador',                 # Endereço
+            r'^Condição\s+de\s+Pagto',            # Condição de pagamento
+            r'^Forma\s+de\s+Pagto',               # Forma de pagamento
+            r'^Validade\s+do\s+Orçamento',        # Validade
+            r'^Código\s+Produto\s+Unid',          # Cabeçalho da tabela
+            r'^\s*\d+\s+dia\(s\)\s*$',           # Linha isolada com dias
+            r'^\d{1,2}\s+dia\(s\)\s*$',          # Variação da linha de dias
+            r'^\s*\d+\s*-\s*\d+\s+dia\(s\)',     # Padrão como "25 - 0 dia(s)"
+            r'^Página\s+\d+\s*$',                 # Marcadores de página
+            r'^Orçamento\s*N[ºo°]?:?\s*\d+',      # Linha de orçamento (conflita com extração)
+            r'^Código:\s*\d+.*Data:',             # Linha com código e data
+            r'^Cliente:\s*[\d\.].*Forma\s*de',     # Linha de cliente completa
+            r'^Vendedor:.*Validade',              # Linha de vendedor completa
+        ]
+
+        should_skip = False
+        for pattern in skip_patterns:
+            if re.search(pattern, line, re.IGNORECASE):
+                should_skip = True
+                break
+
+        if should_skip:
+            continue
+
+        # Se a linha começa com código de 5 dígitos seguido de /, é início de item
+        if re.match(r'^\d{5}\s*/', line):
+            # Finaliza item anterior se existir
+            if current_item and legacy_is_valid_item_line(current_item):
+                cleaned_lines.append(current_item)
+                _debug(f"Added completed item: {current_item[:50]}...")
+            elif current_item:
+                _debug(f"Discarded invalid item: {current_item[:50]}...")
+            current_item = line
+            _debug(f"Started new item: {line[:50]}...")
+        elif current_item:
+            # Verifica se é continuação válida de item
+            if (re.search(r'/\s*UN\s*/', line) or
+                re.search(r'/\s*\d+\s*/\s*[\d,\.]+\s*/\s*[\d,\.]+', line)):
+                current_item += " " + line
+            elif not re.match(r'^\d{5}', line):
+                # Verifica se não é um artefato antes de adicionar à descrição
+                # Não adicionar marcadores de página, cabeçalhos, etc.
+                artifact_patterns = [
+                    r'^Página\s+\d+\s*$',                 # Marcadores de página
+                    r'^PMCELL\s+São\s+Paulo',             # Cabeçalho da empresa
+                    r'^V\.\s+Zabin\s+Tecnologia',         # Nome da empresa
+                    r'^CNPJ:\s*\d+',                      # CNPJ
+                    r'^I\.E:\s*\d+',                      # Inscrição estadual
+                    r'^Rua\s+Comendador',                 # Endereço
+                    r'^Código\s+Produto\s+Unid',          # Cabeçalho da tabela
+                    r'^\s*\d+\s+dia\(s\)\s*$',           # Linha isolada com dias
+                    r'^Orçamento\s*N[ºo°]?:?\s*\d+',      # Linha de orçamento
+                    r'^Código:\s*\d+.*Data:',             # Linha com código e data
+                    r'^Cliente:\s*[\d\.].*Forma\s*de',     # Linha de cliente completa
+                    r'^Vendedor:.*Validade',              # Linha de vendedor completa
+                ]
+
+                is_artifact = any(re.search(pattern, line, re.IGNORECASE)
+                                for pattern in artifact_patterns)
+
+                if not is_artifact:
+                    # Possível continuação de item (descrição quebrada)
+                    current_item += " " + line
+                else:
+                    # É um artefato - finalizar item atual se válido
+                    if legacy_is_valid_item_line(current_item):
+                        cleaned_lines.append(current_item)
+                        _debug(f"Added item before artifact: {current_item[:50]}...")
+                    elif current_item:
+                        _debug(f"Discarded invalid item before artifact: {current_item[:50]}...")
+                    current_item = ""
+        else:
+            # Linha independente que pode ser item completo ou metadados
+            if legacy_is_valid_item_line(line):
+                cleaned_lines.append(line)
+            else:
+                # Preserva linhas importantes: metadados e informações de valores
+                important_patterns = [
+                    r'Orçamento\s*N[ºo°]?:?\s*\d+',      # Número do orçamento
+                    r'Cliente:\s*',                       # Cliente
+                    r'Vendedor:\s*',                      # Vendedor
+                    r'Data:\s*\d{2}/\d{2}/\d{2}',        # Data
+                    r'VALOR\s+TOTAL\s*R\$',              # Valor total
+                    r'VALOR\s+A\s+PAGAR',                # Valor a pagar
+                    r'DESCONTO\s*R\$',                   # Desconto
+                ]
+
+                is_important = any(re.search(pattern, line, re.IGNORECASE)
+                                 for pattern in important_patterns)
+
+                if is_important:
+                    cleaned_lines.append(line)
+
+    # Adiciona último item se válido
+    if current_item and legacy_is_valid_item_line(current_item):
+        cleaned_lines.append(current_item)
+        _debug(f"Added final item: {current_item[:50]}...")
+    elif current_item:
+        _debug(f"Discarded final invalid item: {current_item[:50]}...")
+
+    # Debug: Log quantos itens foram encontrados
+    item_count = sum(1 for line in cleaned_lines if legacy_is_valid_item_line(line))
+    _debug(f"Text cleaning found {item_count} valid item lines")
+
+    return '\n'.join(cleaned_lines)
+
+def legacy_is_valid_item_line(line: str) -> bool:
+    """
+    Implementação anterior de PDFParser._is_valid_item_line (referência).
+    """
+    if not line or not line.strip():
+        return False
+
+    # Deve ter estrutura básica de item: código + referência + UN + preços
+    has_code = re.search(r'^\d{3,5}\s*/', line)
+    has_unit = re.search(r'/\s*UN\s*/', line)
+    has_prices = len(re.findall(r'[\d,\.]+', line)) >= 3  # quantidade + 2 preços mínimo
+
+    # Não deve conter artefatos de cabeçalho
+    has_artifacts = (
+        'Código Produto Unid' in line or
+        'Quant. Valor Total' in line or
+        'dia(s)' in line or
+        len(line.split()) < 4  # Muito poucos campos
+    )
+
+    return has_code and has_unit and has_prices and not has_artifacts
+
+
+def measure(func, text: str, runs: int):
+    """Mede a latência (ms) de cada execução."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func(text)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    pdf_parser = PDFParser()
+    text = pdf_parser._normalize_text(generate_text(args.lines))
+    assert legacy_clean_extracted_text(text) == pdf_parser._clean_extracted_text(text), \
+        "As duas implementações devem produzir o mesmo texto"
+
+    print(f"{args.lines} linhas, {args.runs} execuções")
+    print(f"{'implementação':>14} {'p50 (ms)':>10} {'mín (ms)':>10}")
+    results = {}
+    for name, func in (("anterior", legacy_clean_extracted_text),
+                       ("classificador", pdf_parser._clean_extracted_text)):
+        timings = measure(func, text, args.runs)
+        results[name] = statistics.median(timings)
+        print(f"{name:>14} {results[name]:10.2f} {min(timings):10.2f}")
+    print(f"speedup: {results['anterior'] / results['classificador']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
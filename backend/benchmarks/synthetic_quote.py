@@ -0,0 +1,193 @@
+"""
+Gerador de orçamentos sintéticos no layout dos PDFs da PMCELL.
+
+Escreve o PDF diretamente (Helvetica, WinAnsiEncoding), sem depender do
+reportlab, para gerar documentos de qualquer tamanho nos benchmarks.
+
+Com `artifact_every=N`, um a cada N itens traz o marcador de unidade com
+os resíduos de extração dos PDFs reais (`/<<UN`, `</< UN`, `<</ UN`), que
+o _normalize_text do parser corrige.
+"""
+from typing import List, Tuple
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+LINE_HEIGHT = 14
+MARGIN = 40
+
+HEADER_LINES = [
+    "PMCELL São Paulo",
+    "V. Zabin Tecnologia e Comercio Eireili",
+    "CNPJ: 29.734.462/0003-86",
+    "I.E: 130.745.005.110",
+    "Rua Comendador Abdo Schahin, 62",
+    "Orçamento Nº: {order_number}",
+    "Código: 000432 Data: 12/07/25 Condição de Pagto:",
+    "Cliente: CLIENTE SINTETICO LTDA Forma de Pagto:",
+    "Vendedor: VENDEDOR SINTETICO Validade do Orçamento: 12/07/25 - 0 dia(s)",
+    "Código Produto Unid. Quant. Valor Total",
+]
+
+# Marcador de unidade como aparece nos itens com resíduos de extração
+UNIT_ARTIFACTS = ["/<<UN", "</< UN", "<</ UN"]
+
+
+def _format_money(value: float) -> str:
+    """Formata no padrão brasileiro: 1.234,56."""
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+def quote_lines(
+    pages: int,
+    items_per_page: int,
+    order_number: str = "27830",
+    artifact_every: int = 0
+) -> List[List[str]]:
+    """
+    Gera as linhas de texto de cada página do orçamento.
+
+    Args:
+        pages: Número de páginas
+        items_per_page: Itens por página
+        order_number: Número do orçamento
+        artifact_every: Um a cada N itens com resíduos no marcador UN (0 = nenhum)
+
+    Returns:
+        List[List[str]]: Linhas de cada página
+    """
+    return _page_lines([items_per_page] * pages, order_number, artifact_every)
+
+
+def distributed_quote_lines(
+    items: int,
+    pages: int,
+    order_number: str = "27830",
+    artifact_every: int = 0
+) -> List[List[str]]:
+    """
+    Gera as linhas de um orçamento com `items` itens divididos em `pages` páginas.
+
+    As primeiras páginas recebem o item a mais quando a divisão não é exata.
+
+    Returns:
+        List[List[str]]: Linhas de cada página
+    """
+    size, remainder = divmod(items, pages)
+    counts = [size + (1 if index < remainder else 0) for index in range(pages)]
+    return _page_lines(counts, order_number, artifact_every)
+
+
+def _page_lines(counts: List[int], order_number: str, artifact_every: int) -> List[List[str]]:
+    """Linhas de cada página, com `counts[i]` itens na página i."""
+    result = []
+    total = 0.0
+    code = 10000
+    for page_number, count in enumerate(counts, start=1):
+        lines = []
+        if page_number == 1:
+            lines.extend(line.format(order_number=order_number) for line in HEADER_LINES)
+        for index in range(count):
+            quantity = 1 + (code % 50)
+            unit_price = 1.5 + (code % 17)
+            total += quantity * unit_price
+            unit = "/ UN"
+            if artifact_every and (code - 10000) % artifact_every == artifact_every - 1:
+                unit = UNIT_ARTIFACTS[(code - 10000) // artifact_every % len(UNIT_ARTIFACTS)]
+            lines.append(
+                f"{code:05d} / REF-{code % 997:03d} --> PRODUTO SINTETICO {index} {unit} / "
+                f"{quantity} / {_format_money(unit_price)} / {_format_money(quantity * unit_price)}"
+            )
+            code += 1
+        if page_number == len(counts):
+            lines.extend([
+                f"VALOR TOTAL R$ {_format_money(total)}",
+                "DESCONTO R$ 0,00",
+                f"VALOR A PAGAR R$ {_format_money(total)}",
+            ])
+        lines.append(f"Página {page_number}")
+        result.append(lines)
+    return result
+
+
+def _escape(line: str) -> bytes:
+    """Codifica uma linha como string literal de PDF."""
+    data = line.encode("cp1252")
+    return data.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def _content_stream(lines: List[str]) -> bytes:
+    """Operadores de texto de uma página, uma linha por vez."""
+    parts = [b"BT", b"/F1 9 Tf", f"{LINE_HEIGHT} TL".encode(),
+             f"{MARGIN} {PAGE_HEIGHT - MARGIN} Td".encode()]
+    for line in lines:
+        parts.append(b"(" + _escape(line) + b") Tj T*")
+    parts.append(b"ET")
+    return b"\n".join(parts)
+
+
+def build_pdf(pages_lines: List[List[str]]) -> bytes:
+    """
+    Monta um PDF com uma página por lista de linhas.
+
+    Args:
+        pages_lines: Linhas de cada página
+
+    Returns:
+        bytes: Conteúdo do PDF
+    """
+    # Objetos 1-3: catálogo, árvore de páginas e fonte; depois página + conteúdo
+    objects: List[Tuple[int, bytes]] = []
+    page_ids = [4 + 2 * index for index in range(len(pages_lines))]
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+
+    objects.append((1, b"<< /Type /Catalog /Pages 2 0 R >>"))
+    objects.append((2, f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()))
+    objects.append((3, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+                       b"/Encoding /WinAnsiEncoding >>"))
+    for page_id, lines in zip(page_ids, pages_lines):
+        content = _content_stream(lines)
+        objects.append((page_id, (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>"
+        ).encode()))
+        objects.append((page_id + 1, (
+            f"<< /Length {len(content)} >>\nstream\n".encode() + content + b"\nendstream"
+        )))
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for object_id, body in objects:
+        offsets[object_id] = len(output)
+        output += f"{object_id} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n".encode()
+    output += b"0000000000 65535 f \n"
+    for object_id in range(1, len(objects) + 1):
+        output += f"{offsets[object_id]:010d} 00000 n \n".encode()
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref_offset}\n%%EOF\n"
+    ).encode()
+    return bytes(output)
+
+
+def build_quote_pdf(
+    pages: int = 1,
+    items_per_page: int = 40,
+    order_number: str = "27830",
+    artifact_every: int = 0
+) -> bytes:
+    """
+    Gera um orçamento sintético completo.
+
+    Args:
+        pages: Número de páginas
+        items_per_page: Itens por página
+        order_number: Número do orçamento
+        artifact_every: Um a cada N itens com resíduos no marcador UN (0 = nenhum)
+
+    Returns:
+        bytes: Conteúdo do PDF
+    """
+    return build_pdf(quote_lines(pages, items_per_page, order_number, artifact_every))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Script para importação em massa de pedidos (migrações e backfills).
+Lê pedidos de JSONL (um PDFExtractedData por linha) ou CSV (uma linha por
+item) e grava em lotes, ignorando pedidos já cadastrados.
+
+Uso:
+    python scripts/import_orders.py pedidos.jsonl
+    python scripts/import_orders.py pedidos.csv --batch-size 2000
+"""
+import asyncio
+import argparse
+import sys
+from pathlib import Path
+
+# Adicionar o diretório raiz ao path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.schemas.pdf import OrderImportResult
+from app.services.order_import import OrderImporter, read_rows
+
+
+async def print_progress(result: OrderImportResult):
+    """Mostra o andamento após cada lote."""
+    rate = result.total_rows / result.elapsed_seconds if result.elapsed_seconds else 0
+    print(
+        f"  ➜ {result.total_rows} lidos, {result.imported} importados, "
+        f"{result.skipped_existing} existentes, {result.invalid} inválidos "
+        f"({rate:.0f} pedidos/s)"
+    )
+
+
+async def import_orders(path: Path, batch_size: int, max_errors: int):
+    """Importa os pedidos do arquivo."""
+    importer = OrderImporter(batch_size=batch_size, max_errors=max_errors)
+
+    async for session in get_async_session():
+        with path.open(encoding="utf-8-sig", newline="") as lines:
+            result = await importer.run(read_rows(path.name, lines), session, print_progress)
+
+        print(f"\n✅ {result.imported} pedido(s) e {result.items_imported} item(ns) importados "
+              f"em {result.elapsed_seconds:.1f}s")
+        print(f"   Já cadastrados: {result.skipped_existing}")
+        print(f"   Repetidos no arquivo: {result.duplicates}")
+        print(f"   Inválidos: {result.invalid}")
+
+        for error in result.errors:
+            print(f"  ❌ Linha {error.line} ({error.order_number or '-'}): {error.message}")
+        return result
+
+
+async def main():
+    """Função principal."""
+    parser = argparse.ArgumentParser(
+        description="Importa pedidos em massa no sistema PMCELL"
+    )
+
+    parser.add_argument(
+        "file",
+        type=Path,
+        help="Arquivo .jsonl ou .csv com os pedidos"
+    )
+    parser.add_argument(
+        "--batch-size", "-b",
+        type=int,
+        default=settings.ORDER_IMPORT_BATCH_SIZE,
+        help="Pedidos por lote (uma transação por lote)"
+    )
+    parser.add_argument(
+        "--max-errors",
+        type=int,
+        default=settings.ORDER_IMPORT_MAX_ERRORS,
+        help="Pedidos inválidos listados ao final"
+    )
+
+    args = parser.parse_args()
+
+    if not args.file.is_file():
+        print(f"\n❌ Erro: arquivo '{args.file}' não encontrado.")
+        sys.exit(1)
+
+    try:
+        await import_orders(args.file, args.batch_size, args.max_errors)
+
+    except Exception as e:
+        print(f"\n❌ Erro: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    print("🔧 PMCELL - Importação de Pedidos")
+    print("=" * 40)
+    asyncio.run(main())
@@ -1,15 +1,30 @@
 """
 Testes de integração para endpoints de pedidos.
 """
+import json
 import pytest
+import pytest_asyncio
+from datetime import datetime
 from pathlib import Path
+from fastapi import Response
 from fastapi.testclient import TestClient
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
 
 from app.main import app
+from app.api.v1.orders import (
+    _etag_matches, _order_etag, _page_etag, _wants_minimal, get_order_detail, update_order_items
+)
+from app.core.database import Base
+from app.models import OrderAccess, UserRole
 from app.models.user import User
 from app.models.order import Order
 from app.core.security import create_access_token
+from app.repositories.order import OrderRepository
+from app.schemas.orders import OrderItemsBatchUpdate
+from app.schemas.pdf import PDFExtractedData
+from app.services.order_detail_cache import order_detail_cache
 
 
 class TestOrdersAPI:
@@ -846,4 +861,150 @@ class TestOrderStatsAPI:
     def test_get_orders_stats_unauthenticated(self, client):
         """Testa acesso às estatísticas sem autenticação."""
         response = client.get("/api/v1/orders/stats")
-        assert response.status_code == 401
\ No newline at end of file
+        assert response.status_code == 401
+
+
+class TestOrderItemsResponseMode:
+    """Testes para a escolha da resposta compacta na atualização de itens."""
+    
+    def test_prefer_header(self):
+        """Testa o header Prefer (RFC 7240)."""
+        assert _wants_minimal("return=minimal", None)
+        assert _wants_minimal("respond-async, Return = Minimal", None)
+        assert not _wants_minimal("return=representation", None)
+        assert not _wants_minimal(None, None)
+    
+    def test_query_parameter_takes_precedence(self):
+        """Testa que ?response= tem precedência sobre o Prefer."""
+        assert _wants_minimal(None, "delta")
+        assert not _wants_minimal("return=minimal", "full")
+    
+    @pytest_asyncio.fixture
+    async def session(self):
+        """Sessão em um banco SQLite em memória, como a do endpoint."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        order_detail_cache.clear()
+        async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)() as session:
+            yield session
+        order_detail_cache.clear()
+        await engine.dispose()
+    
+    async def create_order(self, session: AsyncSession):
+        """Usuário e pedido com 4 itens de quantidade 3 (items_count = 12)."""
+        user = User(name="Separador", pin_hash="-", pin_unique="-", pin_lookup="-", role=UserRole.SEPARATOR)
+        session.add(user)
+        await session.commit()
+        order = await OrderRepository(session).create_from_pdf_data(PDFExtractedData(
+            order_number="86001", client_name="Cliente", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=120.0,
+            items=[
+                {"product_code": f"P{i}", "product_reference": f"R{i}", "product_name": f"Produto {i}",
+                 "quantity": 3, "unit_price": 10.0, "total_price": 30.0}
+                for i in range(4)
+            ]
+        ))
+        return user, order, [item.id for item in order.items]
+    
+    async def count_accesses(self, session: AsyncSession) -> int:
+        return (await session.execute(select(func.count(OrderAccess.id)))).scalar_one()
+    
+    @pytest.mark.asyncio
+    async def test_delta_matches_full_response(self, session):
+        """Testa a resposta compacta: itens do lote, contadores, headers e o mesmo progresso do detalhe."""
+        user, order, (first, second, third, fourth) = await self.create_order(session)
+        
+        response = Response()
+        delta = await update_order_items(
+            response=response,
+            order_id=order.id,
+            updates=OrderItemsBatchUpdate(updates=[
+                {"item_id": third, "separated": True},
+                {"item_id": first, "sent_to_purchase": True},
+                {"item_id": fourth, "not_sent": True},
+                {"item_id": third, "separated": True},
+            ]),
+            prefer="return=minimal",
+            response_mode=None,
+            session=session,
+            current_user=user
+        )
+        
+        assert response.headers["Preference-Applied"] == "return=minimal"
+        assert response.headers["ETag"] == _order_etag(order.id, 1)
+        assert [item.id for item in delta.items] == [third, first, fourth]
+        assert [(item.separated, item.sent_to_purchase, item.not_sent) for item in delta.items] == [
+            (True, False, False), (False, True, False), (False, False, True)
+        ]
+        assert (delta.items_count, delta.items_separated, delta.items_in_purchase, delta.items_not_sent) == (
+            12, 1, 1, 1
+        )
+        assert delta.status == "in_progress"
+        # 2 de 4 itens processados, não 2 de 12 unidades
+        assert delta.progress_percentage == 50.0
+        assert await self.count_accesses(session) == 0
+        
+        full = await get_order_detail(order_id=order.id, if_none_match=None, session=session, current_user=user)
+        body = json.loads(full.body)
+        assert full.headers["ETag"] == response.headers["ETag"]
+        assert (body["progress_percentage"], body["status"]) == (delta.progress_percentage, delta.status)
+        assert await self.count_accesses(session) == 1
+    
+    @pytest.mark.asyncio
+    async def test_delta_query_parameter(self, session):
+        """Testa ?response=delta (sem Preference-Applied) e ?response=full."""
+        user, order, (first, *_) = await self.create_order(session)
+        
+        response = Response()
+        delta = await update_order_items(
+            response=response,
+            order_id=order.id,
+            updates=OrderItemsBatchUpdate(updates=[{"item_id": first, "separated": True}]),
+            prefer=None,
+            response_mode="delta",
+            session=session,
+            current_user=user
+        )
+        assert "Preference-Applied" not in response.headers
+        assert [item.id for item in delta.items] == [first]
+        assert delta.progress_percentage == 25.0
+        
+        full = await update_order_items(
+            response=Response(),
+            order_id=order.id,
+            updates=OrderItemsBatchUpdate(updates=[{"item_id": first, "separated": False}]),
+            prefer="return=minimal",
+            response_mode="full",
+            session=session,
+            current_user=user
+        )
+        body = json.loads(full.body)
+        assert len(body["items"]) == 4
+        assert body["progress_percentage"] == 0.0
+
+
+class TestOrderETags:
+    """Testes para os ETags de pedido e de página da listagem."""
+    
+    def test_if_none_match(self):
+        """Testa a comparação do If-None-Match (lista, *, W/)."""
+        etag = _order_etag(1, 3)
+        assert _etag_matches(etag, etag)
+        assert _etag_matches(f'"order-1-r2", W/{etag}', etag)
+        assert _etag_matches("*", etag)
+        assert not _etag_matches(_order_etag(1, 2), etag)
+        assert not _etag_matches(None, etag)
+    
+    def test_page_etag(self):
+        """Testa que o ETag da página muda com revisões, pedidos e campos."""
+        class Row:
+            def __init__(self, id, revision):
+                self.id, self.revision = id, revision
+        
+        page = _page_etag([Row(2, 0), Row(1, 5)], ["id", "order_number"])
+        assert page == _page_etag([Row(2, 0), Row(1, 5)], ["id", "order_number"])
+        assert page != _page_etag([Row(2, 1), Row(1, 5)], ["id", "order_number"])
+        assert page != _page_etag([Row(3, 0), Row(2, 0)], ["id", "order_number"])
+        assert page != _page_etag([Row(2, 0), Row(1, 5)], ["id"])
+
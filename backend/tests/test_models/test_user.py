@@ -102,6 +102,30 @@ class TestUserModel:
         with pytest.raises(ValueError, match="PIN deve conter apenas números"):
             User(name="Test", pin="12a4", role=UserRole.SEPARATOR)
     
+    def test_user_pin_lookup(self):
+        """Testa que a chave de busca do PIN é determinística e não expõe o PIN."""
+        user = User(name="Lookup", pin="2468", role=UserRole.SEPARATOR)
+        other = User(name="Lookup 2", pin="2468", role=UserRole.SELLER)
+        
+        assert user.pin_lookup is not None
+        assert user.pin_lookup == other.pin_lookup
+        assert "2468" not in user.pin_lookup
+    
+    def test_user_set_pin(self):
+        """Testa troca de PIN atualizando hash e chave de busca."""
+        user = User(name="Troca", pin="1357", role=UserRole.SEPARATOR)
+        old_lookup = user.pin_lookup
+        
+        user.set_pin("8642")
+        
+        assert user.verify_pin("8642")
+        assert not user.verify_pin("1357")
+        assert user.pin_unique == "8642"
+        assert user.pin_lookup != old_lookup
+        
+        with pytest.raises(ValueError, match="PIN deve conter apenas números"):
+            user.set_pin("86a2")
+    
     def test_user_relationships(self):
         """Testa relacionamentos do modelo User."""
         user = User(name="Test", pin="1234", role=UserRole.SEPARATOR)
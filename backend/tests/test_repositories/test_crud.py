@@ -1,9 +1,12 @@
 """Testes para operações CRUD dos repositories."""
 import pytest
 from datetime import datetime
+from sqlalchemy import select, update
 
-from app.models import User, UserRole, Order, OrderStatus
-from app.repositories import UserRepository, OrderRepository
+from app.models import User, UserRole, Order, OrderStatus, PurchaseItem
+from app.repositories import UserRepository, OrderRepository, OrderItemRepository
+from app.schemas.orders import OrderItemUpdate
+from app.schemas.pdf import PDFExtractedData
 
 
 @pytest.mark.asyncio
@@ -29,6 +32,11 @@ async def test_user_repository_crud(db):
     # Read by PIN
     found_by_pin = await repo.get_by_pin("9876")
     assert found_by_pin == user
+    assert await repo.get_by_pin("6789") is None
+    
+    # Authenticate
+    assert await repo.authenticate("9876") == user
+    assert await repo.authenticate("6789") is None
     
     # Update
     updated = await repo.update(user.id, name="Updated User")
@@ -159,4 +167,240 @@ async def test_repository_bulk_operations(db):
     await db.commit()
     
     assert len(created_users) == 5
-    assert all(u.id is not None for u in created_users)
\ No newline at end of file
+    assert all(u.id is not None for u in created_users)
+
+@pytest.mark.asyncio
+async def test_order_create_from_pdf_data_bulk_items(db):
+    """Testa criação do pedido com os itens inseridos em lote."""
+    repo = OrderRepository(db)
+    pdf_data = PDFExtractedData(
+        order_number="70001",
+        client_name="Cliente",
+        seller_name="Vendedor",
+        order_date=datetime.now(),
+        total_value=sum(10.0 * (i + 1) for i in range(50)),
+        items=[
+            {
+                "product_code": f"{10000 + i}",
+                "product_reference": f"REF{i}",
+                "product_name": f"Produto {i}",
+                "quantity": i + 1,
+                "unit_price": 10.0,
+                "total_price": 10.0 * (i + 1)
+            }
+            for i in range(50)
+        ]
+    )
+    
+    order = await repo.create_from_pdf_data(pdf_data, logistics_type="correios")
+    
+    assert [item.product_code for item in order.items] == [f"{10000 + i}" for i in range(50)]
+    assert all(item.id is not None and item.order_id == order.id for item in order.items)
+    assert all(item.is_separated is False and item.created_at for item in order.items)
+    
+    stored = await repo.get_with_items(order.id)
+    assert sorted(item.id for item in stored.items) == sorted(item.id for item in order.items)
+
+
+@pytest.mark.asyncio
+async def test_order_list_paginated_cursor(db):
+    """Testa paginação por cursor, com created_at repetido e pedidos novos entre páginas."""
+    repo = OrderRepository(db)
+    
+    for i, day in enumerate([1, 2, 2, 3, 4, 4, 4, 5]):
+        await repo.create(
+            order_number=f"8100{i}", client_name="Cliente", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=10.0, created_at=datetime(2024, 1, day)
+        )
+    await db.commit()
+    expected = [order.id for order in await repo.list_paginated(limit=100)]
+    
+    first = await repo.list_paginated(limit=3)
+    # Um pedido novo não desloca as páginas seguintes
+    await repo.create(
+        order_number="81099", client_name="Cliente", seller_name="Vendedor",
+        order_date=datetime.now(), total_value=10.0, created_at=datetime(2024, 2, 1)
+    )
+    await db.commit()
+    
+    seen = [order.id for order in first]
+    cursor = repo.encode_cursor(first[-1])
+    while True:
+        page = await repo.list_paginated(limit=3, cursor=cursor)
+        if not page:
+            break
+        seen.extend(order.id for order in page)
+        cursor = repo.encode_cursor(page[-1])
+    
+    assert seen == expected
+    
+    with pytest.raises(ValueError):
+        await repo.list_paginated(cursor="nao-e-um-cursor")
+
+
+@pytest.mark.asyncio
+async def test_order_list_summaries(db):
+    """Testa a listagem só com as colunas pedidas, na mesma ordem de list_paginated."""
+    repo = OrderRepository(db)
+    for i in range(3):
+        await repo.create(
+            order_number=f"8200{i}", client_name=f"Cliente {i}", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=10.0, items_count=4, items_separated=i
+        )
+    await db.commit()
+    
+    orders = await repo.list_paginated(limit=2)
+    rows = await repo.list_summaries(limit=2, columns=["client_name"])
+    
+    assert [row.id for row in rows] == [order.id for order in orders]
+    assert [row.client_name for row in rows] == [order.client_name for order in orders]
+    assert rows[0]._fields == ("id", "created_at", "revision", "client_name")
+    
+    next_rows = await repo.list_summaries(limit=2, cursor=repo.encode_cursor(rows[-1]))
+    assert next_rows[0].id == (await repo.list_paginated(offset=2, limit=1))[0].id
+    
+    with pytest.raises(ValueError):
+        await repo.list_summaries(columns=["nao_existe"])
+
+
+@pytest.mark.asyncio
+async def test_order_item_apply_batch_update(db):
+    """Testa a atualização em lote de itens, agrupada por transição."""
+    user = await UserRepository(db).create(name="Separador Lote", pin="4001", role=UserRole.SEPARATOR)
+    order_repo = OrderRepository(db)
+    item_repo = OrderItemRepository(db)
+    
+    def pdf_data(order_number):
+        return PDFExtractedData(
+            order_number=order_number, client_name="Cliente", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=40.0,
+            items=[
+                {"product_code": f"P{i}", "product_reference": f"R{i}", "product_name": f"Produto {i}",
+                 "quantity": 1, "unit_price": 10.0, "total_price": 10.0}
+                for i in range(4)
+            ]
+        )
+    
+    order = await order_repo.create_from_pdf_data(pdf_data("83001"))
+    other = await order_repo.create_from_pdf_data(pdf_data("83002"))
+    first, second, third, fourth = [item.id for item in order.items]
+    await item_repo.send_to_purchase(third, user.id)
+    await db.commit()
+    
+    states = await item_repo.get_item_states(order.id, [first, second, third, fourth, other.items[0].id])
+    assert {item_id: state.sent_to_purchase for item_id, state in states.items()} == {
+        first: False, second: False, third: True, fourth: False
+    }
+    
+    updates = [
+        OrderItemUpdate(item_id=first, separated=True),
+        OrderItemUpdate(item_id=second, sent_to_purchase=True),
+        OrderItemUpdate(item_id=third, sent_to_purchase=False),
+        OrderItemUpdate(item_id=fourth, not_sent=True),
+        OrderItemUpdate(item_id=fourth, separated=True, not_sent=False),
+        OrderItemUpdate(item_id=third, sent_to_purchase=False),
+        OrderItemUpdate(item_id=second, separated=False),
+    ]
+    changes = await item_repo.apply_batch_update(updates, states, user.id)
+    # Os itens da sessão já refletem os UPDATEs do lote
+    assert states[first].is_separated and states[first].separated_at is not None
+    assert (states[second].sent_to_purchase, states[third].sent_to_purchase) == (True, False)
+    await db.commit()
+    
+    # Só transições reais: o item 2 não estava separado e o 4 não estava como não enviado
+    assert changes == {
+        "separated": [first, fourth],
+        "unseparated": [],
+        "sent_to_purchase": [second],
+        "removed_from_purchase": [third],
+        "not_sent": [],
+        "pending": [],
+    }
+    assert item_repo.progress_delta(changes) == {"separated": 2, "in_purchase": 0, "not_sent": 0}
+    items = {item.id: item for item in await item_repo.get_by_order(order.id)}
+    for item in items.values():
+        await db.refresh(item)
+    assert items[first].is_separated and items[first].separated_by_id == user.id
+    assert items[fourth].is_separated and not items[fourth].not_sent
+    assert items[second].sent_to_purchase and items[second].sent_to_purchase_by_id == user.id
+    assert not items[third].sent_to_purchase and items[third].sent_to_purchase_at is None
+    purchases = await db.scalars(select(PurchaseItem.order_item_id))
+    assert list(purchases) == [second]
+
+
+@pytest.mark.asyncio
+async def test_order_progress_delta_and_reconcile(db):
+    """Testa contadores por variação, promoção de status no SQL e reconciliação."""
+    order_repo = OrderRepository(db)
+    order = await order_repo.create_from_pdf_data(PDFExtractedData(
+        order_number="84001", client_name="Cliente", seller_name="Vendedor",
+        order_date=datetime.now(), total_value=30.0,
+        items=[
+            {"product_code": f"P{i}", "product_reference": f"R{i}", "product_name": f"Produto {i}",
+             "quantity": 1, "unit_price": 10.0, "total_price": 10.0}
+            for i in range(3)
+        ]
+    ))
+    first, second, third = order.items
+    
+    updated = await order_repo.apply_progress_delta(order.id, separated=1, in_purchase=1)
+    assert updated is order
+    assert (order.items_separated, order.items_in_purchase, order.status) == (1, 1, OrderStatus.IN_PROGRESS)
+    
+    updated = await order_repo.apply_progress_delta(order.id, separated=1, not_sent=1, in_purchase=-1)
+    assert (order.items_separated, order.items_not_sent, order.status) == (2, 1, OrderStatus.COMPLETED)
+    assert order.completed_at is not None
+    await db.commit()
+    
+    # Contadores divergentes dos itens (nenhum item foi alterado de fato)
+    first.is_separated = True
+    await db.commit()
+    assert await order_repo.reconcile_progress() == [order.id]
+    await db.commit()
+    await db.refresh(order)
+    assert (order.items_separated, order.items_in_purchase, order.items_not_sent) == (1, 0, 0)
+    assert order.status == OrderStatus.IN_PROGRESS
+    assert await order_repo.reconcile_progress() == []
+    
+    second.not_sent = True
+    third.is_separated = True
+    await db.commit()
+    order = await order_repo.update_progress(order.id)
+    assert (order.items_separated, order.items_not_sent, order.status) == (2, 1, OrderStatus.COMPLETED)
+
+
+@pytest.mark.asyncio
+async def test_order_revision(db):
+    """Testa a revisão do pedido (ETag) incrementada a cada alteração de progresso."""
+    order_repo = OrderRepository(db)
+    order = await order_repo.create_from_pdf_data(PDFExtractedData(
+        order_number="85001", client_name="Cliente", seller_name="Vendedor",
+        order_date=datetime.now(), total_value=20.0,
+        items=[
+            {"product_code": f"P{i}", "product_reference": f"R{i}", "product_name": f"Produto {i}",
+             "quantity": 1, "unit_price": 10.0, "total_price": 10.0}
+            for i in range(2)
+        ]
+    ))
+    assert order.revision == 0
+    assert await order_repo.get_revision(order.id) == 0
+    assert await order_repo.get_revision(999999) is None
+    
+    await order_repo.apply_progress_delta(order.id, separated=1)
+    # Variação zero (um item separado, outro desfeito) também muda a revisão
+    await order_repo.apply_progress_delta(order.id)
+    await order_repo.update_progress(order.id)
+    await db.commit()
+    assert order.revision == 3
+    assert await order_repo.get_revision(order.id) == 3
+    
+    rows = await order_repo.list_summaries(columns=["order_number"])
+    assert [(row.id, row.revision) for row in rows if row.id == order.id] == [(order.id, 3)]
+    
+    # Detalhe em uma consulta: revisão atualizada mesmo com o pedido na sessão
+    order, items = await order_repo.get_detail(order.id)
+    assert order.revision == 3
+    assert [item.product_name for item in items] == ["Produto 0", "Produto 1"]
+    await db.execute(update(Order).where(Order.id == order.id).values(revision=Order.revision + 1))
+    assert (await order_repo.get_detail(order.id))[0].revision == 4
+    assert await order_repo.get_detail(999999) is None
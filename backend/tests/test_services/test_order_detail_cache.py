@@ -0,0 +1,170 @@
+"""
+Testes para o cache do detalhe de pedidos.
+"""
+import pytest
+
+from app.core import cache as core_cache
+from app.core.cache import CacheKeys
+from app.services import order_detail_cache as cache_module
+from app.services.order_detail_cache import OrderDetailCache
+
+
+DETAIL_A = b'{"id":1,"items":[]}'
+DETAIL_B = b'{"id":1,"items":[{"id":10}]}'
+
+
+class FakeRedis:
+    """Substitui Cache (Redis) por um dicionário, como um segundo processo veria."""
+
+    def __init__(self):
+        self.values = {}
+        self.deleted = []
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=3600):
+        self.values[key] = value
+        return True
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+        self.deleted.append(key)
+        return True
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    """Redis em memória para Cache."""
+    fake = FakeRedis()
+    monkeypatch.setattr(cache_module.Cache, "get", fake.get)
+    monkeypatch.setattr(cache_module.Cache, "set", fake.set)
+    monkeypatch.setattr(cache_module.Cache, "delete", fake.delete)
+    monkeypatch.setattr(cache_module.Cache, "delete_pattern", pytest.fail)
+    return fake
+
+
+class TestOrderDetailCache:
+    """Testes para o OrderDetailCache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_only_on_same_revision(self, redis):
+        """Testa que só a revisão com que o detalhe foi montado é devolvida."""
+        cache = OrderDetailCache(max_entries=4, ttl=60)
+        assert await cache.get(1, revision=0) is None
+
+        await cache.set(1, 0, DETAIL_A)
+        assert await cache.get(1, revision=0) == DETAIL_A
+        assert await cache.get(1, revision=1) is None
+        assert await cache.get(2, revision=0) is None
+
+        metrics = cache.get_metrics()
+        assert (metrics["hits"], metrics["misses"], metrics["stale"]) == (1, 3, 2)
+
+    @pytest.mark.asyncio
+    async def test_redis_level_shared_between_processes(self, redis):
+        """Testa que outro processo (LRU vazio) usa o detalhe do Redis."""
+        await OrderDetailCache(max_entries=4, ttl=60).set(1, 3, DETAIL_A)
+
+        other = OrderDetailCache(max_entries=4, ttl=60)
+        assert await other.get(1, revision=3) == DETAIL_A
+        assert await other.get(1, revision=3) == DETAIL_A
+        metrics = other.get_metrics()
+        assert (metrics["redis_hits"], metrics["hits"]) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_invalidate(self, redis):
+        """Testa que a invalidação remove só a chave do detalhe, local e no Redis."""
+        cache = OrderDetailCache(max_entries=4, ttl=60)
+        await cache.set(1, 0, DETAIL_A)
+        await cache.invalidate(1)
+
+        assert await cache.get(1, revision=0) is None
+        assert redis.deleted == [CacheKeys.order_detail_key(1)]
+        assert cache.get_metrics()["invalidations"] == 1
+
+        await cache.set(1, 1, DETAIL_B)
+        assert await cache.get(1, revision=1) == DETAIL_B
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction_and_ttl(self, redis):
+        """Testa remoção da entrada menos usada e expiração local."""
+        cache = OrderDetailCache(max_entries=1, ttl=60)
+        await cache.set(1, 0, DETAIL_A)
+        await cache.set(2, 0, DETAIL_B)
+        assert cache.get_metrics()["evictions"] == 1
+        assert cache.get_metrics()["entries"] == 1
+
+        expired = OrderDetailCache(max_entries=4, ttl=0)
+        await expired.set(1, 0, DETAIL_A)
+        redis.values.clear()
+        assert await expired.get(1, revision=0) is None
+        assert expired.get_metrics()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_disabled_without_redis(self):
+        """Testa que com max_entries=0 e sem Redis nada fica em cache."""
+        cache = OrderDetailCache(max_entries=0, ttl=60)
+        await cache.set(1, 0, DETAIL_A)
+
+        assert await cache.get(1, revision=0) is None
+        assert cache.get_metrics()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_redis_tier_skipped_when_disabled(self, redis):
+        """Testa que com use_redis=False o Redis não é consultado nem invalidado."""
+        await OrderDetailCache(max_entries=4, ttl=60).set(1, 0, DETAIL_A)
+
+        cache = OrderDetailCache(max_entries=4, ttl=60, use_redis=False)
+        assert await cache.get(1, revision=0) is None
+        await cache.set(2, 0, DETAIL_B)
+        await cache.invalidate(1)
+
+        assert list(redis.values) == [CacheKeys.order_detail_key(1)]
+        assert redis.deleted == []
+        assert cache.get_metrics()["redis"] is False
+
+
+class TestRedisClient:
+    """Testes para get_redis_client sem Redis disponível."""
+
+    @pytest.fixture(autouse=True)
+    def production(self, monkeypatch):
+        monkeypatch.setattr(core_cache.settings, "ENVIRONMENT", "production")
+        monkeypatch.setattr(core_cache, "_redis_client", None)
+        monkeypatch.setattr(core_cache, "_redis_retry_at", 0.0)
+
+    @pytest.mark.asyncio
+    async def test_no_connection_without_redis_url(self, monkeypatch):
+        """Testa que sem REDIS_URL não há tentativa de conexão."""
+        monkeypatch.setattr(core_cache.settings, "REDIS_URL", None)
+        monkeypatch.setattr(core_cache.redis, "from_url", pytest.fail)
+
+        assert await core_cache.get_redis_client() is None
+        assert await core_cache.Cache.get("chave") is None
+
+    @pytest.mark.asyncio
+    async def test_backoff_after_failed_connection(self, monkeypatch):
+        """Testa que após uma falha a conexão só é tentada de novo após o intervalo."""
+        attempts, warnings = [], []
+
+        class Unreachable:
+            async def ping(self):
+                raise ConnectionError("unreachable")
+
+        def from_url(url, **kwargs):
+            attempts.append(url)
+            return Unreachable()
+
+        monkeypatch.setattr(core_cache.settings, "REDIS_URL", "redis://cache:6379")
+        monkeypatch.setattr(core_cache.redis, "from_url", from_url)
+        monkeypatch.setattr(core_cache.logger, "warning", warnings.append)
+
+        for _ in range(5):
+            assert await core_cache.get_redis_client() is None
+        assert attempts == ["redis://cache:6379"]
+        assert len(warnings) == 1
+
+        monkeypatch.setattr(core_cache, "_redis_retry_at", 0.0)
+        assert await core_cache.get_redis_client() is None
+        assert len(attempts) == 2
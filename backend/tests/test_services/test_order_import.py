@@ -0,0 +1,147 @@
+"""
+Testes para a importação em massa de pedidos.
+"""
+import json
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Order, OrderItem
+from app.services.order_import import OrderImporter, OrderImportError, iter_csv, iter_jsonl, read_rows
+
+
+@pytest_asyncio.fixture
+async def session():
+    """Sessão em um banco SQLite em memória."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+def order_json(order_number: str, items: int = 2, **overrides) -> str:
+    """Linha JSONL de um pedido válido."""
+    data = {
+        "order_number": order_number,
+        "client_name": "Cliente",
+        "seller_name": "Vendedor",
+        "order_date": "2024-03-01T10:00:00",
+        "total_value": items * 20.0,
+        "items": [
+            {
+                "product_code": f"{order_number}-{index}",
+                "product_reference": f"REF-{index}",
+                "product_name": f"Produto {index}",
+                "quantity": 2,
+                "unit_price": 10.0,
+                "total_price": 20.0,
+            }
+            for index in range(items)
+        ],
+    }
+    data.update(overrides)
+    return json.dumps(data)
+
+
+class TestOrderImportReaders:
+    """Testes para a leitura de JSONL e CSV."""
+
+    def test_jsonl_reports_unreadable_lines(self):
+        """Testa que linhas ilegíveis viram erro da linha, sem parar a leitura."""
+        rows = list(iter_jsonl([order_json("1") + "\n", "\n", "{quebrado\n", "[1, 2]\n", order_json("2")]))
+
+        assert [row.line for row in rows] == [1, 3, 4, 5]
+        assert rows[0].data["order_number"] == "1"
+        assert rows[1].error.startswith("JSON inválido")
+        assert rows[2].error == "Linha não é um objeto JSON"
+        assert rows[3].error is None
+
+    def test_csv_groups_consecutive_items(self):
+        """Testa que linhas consecutivas do mesmo pedido formam um pedido."""
+        header = ("order_number,client_name,seller_name,order_date,total_value,"
+                  "product_code,product_reference,product_name,quantity,unit_price,total_price\n")
+        lines = [
+            header,
+            "100,Cliente,Vendedor,2024-03-01T10:00:00,30,A1,R1,Produto 1,1,10,10\n",
+            "100,Cliente,Vendedor,2024-03-01T10:00:00,30,A2,R2,Produto 2,2,10,20\n",
+            "200,Outro,Vendedor,2024-03-02T10:00:00,5,B1,R1,Produto 1,1,5,5\n",
+        ]
+
+        rows = list(iter_csv(lines))
+
+        assert [(row.line, row.data["order_number"], len(row.data["items"])) for row in rows] == [
+            (2, "100", 2), (4, "200", 1)
+        ]
+
+    def test_csv_missing_columns(self):
+        """Testa o erro de cabeçalho incompleto."""
+        with pytest.raises(OrderImportError, match="product_code"):
+            list(iter_csv(["order_number,client_name,seller_name,order_date,total_value\n"]))
+
+    def test_unsupported_format(self):
+        """Testa a recusa de extensões desconhecidas."""
+        with pytest.raises(OrderImportError):
+            read_rows("pedidos.xlsx", [])
+
+
+class TestOrderImporter:
+    """Testes para o OrderImporter."""
+
+    @pytest.mark.asyncio
+    async def test_import_skips_existing_duplicates_and_invalid(self, session):
+        """Testa a importação em lotes com pedidos existentes, repetidos e inválidos."""
+        session.add(Order(
+            order_number="3", client_name="Cliente", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=10.0, items_count=1
+        ))
+        await session.commit()
+
+        lines = [order_json(str(number)) for number in range(1, 8)]
+        lines += [
+            order_json("1"),
+            order_json("9", total_value=999.0),
+            order_json("10", client_name=""),
+            "{quebrado",
+        ]
+        progress = []
+
+        async def on_progress(result):
+            progress.append((result.total_rows, result.imported))
+
+        importer = OrderImporter(batch_size=4, max_errors=2)
+        result = await importer.run(iter_jsonl(lines), session, on_progress)
+
+        assert (result.total_rows, result.imported, result.items_imported) == (11, 6, 12)
+        assert (result.skipped_existing, result.duplicates, result.invalid) == (1, 1, 3)
+        assert [(error.line, error.order_number) for error in result.errors] == [(9, "9"), (10, "10")]
+        assert "items" in result.errors[0].message
+        assert progress == [(4, 3), (8, 6), (11, 6)]
+
+        orders = await session.scalar(select(func.count()).select_from(Order))
+        items = await session.scalar(select(func.count()).select_from(OrderItem))
+        assert (orders, items) == (7, 12)
+        order = await session.scalar(select(Order).where(Order.order_number == "5"))
+        assert order.items_count == 4
+
+    @pytest.mark.asyncio
+    async def test_import_csv(self, session):
+        """Testa a importação de CSV, com valores em texto convertidos na validação."""
+        lines = [
+            "order_number,client_name,seller_name,order_date,total_value,"
+            "product_code,product_reference,product_name,quantity,unit_price,total_price\n",
+            "100,Cliente,Vendedor,2024-03-01T10:00:00,30.50,A1,R1,Produto 1,1,10.50,10.50\n",
+            "100,Cliente,Vendedor,2024-03-01T10:00:00,30.50,A2,R2,Produto 2,2,10,20\n",
+        ]
+
+        result = await OrderImporter().run(iter_csv(lines), session)
+
+        assert (result.imported, result.items_imported, result.invalid) == (1, 2, 0)
+        order = await session.scalar(select(Order).where(Order.order_number == "100"))
+        assert (order.total_value, order.items_count) == (30.5, 3)
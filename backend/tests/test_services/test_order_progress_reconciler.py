@@ -0,0 +1,107 @@
+"""
+Testes para a reconciliação periódica dos contadores de progresso.
+"""
+import asyncio
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.models import Order, OrderItem, OrderStatus
+from app.services import order_progress_reconciler as reconciler_module
+from app.services.order_progress_reconciler import OrderProgressReconciler
+
+
+@pytest_asyncio.fixture
+async def session_maker(monkeypatch):
+    """Session maker de um banco SQLite em memória, usado pela tarefa."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    maker = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr(reconciler_module, "get_session_maker", lambda: maker)
+    yield maker
+    await engine.dispose()
+
+
+async def create_order(session: AsyncSession, order_number: str, separated: int) -> int:
+    """Pedido com 2 itens, o primeiro separado, e `separated` no contador."""
+    order = Order(
+        order_number=order_number, client_name="Cliente", seller_name="Vendedor",
+        order_date=datetime.now(), total_value=20.0, items_count=2,
+        items_separated=separated, status=OrderStatus.IN_PROGRESS
+    )
+    order.items = [
+        OrderItem(product_code=f"{order_number}-{index}", product_reference="REF", product_name="Produto",
+                  quantity=1, unit_price=10.0, total_price=10.0, is_separated=index == 0)
+        for index in range(2)
+    ]
+    session.add(order)
+    await session.commit()
+    return order.id
+
+
+class TestOrderProgressReconciler:
+    """Testes para OrderProgressReconciler."""
+
+    @pytest.mark.asyncio
+    async def test_reconcile_fixes_only_drifted_orders(self, session_maker):
+        """Testa que só os pedidos com contador divergente são corrigidos."""
+        async with session_maker() as session:
+            correct = await create_order(session, "1", separated=1)
+            drifted = await create_order(session, "2", separated=2)
+
+        reconciler = OrderProgressReconciler(interval=0)
+        assert await reconciler.reconcile() == [drifted]
+        assert await reconciler.reconcile() == []
+
+        async with session_maker() as session:
+            assert (await session.get(Order, drifted)).items_separated == 1
+            assert (await session.get(Order, correct)).items_separated == 1
+        metrics = reconciler.get_metrics()
+        assert (metrics["runs"], metrics["orders_fixed"], metrics["running"]) == (2, 1, False)
+
+    @pytest.mark.asyncio
+    async def test_window_skips_old_orders(self, session_maker):
+        """Testa que pedidos atualizados fora da janela não são recontados."""
+        async with session_maker() as session:
+            drifted = await create_order(session, "1", separated=2)
+            await session.execute(
+                update(Order).where(Order.id == drifted).values(updated_at=datetime(2020, 1, 1))
+            )
+            await session.commit()
+
+        assert await OrderProgressReconciler(window=3600).reconcile() == []
+        assert await OrderProgressReconciler(window=0).reconcile() == [drifted]
+
+    @pytest.mark.asyncio
+    async def test_periodic_task(self, session_maker):
+        """Testa que a tarefa roda periodicamente e para no stop."""
+        reconciler = OrderProgressReconciler(interval=0)
+        reconciler.start()
+        assert reconciler.get_metrics()["running"] is False
+
+        # Espera a primeira execução sem depender de um sleep fixo
+        reconciled = asyncio.Event()
+        reconcile = reconciler.reconcile
+
+        async def reconcile_and_signal():
+            fixed = await reconcile()
+            reconciled.set()
+            return fixed
+
+        reconciler.reconcile = reconcile_and_signal
+        reconciler.interval = 0.01
+        reconciler.start()
+        assert reconciler.get_metrics()["running"] is True
+        await asyncio.wait_for(reconciled.wait(), timeout=10)
+        await reconciler.stop()
+
+        metrics = reconciler.get_metrics()
+        assert metrics["running"] is False
+        assert metrics["runs"] >= 1
+        assert metrics["failures"] == 0
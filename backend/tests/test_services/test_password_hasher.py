@@ -0,0 +1,50 @@
+"""
+Testes para o serviço de hash de PINs fora do event loop.
+"""
+import asyncio
+
+import pytest
+
+from app.core.security import get_password_hash
+from app.services.password_hasher import PasswordHasher
+
+
+class TestPasswordHasher:
+    """Testes para o PasswordHasher."""
+    
+    @pytest.fixture
+    def hasher(self):
+        """Fixture com pool pequeno para os testes."""
+        hasher = PasswordHasher(max_workers=2, max_concurrency=1)
+        yield hasher
+        hasher.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self, hasher):
+        """Testa hash e verificação assíncronos."""
+        pin_hash = await hasher.hash("1234")
+        
+        assert pin_hash != "1234"
+        assert await hasher.verify("1234", pin_hash) is True
+        assert await hasher.verify("4321", pin_hash) is False
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_metrics(self, hasher):
+        """Testa que operações excedentes aguardam na fila e são medidas."""
+        pin_hash = get_password_hash("1234")
+        
+        tasks = [asyncio.create_task(hasher.verify("1234", pin_hash)) for _ in range(3)]
+        await asyncio.sleep(0)
+        
+        metrics = hasher.get_metrics()
+        assert metrics["in_flight"] <= 1
+        assert metrics["queue_depth"] + metrics["in_flight"] == 3
+        
+        results = await asyncio.gather(*tasks)
+        assert all(results)
+        
+        metrics = hasher.get_metrics()
+        assert metrics["completed"] == 3
+        assert metrics["queue_depth"] == 0
+        assert metrics["in_flight"] == 0
+        assert metrics["avg_hash_ms"] > 0
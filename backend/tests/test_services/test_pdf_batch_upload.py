@@ -0,0 +1,90 @@
+"""
+Testes para o upload em lote de PDFs.
+"""
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base
+from app.repositories.order import OrderRepository
+from app.services.pdf_batch_upload import (
+    DUPLICATE_FILE, DUPLICATE_ORDER, EXISTING_ORDER, FAILED, PARSED, PDFBatchUploadService
+)
+from app.services.pdf_parse_cache import PDFParseCache
+from app.services.pdf_parser_pool import PDFParserPool
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+PDFS_DIR = Path(__file__).parent.parent / "fixtures" / "pdfs"
+
+
+@pytest_asyncio.fixture
+async def repository():
+    """Repository de pedidos em um banco SQLite em memória."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield OrderRepository(session)
+    await engine.dispose()
+
+
+class TestPDFBatchUploadService:
+    """Testes para o PDFBatchUploadService."""
+
+    @pytest.fixture
+    def service(self):
+        """Serviço com pool em thread local e cache próprio."""
+        pool = PDFParserPool(max_workers=0, timeout=30)
+        yield PDFBatchUploadService(pool=pool, cache=PDFParseCache())
+        pool.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_batch_results_and_dedupe(self, service, repository):
+        """Testa o resultado de cada arquivo, com repetidos e pedidos existentes."""
+        existing = await repository.create(
+            order_number="22222", client_name="Cliente", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=100.0, items_count=1
+        )
+        quote = build_quote_pdf(items_per_page=5, order_number="11111")
+        files = [
+            ("a.pdf", quote),
+            ("a-copia.pdf", quote),
+            ("b.pdf", build_quote_pdf(items_per_page=5, order_number="22222")),
+            ("a-revisado.pdf", build_quote_pdf(items_per_page=6, order_number="11111")),
+            ("corrompido.pdf", (PDFS_DIR / "corrupted.pdf").read_bytes()),
+        ]
+
+        response = await service.preview(files, repository, user_id=7)
+
+        assert [result.status for result in response.results] == [
+            PARSED, DUPLICATE_FILE, EXISTING_ORDER, DUPLICATE_ORDER, FAILED
+        ]
+        first, copy, known, revised, corrupted = response.results
+        assert first.preview.data.order_number == "11111"
+        assert len(first.preview.data.items) == 5
+        assert first.preview.preview_token
+        assert known.preview.preview_token is None
+        assert copy.duplicate_of == "a.pdf"
+        assert copy.preview == first.preview
+        assert known.existing_order_id == existing.id
+        assert revised.duplicate_of == "a.pdf"
+        assert corrupted.preview.errors
+        assert (response.total, response.parsed, response.duplicates,
+                response.existing_orders, response.failed) == (5, 1, 2, 1, 1)
+        assert service.get_metrics()["files"] == 5
+
+    @pytest.mark.asyncio
+    async def test_existing_orders_single_query(self, repository):
+        """Testa a busca dos pedidos já cadastrados entre vários números."""
+        order = await repository.create(
+            order_number="33333", client_name="Cliente", seller_name="Vendedor",
+            order_date=datetime.now(), total_value=100.0, items_count=1
+        )
+
+        assert await repository.get_ids_by_order_numbers(["33333", "44444"]) == {"33333": order.id}
+        assert await repository.get_ids_by_order_numbers([]) == {}
@@ -0,0 +1,157 @@
+"""
+Testes para a importação assíncrona de PDFs.
+"""
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from app.services import pdf_import_jobs
+from app.services.pdf_import_jobs import (
+    DONE, FAILED, PENDING, RUNNING, ImportJobStore, ImportQueueFullError, PDFImportService
+)
+from app.services.pdf_parse_cache import PDFParseCache
+from app.services.pdf_parser import PDFParser
+from app.services.pdf_parser_pool import PDFParserPool
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+PDFS_DIR = Path(__file__).parent.parent / "fixtures" / "pdfs"
+
+
+class TestImportJobStore:
+    """Testes para o ImportJobStore."""
+
+    def test_create_and_get(self):
+        """Testa que a importação criada pode ser consultada."""
+        store = ImportJobStore(ttl=60, max_jobs=10)
+        job = store.create(user_id=1, filename="pedido.pdf")
+
+        assert store.get(job.job_id) is job
+        assert store.get("inexistente") is None
+        assert store.get_metrics()["by_status"]["pending"] == 1
+
+    def test_ttl_expiration(self):
+        """Testa que só importações terminadas expiram."""
+        store = ImportJobStore(ttl=0, max_jobs=10)
+        job = store.create(user_id=1, filename="pedido.pdf")
+        job.status = RUNNING
+        assert store.get(job.job_id) is job
+
+        job.status = DONE
+        assert store.get(job.job_id) is None
+        assert store.get_metrics()["evictions"] == 1
+
+    def test_max_jobs_removes_oldest_finished(self):
+        """Testa que o limite remove as terminadas mais antigas e preserva as em andamento."""
+        store = ImportJobStore(ttl=60, max_jobs=2)
+        running = store.create(user_id=1, filename="a.pdf")
+        running.status = RUNNING
+        finished = store.create(user_id=1, filename="b.pdf")
+        finished.status = FAILED
+        pending = store.create(user_id=1, filename="c.pdf")
+
+        assert store.get(finished.job_id) is None
+        assert store.get(running.job_id) is running
+        assert store.get(pending.job_id) is pending
+
+        # Sem importações terminadas o store passa do limite até alguma terminar
+        third = store.create(user_id=1, filename="d.pdf")
+        assert store.get_metrics()["jobs"] == 3
+        assert store.get(third.job_id) is third
+
+
+class TestPDFImportService:
+    """Testes para o PDFImportService."""
+
+    @pytest.fixture
+    def messages(self, monkeypatch):
+        """Mensagens enviadas pelo WebSocket."""
+        sent = []
+
+        async def send_personal_message(message, user_id):
+            sent.append((user_id, message))
+
+        monkeypatch.setattr(
+            pdf_import_jobs.connection_manager, "send_personal_message", send_personal_message
+        )
+        return sent
+
+    @pytest.fixture
+    def service(self):
+        """Serviço com pool em thread local e cache próprio."""
+        pool = PDFParserPool(max_workers=0, timeout=30)
+        yield PDFImportService(
+            ImportJobStore(ttl=60, max_jobs=10), pool=pool, cache=PDFParseCache(), progress_interval=0
+        )
+        pool.shutdown()
+
+    async def _wait(self, service):
+        while service._tasks:
+            await asyncio.gather(*service._tasks)
+
+    @pytest.mark.asyncio
+    async def test_progress_and_result_pushed(self, service, messages):
+        """Testa progresso por página e preview final enviados ao usuário."""
+        content = build_quote_pdf(pages=3, items_per_page=10)
+        job = service.submit(content, user_id=7, filename="orcamento.pdf")
+        await self._wait(service)
+
+        assert job.status == DONE
+        assert job.result.success
+        assert job.items_found == len(PDFParser().extract_bytes(content)["items"])
+        assert all(user_id == 7 for user_id, _ in messages)
+
+        progress = [message.data for _, message in messages if message.type == "import_progress"]
+        assert progress
+        assert progress[-1]["pages_done"] == job.pages_total
+        assert [message.type for _, message in messages][-1] == "import_done"
+        done = messages[-1][1].data
+        assert done["job_id"] == job.job_id
+        assert done["status"] == DONE
+        assert done["result"]["data"]["order_number"] == job.result.data.order_number
+
+    @pytest.mark.asyncio
+    async def test_parse_error_marks_failed(self, service, messages):
+        """Testa que um PDF inválido termina como falha com o erro."""
+        content = (PDFS_DIR / "corrupted.pdf").read_bytes()
+        job = service.submit(content, user_id=7, filename="corrupted.pdf")
+        await self._wait(service)
+
+        assert job.status == FAILED
+        assert not job.result.success
+        assert job.result.errors
+        assert messages[-1][1].type == "import_done"
+        assert messages[-1][1].data["status"] == FAILED
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit_and_queue(self, messages):
+        """Testa que as importações excedentes aguardam e que a fila cheia recusa o upload."""
+        release = asyncio.Event()
+        running = []
+
+        class BlockingCache(PDFParseCache):
+            async def get(self, content, content_hash=None):
+                running.append(content)
+                await release.wait()
+                raise RuntimeError("interrompido")
+
+        service = PDFImportService(
+            ImportJobStore(ttl=60, max_jobs=10), cache=BlockingCache(), max_concurrency=1, max_queued=1
+        )
+        first = service.submit(b"1", user_id=7, filename="a.pdf")
+        await asyncio.sleep(0)
+        second = service.submit(b"2", user_id=7, filename="b.pdf")
+        with pytest.raises(ImportQueueFullError):
+            service.submit(b"3", user_id=7, filename="c.pdf")
+
+        await asyncio.sleep(0)
+        assert running == [b"1"]
+        assert (first.status, second.status) == (RUNNING, PENDING)
+        assert service.get_metrics()["queued"] == 1
+
+        release.set()
+        await self._wait(service)
+        assert running == [b"1", b"2"]
+        assert (first.status, second.status) == (FAILED, FAILED)
+        assert service.get_metrics()["queued"] == 0
@@ -0,0 +1,135 @@
+"""
+Testes para o tokenizador de linhas de item.
+"""
+import time
+
+from app.services.pdf_item_tokenizer import (
+    LEGACY,
+    STRICT,
+    TOLERANT,
+    ItemStream,
+    ItemTokenizer,
+    tokenize_items,
+)
+from app.services.pdf_parser import PDFParser
+
+
+class TestItemTokenizer:
+    """Testes para o ItemTokenizer."""
+
+    def test_strict_line(self):
+        """Testa a linha padrão de item."""
+        matches = tokenize_items("03185 / FO-01 --> FONE PMCELL / UN / 30 / 4,50 / 135,00")
+
+        assert len(matches) == 1
+        assert matches[0].variant == STRICT
+        assert matches[0].groups == ("03185", "FO-01", "FONE PMCELL", None, "30", "4,50", "135,00")
+
+    def test_strict_line_with_extra_field(self):
+        """Testa a linha com campo extra antes da unidade."""
+        matches = tokenize_items("12345 / REF --> CAPA / PRETA / UN / 2 / 10,00 / 20,00")
+
+        assert matches[0].groups == ("12345", "REF", "CAPA", "PRETA", "2", "10,00", "20,00")
+
+    def test_strict_rejects_glued_unit(self):
+        """Testa que a variante padrão exige o marcador UN entre barras."""
+        assert tokenize_items("12345 / REF --> CAPA UN 2 / 10,00 / 20,00") == []
+
+    def test_tolerant_glued_unit_and_quantity(self):
+        """Testa marcador UN colado à descrição e à quantidade."""
+        text = "12345 / REF --> CAPA UN 2 / 10,00 / 20,00"
+        matches = tokenize_items(text, TOLERANT)
+
+        assert matches[0].variant == TOLERANT
+        assert matches[0].groups == ("12345", "REF", "CAPA", None, "2", "10,00", "20,00")
+
+    def test_tolerant_double_slash(self):
+        """Testa barra duplicada antes do marcador UN."""
+        matches = tokenize_items("12345 / REF --> CAPA / X // UN / 2 / 10,00 / 20,00", TOLERANT)
+
+        assert matches[0].groups[3] == "X"
+        assert matches[0].groups[4:] == ("2", "10,00", "20,00")
+
+    def test_legacy_short_code(self):
+        """Testa códigos de 3 dígitos, aceitos apenas pela variante legacy."""
+        line = "001 / REF-001 --> PRODUTO / UN / 5 / 100,00 / 500,00"
+
+        assert tokenize_items(line, STRICT) == []
+        assert tokenize_items(line, LEGACY)[0].groups[0] == "001"
+
+    def test_multiple_items_without_overlap(self):
+        """Testa vários itens no mesmo texto, com posições crescentes."""
+        text = "\n".join([
+            "12345 / A --> X / UN / 1 / 1,00 / 1,00",
+            "54321 / B --> Y / UN / 2 / 2,00 / 4,00",
+        ])
+        matches = list(ItemTokenizer(text).tokenize())
+
+        assert [match.groups[0] for match in matches] == ["12345", "54321"]
+        assert matches[0].end <= matches[1].start
+
+    def test_adversarial_input_is_linear(self):
+        """Testa tempo limitado em linhas malformadas longas."""
+        text = "12345 / a" + " \n" * 20000 + "/ x" + " un" * 20000 + " / y"
+
+        start = time.perf_counter()
+        for variant in (STRICT, TOLERANT, LEGACY):
+            assert tokenize_items(text, variant) == []
+        assert time.perf_counter() - start < 1.0
+
+
+class TestItemStream:
+    """Testes para a tokenização incremental."""
+
+    TEXT = "\n".join([
+        "Cliente: EMPRESA",
+        "12345 / A --> X / UN / 1 / 1,00 / 1,00",
+        "54321 / B --> Y / Z / UN / 2 / 2,00 / 4,00",
+        "1234 / C / UN / 3 / 3,00 / 9,00",
+    ])
+
+    def test_same_items_as_full_text(self):
+        """Testa que o texto em partes produz os mesmos itens."""
+        for size in (1, 7, 40):
+            stream = ItemStream(STRICT)
+            groups = []
+            for start in range(0, len(self.TEXT), size):
+                groups.extend(match.groups for match in stream.feed(self.TEXT[start:start + size]))
+            groups.extend(match.groups for match in stream.close())
+
+            assert groups == [match.groups for match in tokenize_items(self.TEXT)]
+
+    def test_item_waits_for_closed_segments(self):
+        """Testa que o item só é emitido quando o texto seguinte não o altera."""
+        stream = ItemStream(STRICT)
+
+        assert stream.feed("12345 / A / UN / 1 / 1,00 / 1,0") == []
+        assert stream.feed("0 / 54321 / B") != []
+        assert [match.groups[0] for match in stream.close()] == []
+
+
+class TestPDFParserItemVariants:
+    """Testes da cascata de variantes no parser."""
+
+    def test_fallback_to_legacy_variant(self):
+        """Testa que códigos curtos usam a variante legacy."""
+        items = PDFParser()._extract_items("001 / REF-001 --> PRODUTO / UN / 5 / 100,00 / 500,00")
+
+        assert items == [{
+            'product_code': "001",
+            'product_reference': "REF-001",
+            'product_name': "REF-001 - PRODUTO",
+            'quantity': 5,
+            'unit_price': 100.0,
+            'total_price': 500.0,
+        }]
+
+    def test_strict_variant_wins(self):
+        """Testa que itens no formato padrão impedem as variantes tolerantes."""
+        text = "\n".join([
+            "12345 / REF --> CAPA / UN / 2 / 10,00 / 20,00",
+            "54321 / REF --> PELICULA UN 3 / 1,00 / 3,00",
+        ])
+        items = PDFParser()._extract_items(text)
+
+        assert [item['product_code'] for item in items] == ["12345"]
@@ -0,0 +1,80 @@
+"""
+Testes para o cache de resultados de parsing de PDF.
+"""
+import hashlib
+
+import pytest
+
+from app.services.pdf_parse_cache import PDFParseCache
+
+
+PDF_A = b"%PDF-1.4 orcamento A"
+PDF_B = b"%PDF-1.4 orcamento B"
+
+
+class TestPDFParseCache:
+    """Testes para o PDFParseCache."""
+
+    @pytest.mark.asyncio
+    async def test_hit_after_set(self):
+        """Testa que o mesmo conteúdo devolve o resultado armazenado."""
+        cache = PDFParseCache(max_entries=4, ttl=60)
+        data = {"order_number": "12345", "items": [{"product_code": "1001"}]}
+
+        assert await cache.get(PDF_A) is None
+        await cache.set(PDF_A, data)
+
+        assert await cache.get(PDF_A) == data
+        assert await cache.get(PDF_B) is None
+        metrics = cache.get_metrics()
+        assert metrics["hits"] == 1
+        assert metrics["misses"] == 2
+
+    @pytest.mark.asyncio
+    async def test_returns_copies(self):
+        """Testa que alterar o resultado não corrompe o cache."""
+        cache = PDFParseCache(max_entries=4, ttl=60)
+        await cache.set(PDF_A, {"items": [{"quantity": 1}]})
+
+        first = await cache.get(PDF_A)
+        first["items"][0]["quantity"] = 99
+
+        assert (await cache.get(PDF_A))["items"][0]["quantity"] == 1
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Testa remoção da entrada menos usada ao exceder o limite."""
+        cache = PDFParseCache(max_entries=1, ttl=60)
+        await cache.set(PDF_A, {"order_number": "1"})
+        await cache.set(PDF_B, {"order_number": "2"})
+
+        assert await cache.get(PDF_A) is None
+        assert await cache.get(PDF_B) == {"order_number": "2"}
+        assert cache.get_metrics()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_ttl_expiration(self):
+        """Testa que entradas expiradas não são devolvidas."""
+        cache = PDFParseCache(max_entries=4, ttl=0)
+        await cache.set(PDF_A, {"order_number": "1"})
+
+        assert await cache.get(PDF_A) is None
+        assert cache.get_metrics()["entries"] == 0
+
+    def test_parser_version_changes_key(self):
+        """Testa que uma nova versão do parser invalida as chaves antigas."""
+        v1 = PDFParseCache(parser_version="1")
+        v2 = PDFParseCache(parser_version="2")
+
+        assert v1.key_for(PDF_A) != v2.key_for(PDF_A)
+        assert v1.key_for(PDF_A) == PDFParseCache(parser_version="1").key_for(PDF_A)
+
+    @pytest.mark.asyncio
+    async def test_precomputed_hash_same_key(self):
+        """Testa que o hash calculado na leitura do upload gera a mesma chave."""
+        cache = PDFParseCache(max_entries=4, ttl=60)
+        content_hash = hashlib.sha256(PDF_A).hexdigest()
+        await cache.set(PDF_A, {"order_number": "1"}, content_hash)
+
+        assert cache.key_for(PDF_A, content_hash) == cache.key_for(PDF_A)
+        assert await cache.get(PDF_A) == {"order_number": "1"}
@@ -0,0 +1,117 @@
+"""
+Testes para a instrumentação do parsing de PDFs.
+"""
+import logging
+import time
+from pathlib import Path
+
+import pytest
+
+from app.services.pdf_parse_stats import ITEMS, NORMALIZE, Histogram, ParseMetrics, ParseStats
+from app.services.pdf_parser import PDFParser
+from app.services.pdf_parser_pool import PDFParserPool
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+PDFS_DIR = Path(__file__).parent.parent / "fixtures" / "pdfs"
+
+
+class TestParseStats:
+    """Testes para o ParseStats."""
+
+    def test_nested_generators_time_their_own_stage(self):
+        """Testa que cada etapa mede só o próprio trabalho."""
+        stats = ParseStats()
+
+        def slow_source():
+            for value in range(3):
+                time.sleep(0.01)
+                yield value
+
+        def consumer():
+            for value in stats.timed(slow_source(), NORMALIZE):
+                yield value
+
+        assert list(stats.timed(consumer(), ITEMS)) == [0, 1, 2]
+        assert stats.stages_ms[NORMALIZE] >= 30
+        assert stats.stages_ms[ITEMS] < 10
+
+    def test_timer_restores_previous_stage(self):
+        """Testa que o bloco medido devolve o tempo à etapa anterior."""
+        stats = ParseStats()
+        with stats.timer(ITEMS):
+            with stats.timer(NORMALIZE):
+                time.sleep(0.01)
+
+        assert stats.stages_ms[NORMALIZE] >= 10
+        assert stats.stages_ms[ITEMS] < 5
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Testa os buckets acumulados do histograma."""
+        histogram = Histogram(bounds=(10, 100))
+        for value in (5, 50, 500):
+            histogram.observe(value)
+
+        assert histogram.get_metrics()["buckets"] == {"10": 1, "100": 2, "+Inf": 3}
+
+
+class TestParserInstrumentation:
+    """Testes das estatísticas produzidas pelo PDFParser."""
+
+    def test_stats_of_synthetic_quote(self):
+        """Testa contadores e etapas em um orçamento de várias páginas."""
+        parser = PDFParser()
+        parser.extract_bytes(build_quote_pdf(pages=3, items_per_page=5))
+        stats = parser.last_stats
+
+        assert stats.counters["pages"] == 3
+        assert stats.counters["items"] == 15
+        assert stats.counters["item_fallbacks"] == 0
+        assert stats.item_variant == "strict"
+        assert stats.engine == "pdfplumber"
+        assert sum(stats.stages_ms.values()) <= stats.total_ms + 1
+
+    def test_fallback_cascade_is_counted(self):
+        """Testa que o uso das variantes tolerantes aparece nos contadores."""
+        parser = PDFParser()
+        parser.extract(PDFS_DIR / "sample_order.pdf")
+        stats = parser.last_stats
+
+        assert stats.counters["item_fallbacks"] == 1
+        assert stats.counters["suspicious_items"] == 1
+        assert stats.item_variant == "legacy"
+        assert [attempt.engine for attempt in stats.attempts] == ["pdfplumber"]
+
+
+class TestPoolParseMetrics:
+    """Testes da agregação no pool."""
+
+    @pytest.mark.asyncio
+    async def test_stats_logged_and_aggregated(self, caplog):
+        """Testa o registro estruturado e os histogramas por etapa."""
+        pool = PDFParserPool(max_workers=0)
+        # O logger "app" não propaga para a raiz quando app.main é importado
+        logger = logging.getLogger("app.services.pdf_parser_pool")
+        logger.addHandler(caplog.handler)
+        try:
+            with caplog.at_level(logging.INFO, logger="app.services.pdf_parser_pool"):
+                await pool.parse(PDFS_DIR / "sample_order.pdf")
+        finally:
+            logger.removeHandler(caplog.handler)
+
+        assert any('"item_variant": "legacy"' in record.message for record in caplog.records)
+        stages = pool.get_metrics()["stages"]
+        assert stages["documents"] == 1
+        assert stages["stages"]["extract"]["count"] == 1
+        assert stages["item_variants"] == {"legacy": 1}
+
+    def test_metrics_aggregate_counters(self):
+        """Testa a soma dos contadores entre documentos."""
+        metrics = ParseMetrics()
+        for _ in range(2):
+            stats = ParseStats()
+            stats.count("pages", 3)
+            metrics.record(stats)
+
+        assert metrics.get_metrics()["counters"]["pages"] == 6
+        assert metrics.get_metrics()["item_variants"] == {"none": 2}
@@ -4,11 +4,14 @@ Testes para o serviço de parser de PDF.
 Seguindo TDD - Tests First!
 """
 import pytest
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
 
 from app.services.pdf_parser import PDFParser, PDFParseError
+from app.services.pdf_text_engines import PYPDF2, get_engine
+from benchmarks.synthetic_quote import build_pdf, distributed_quote_lines, quote_lines
 
 
 class TestPDFParser:
@@ -173,6 +176,29 @@ class TestPDFParser:
         with pytest.raises(PDFParseError):
             parser.extract(corrupted_path)
     
+    def test_extract_bytes_matches_path(self, parser, sample_pdf_path):
+        """Testa extração em memória com o mesmo resultado do caminho."""
+        content = sample_pdf_path.read_bytes()
+        assert parser.extract_bytes(content) == parser.extract(sample_pdf_path)
+    
+    def test_extract_stream_reused_for_fallback(self, parser, sample_pdf_path):
+        """Testa que o stream continua utilizável após a extração."""
+        stream = BytesIO(sample_pdf_path.read_bytes())
+        result = parser.extract_stream(stream)
+        assert result['order_number'] == "12345"
+        assert "".join(get_engine(PYPDF2).iter_pages(stream)).strip() != ""
+    
+    def test_extract_empty_bytes(self, parser):
+        """Testa comportamento com conteúdo vazio."""
+        with pytest.raises(PDFParseError, match="vazio"):
+            parser.extract_bytes(b"")
+    
+    def test_sniff_order_number_from_first_page(self, parser, sample_pdf_path):
+        """Testa a leitura rápida do número do orçamento na primeira página."""
+        assert parser.sniff_order_number(sample_pdf_path.read_bytes()) == "12345"
+        assert parser.sniff_order_number(build_pdf(quote_lines(3, 5, "27830"))) == "27830"
+        assert parser.sniff_order_number(b"nao e um pdf") is None
+    
     def test_pdf_without_required_fields(self, parser):
         """Testa PDF que não contém os campos obrigatórios."""
         incomplete_pdf_path = Path(__file__).parent.parent / "fixtures" / "pdfs" / "incomplete.pdf"
@@ -237,6 +263,104 @@ class TestPDFParserPatterns:
         assert items[0]['quantity'] == 10
         assert items[0]['unit_price'] == 50.00
         assert items[0]['total_price'] == 500.00
+    
+    def test_clean_text_skips_headers_and_joins_wrapped_items(self, parser):
+        """Testa a limpeza: cabeçalhos descartados e itens quebrados unidos."""
+        text = "\n".join([
+            "PMCELL São Paulo",
+            "Cliente: EMPRESA TESTE",
+            "12345 / REF1 --> CAPA",
+            "Página 2",
+            "SILICONE PRETA",
+            "/ UN / 2 / 10,00 / 20,00",
+            "54321 sem barra",
+        ])
+        cleaned = parser._clean_extracted_text(text).split("\n")
+        assert cleaned == [
+            "Cliente: EMPRESA TESTE",
+            "12345 / REF1 --> CAPA SILICONE PRETA / UN / 2 / 10,00 / 20,00",
+        ]
+    
+    def test_line_classifier_labels(self, parser):
+        """Testa os rótulos do classificador de linhas."""
+        def label(line):
+            match = parser.LINE_CLASSIFIER.match(line)
+            return match.lastgroup if match else None
+        
+        assert label("Orçamento Nº: 12345") == "skip"
+        assert label("7 dia(s)") == "skip"
+        assert label("12345 / REF") == "item_start"
+        assert label("12345 REF") == "item_code"
+        assert label("Cliente: EMPRESA") is None
+
+
+class TestPDFParserStreaming:
+    """Testes do processamento página a página."""
+    
+    @pytest.fixture
+    def parser(self):
+        return PDFParser()
+    
+    def test_item_split_across_pages(self, parser):
+        """Testa item quebrado no fim de uma página e concluído na seguinte."""
+        pages = [
+            "Cliente: EMPRESA TESTE\n12345 / REF1 --> CAPA\n",
+            "Página 1\nSILICONE / UN / 2 / 10,00 / 20,00\n54321 / REF2 / UN / 1 / 5,00 / 5,00\n",
+        ]
+        recorded = []
+        items = list(parser._iter_items(iter(pages), recorded))
+        
+        assert recorded == pages
+        assert [item['product_name'] for item in items] == ["REF1 - CAPA SILICONE", "REF2"]
+        assert items == list(parser._iter_items(iter(["".join(pages)]), []))
+    
+    def test_items_emitted_before_last_page(self, parser):
+        """Testa que cada item é emitido no máximo duas linhas de item depois."""
+        def pages():
+            yield "12345 / REF1 / UN / 2 / 10,00 / 20,00\n"
+            yield "54321 / REF2 / UN / 1 / 5,00 / 5,00\n"
+            yield "11111 / REF3 / UN / 1 / 5,00 / 5,00\n"
+            raise AssertionError("página não deveria ser lida")
+        
+        first = next(parser._iter_items(pages(), []))
+        assert first['product_code'] == "12345"
+    
+    def test_normalized_chunks_match_full_text(self, parser):
+        """Testa normalização em partes com sequências na quebra de página."""
+        pages = ["12345 / A <\n", "UN / 1 / 1,00 / 1,00 /\n", "/ / x\n", "fim\n"]
+        
+        assert "".join(parser._iter_normalized_chunks(pages)) == parser._normalize_text("".join(pages))
+    
+    def test_extract_from_page_ranges(self, parser):
+        """Testa a união de intervalos de páginas com item quebrado entre elas."""
+        pages = quote_lines(pages=3, items_per_page=3)
+        pages[0].append("54321 / REF-X --> CAPA")
+        pages[1].insert(0, "SILICONE / UN / 2 / 10,00 / 20,00")
+        content = build_pdf(pages)
+        
+        texts = parser.extract_page_texts(content, 1, 1) + parser.extract_page_texts(content, 2, 3)
+        data = parser.extract_from_pages(texts)
+        
+        assert parser.count_pages(content) == 3
+        assert data == parser.extract_bytes(content)
+        assert "REF-X - CAPA SILICONE" in [item['product_name'] for item in data['items']]
+    
+    def test_extract_synthetic_quote_with_artifacts(self, parser):
+        """Testa resíduos /<<UN, </< UN e <</ UN no marcador de unidade."""
+        pages = distributed_quote_lines(items=9, pages=2, artifact_every=3)
+        data = parser.extract_bytes(build_pdf(pages))
+        
+        lines = "\n".join(pages[0] + pages[1])
+        assert all(marker in lines for marker in ("/<<UN", "</< UN", "<</ UN"))
+        assert [item['product_code'] for item in data['items']] == [str(10000 + i) for i in range(9)]
+        assert sum(item['total_price'] for item in data['items']) == pytest.approx(data['total_value'])
+    
+    def test_tolerant_fallback_at_end_of_document(self, parser):
+        """Testa a cascata de variantes quando nenhum item padrão aparece."""
+        pages = ["001 / REF-001 --> PRODUTO / UN / 5 / 100,00 / 500,00\n"]
+        items = list(parser._iter_items(iter(pages), []))
+        
+        assert [item['product_code'] for item in items] == ["001"]
 
 
 class TestPDFParserIntegration:
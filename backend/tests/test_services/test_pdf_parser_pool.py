@@ -0,0 +1,124 @@
+"""
+Testes para o pool de processos do parser de PDF.
+"""
+from pathlib import Path
+
+import pytest
+
+from app.services.pdf_parser import PDFParser, PDFParseError
+from app.services.pdf_parser_pool import PDFParserPool
+from app.services.pdf_text_engines import ACCEPTED, EngineAttempt
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+PDFS_DIR = Path(__file__).parent.parent / "fixtures" / "pdfs"
+
+
+class TestPDFParserPool:
+    """Testes para o PDFParserPool."""
+    
+    @pytest.fixture
+    def pool(self):
+        """Pool com um único worker."""
+        pool = PDFParserPool(max_workers=1, timeout=30)
+        yield pool
+        pool.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_parse_in_worker_process(self, pool):
+        """Testa parsing em processo separado."""
+        await pool.warm_up()
+        data = await pool.parse(PDFS_DIR / "sample_order.pdf")
+        
+        assert data == PDFParser().extract(PDFS_DIR / "sample_order.pdf")
+        assert pool.get_metrics()["completed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_parse_error_propagates(self, pool):
+        """Testa que PDFParseError do worker chega ao chamador."""
+        with pytest.raises(PDFParseError):
+            await pool.parse(PDFS_DIR / "corrupted.pdf")
+        
+        assert pool.get_metrics()["failed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_parse_bytes_in_worker_process(self, pool):
+        """Testa parsing de PDF em memória, sem arquivo em disco."""
+        content = (PDFS_DIR / "sample_order.pdf").read_bytes()
+        data = await pool.parse_bytes(content)
+        
+        assert data == PDFParser().extract_bytes(content)
+    
+    @pytest.mark.asyncio
+    async def test_timeout_restarts_pool(self, pool):
+        """Testa timeout por job e recuperação do pool."""
+        pool.timeout = 0.001
+        with pytest.raises(PDFParseError, match="Tempo limite"):
+            await pool.parse(PDFS_DIR / "multipage.pdf")
+        assert pool.get_metrics()["timeouts"] == 1
+        
+        pool.timeout = 30
+        data = await pool.parse(PDFS_DIR / "sample_order.pdf")
+        assert data['order_number'] == "12345"
+    
+    @pytest.mark.asyncio
+    async def test_parse_in_thread_mode(self):
+        """Testa o modo sem processos (max_workers=0)."""
+        pool = PDFParserPool(max_workers=0)
+        data = await pool.parse(PDFS_DIR / "sample_order.pdf")
+        assert data['order_number'] == "12345"
+        
+        # Sem histórico só a referência é tentada
+        engines = pool.get_metrics()["engines"]
+        assert engines["pdfplumber"]["selected"] == 1
+        assert engines["pypdf2"]["attempts"] == 0
+        assert engines["pypdf2"]["skipped"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_worker_uses_pool_engine_order(self):
+        """Testa que o job usa a ordem decidida com as estatísticas do pool."""
+        pool = PDFParserPool(max_workers=0)
+        pool.engine_stats.min_samples = 2
+        pool.engine_stats.merge([EngineAttempt("pypdf2", ACCEPTED, 1.0, True)] * 2)
+        pool.engine_stats.merge([EngineAttempt("pdfplumber", ACCEPTED, 50.0, True)])
+        
+        await pool.parse_bytes(build_quote_pdf(pages=1, items_per_page=3))
+        engines = pool.get_metrics()["engines"]
+        assert engines["pypdf2"]["selected"] == 3
+        assert engines["pdfplumber"]["attempts"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_large_pdf_sharded_across_workers(self):
+        """Testa a extração paralela por intervalos de páginas."""
+        content = build_quote_pdf(pages=5, items_per_page=4)
+        pool = PDFParserPool(max_workers=2, timeout=60, parallel_min_pages=5)
+        try:
+            data = await pool.parse_bytes(content)
+        finally:
+            pool.shutdown()
+        
+        assert data == PDFParser().extract_bytes(content)
+        assert len(data['items']) == 20
+        assert pool.get_metrics()["sharded"] == 1
+        assert pool.get_metrics()["engines"]["pdfplumber"]["selected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_sniff_order_number_in_worker(self):
+        """Testa a leitura rápida do número do orçamento no processo worker."""
+        content = (PDFS_DIR / "sample_order.pdf").read_bytes()
+        pool = PDFParserPool(max_workers=1, timeout=60)
+        try:
+            assert await pool.sniff_order_number(content) == "12345"
+            assert pool._executor is not None
+            assert await pool.sniff_order_number(b"nao e um pdf") is None
+        finally:
+            pool.shutdown()
+        
+        assert await PDFParserPool(max_workers=0).sniff_order_number(content) == "12345"
+    
+    def test_page_ranges(self):
+        """Testa a divisão das páginas em intervalos contíguos."""
+        pool = PDFParserPool(max_workers=4)
+        
+        assert pool._page_ranges(10) == [(1, 3), (4, 6), (7, 8), (9, 10)]
+        assert pool._page_ranges(2) == [(1, 1), (2, 2)]
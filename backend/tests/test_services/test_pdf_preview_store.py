@@ -0,0 +1,81 @@
+"""
+Testes para os previews de PDF guardados para o /confirm.
+"""
+from datetime import datetime
+
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.pdf import OrderCreateFromPDF, PDFExtractedData
+from app.services.pdf_preview_store import PDFPreviewStore
+
+
+def _extracted_data() -> PDFExtractedData:
+    return PDFExtractedData(
+        order_number="12345",
+        client_name="Cliente",
+        seller_name="Vendedor",
+        order_date=datetime(2024, 1, 15),
+        total_value=100.0,
+        items=[{
+            "product_code": "001",
+            "product_reference": "REF001",
+            "product_name": "Produto",
+            "quantity": 2,
+            "unit_price": 50.0,
+            "total_price": 100.0
+        }]
+    )
+
+
+class TestPDFPreviewStore:
+    """Testes para o PDFPreviewStore."""
+
+    @pytest.mark.asyncio
+    async def test_token_returns_stored_data(self):
+        """Testa que o token devolve os dados guardados, sem nova validação."""
+        store = PDFPreviewStore(ttl=60)
+        data = _extracted_data()
+        token = await store.put(data, user_id=1)
+
+        assert await store.get(token, user_id=1) is data
+        assert store.get_metrics()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_token_bound_to_user(self):
+        """Testa que o token não vale para outro usuário."""
+        store = PDFPreviewStore(ttl=60)
+        token = await store.put(_extracted_data(), user_id=1)
+
+        assert await store.get(token, user_id=2) is None
+        assert store.get_metrics()["invalid_tokens"] == 1
+
+    @pytest.mark.asyncio
+    async def test_tampered_token_rejected(self):
+        """Testa que um token alterado é rejeitado."""
+        store = PDFPreviewStore(ttl=60)
+        token = await store.put(_extracted_data(), user_id=1)
+        header, payload, signature = token.split(".")
+
+        assert await store.get(f"{header}.{payload}.{signature[::-1]}", user_id=1) is None
+        assert await store.get("invalido", user_id=1) is None
+
+    @pytest.mark.asyncio
+    async def test_discard_and_expiration(self):
+        """Testa que o token não vale após o uso ou a expiração."""
+        store = PDFPreviewStore(ttl=60)
+        token = await store.put(_extracted_data(), user_id=1)
+        await store.discard(token)
+        assert await store.get(token, user_id=1) is None
+
+        expired = PDFPreviewStore(ttl=-1)
+        token = await expired.put(_extracted_data(), user_id=1)
+        assert await expired.get(token, user_id=1) is None
+
+    def test_confirm_requires_token_or_data(self):
+        """Testa que o /confirm aceita o token sem os dados do PDF."""
+        order = OrderCreateFromPDF(preview_token="token", logistics_type="correios")
+        assert order.pdf_data is None
+
+        with pytest.raises(ValidationError):
+            OrderCreateFromPDF(logistics_type="correios")
@@ -0,0 +1,185 @@
+"""
+Testes para os engines de extração de texto e a seleção adaptativa.
+"""
+from io import BytesIO
+from pathlib import Path
+
+import pytest
+
+from app.services import pdf_text_engines
+from app.services.pdf_parser import PDFParser, PDFParseError
+from app.services.pdf_text_engines import (
+    ACCEPTED,
+    FAILED,
+    PDFMINER,
+    PDFPLUMBER,
+    PYPDF2,
+    REJECTED,
+    EngineAttempt,
+    EngineStats,
+    TextEngine,
+    TextExtractionError,
+    get_engine,
+    register_engine,
+)
+from benchmarks.synthetic_quote import build_quote_pdf
+
+
+PDFS_DIR = Path(__file__).parent.parent / "fixtures" / "pdfs"
+
+
+class _BrokenEngine(TextEngine):
+    """Engine que sempre falha."""
+
+    name = "broken"
+
+    def iter_pages(self, stream, page_numbers=None):
+        raise TextExtractionError("Erro com broken")
+
+
+class TestTextEngines:
+    """Testes para os engines registrados."""
+
+    def test_registry(self):
+        """Testa a busca de engines pelo nome."""
+        assert get_engine(PDFMINER).name == PDFMINER
+        with pytest.raises(ValueError):
+            get_engine("inexistente")
+
+    @pytest.mark.parametrize("engine", [PYPDF2, PDFMINER, PDFPLUMBER])
+    def test_engines_extract_same_data(self, engine):
+        """Testa que todos os engines produzem os mesmos dados do orçamento sintético."""
+        content = build_quote_pdf(pages=2, items_per_page=5)
+        data = PDFParser(engines=[engine]).extract_bytes(content)
+
+        assert data == PDFParser(engines=[PDFPLUMBER]).extract_bytes(content)
+        assert len(data['items']) == 10
+
+    def test_page_selection(self):
+        """Testa a extração de páginas específicas."""
+        content = build_quote_pdf(pages=3, items_per_page=2)
+        pages = list(get_engine(PDFMINER).iter_pages(BytesIO(content), [2]))
+
+        assert len(pages) == 1
+        assert "Página 2" in pages[0]
+
+    def test_engine_interface_is_abstract(self):
+        """Testa que engines sem iter_pages não podem ser criados."""
+        class Incomplete(TextEngine):
+            name = "incompleto"
+
+        with pytest.raises(TypeError):
+            Incomplete()
+
+    def test_invalid_pdf_raises(self):
+        """Testa que um PDF inválido gera TextExtractionError."""
+        with pytest.raises(TextExtractionError):
+            list(get_engine(PDFMINER).iter_pages(BytesIO(b"not a pdf")))
+
+
+class TestAdaptiveExtraction:
+    """Testes para a escolha do engine no PDFParser."""
+
+    def test_reference_engine_first_without_history(self):
+        """Testa que sem estatísticas só o engine de referência é tentado."""
+        parser = PDFParser()
+        parser.extract_bytes(build_quote_pdf(pages=1, items_per_page=3))
+
+        assert [(a.engine, a.outcome, a.selected) for a in parser.last_attempts] == [
+            (PDFPLUMBER, ACCEPTED, True)
+        ]
+        assert parser.engine_stats.get_metrics()[PYPDF2]["skipped"] == 1
+
+    def test_cheaper_engine_first_when_it_pays_off(self):
+        """Testa que um engine barato que vem acertando passa à frente."""
+        stats = EngineStats(min_samples=2)
+        stats.merge([EngineAttempt(PYPDF2, ACCEPTED, 1.0, True)] * 2)
+        stats.merge([EngineAttempt(PDFPLUMBER, ACCEPTED, 50.0, True)])
+        parser = PDFParser(engines=[PYPDF2, PDFPLUMBER], engine_stats=stats)
+        parser.extract_bytes(build_quote_pdf(pages=1, items_per_page=3))
+
+        assert [(a.engine, a.outcome, a.selected) for a in parser.last_attempts] == [
+            (PYPDF2, ACCEPTED, True)
+        ]
+
+    def test_escalates_when_values_do_not_match(self):
+        """Testa que um orçamento que não fecha passa por todos os engines."""
+        parser = PDFParser()
+        data = parser.extract(PDFS_DIR / "sample_order.pdf", order=[PYPDF2, PDFMINER, PDFPLUMBER])
+
+        assert [a.outcome for a in parser.last_attempts] == [REJECTED] * 3
+        assert parser.last_attempts[-1].engine == PDFPLUMBER
+        assert parser.last_attempts[-1].selected
+        assert data == PDFParser(engines=[PDFPLUMBER]).extract(PDFS_DIR / "sample_order.pdf")
+
+    def test_failed_engine_falls_back(self, monkeypatch):
+        """Testa que a falha de um engine aciona o próximo."""
+        monkeypatch.setattr(pdf_text_engines, "_ENGINES", dict(pdf_text_engines._ENGINES))
+        register_engine(_BrokenEngine())
+        parser = PDFParser(engines=["broken", PDFPLUMBER])
+        data = parser.extract(PDFS_DIR / "sample_order.pdf", order=["broken", PDFPLUMBER])
+
+        assert data['order_number'] == "12345"
+        assert [a.outcome for a in parser.last_attempts] == [FAILED, REJECTED]
+
+    def test_skipped_engine_tried_when_reference_fails(self, monkeypatch):
+        """Testa que um engine fora da ordem é tentado se a referência não extrai texto."""
+        monkeypatch.setattr(pdf_text_engines, "_ENGINES", dict(pdf_text_engines._ENGINES))
+        register_engine(_BrokenEngine())
+        parser = PDFParser(engines=[PDFPLUMBER, "broken"])
+        data = parser.extract(PDFS_DIR / "sample_order.pdf")
+
+        assert data['order_number'] == "12345"
+        assert [(a.engine, a.outcome) for a in parser.last_attempts] == [
+            ("broken", FAILED), (PDFPLUMBER, REJECTED)
+        ]
+
+    def test_all_engines_fail(self):
+        """Testa o erro quando nenhum engine extrai texto."""
+        with pytest.raises(PDFParseError):
+            PDFParser().extract(PDFS_DIR / "corrupted.pdf")
+
+    def test_unknown_engine(self):
+        """Testa que engines desconhecidos são rejeitados na criação do parser."""
+        with pytest.raises(ValueError):
+            PDFParser(engines=["inexistente"])
+
+
+class TestEngineStats:
+    """Testes para as estatísticas dos engines."""
+
+    def test_probe_all_engines_periodically(self):
+        """Testa que a cada probe_every documentos todos os engines são tentados."""
+        stats = EngineStats(probe_every=3)
+        engines = (PYPDF2, PDFMINER, PDFPLUMBER)
+
+        assert [stats.plan(engines) for _ in range(6)] == [[PDFPLUMBER], [PDFPLUMBER], list(engines)] * 2
+        assert stats.get_metrics()[PYPDF2]["skipped"] == 4
+        assert stats.plan([PDFPLUMBER]) == [PDFPLUMBER]
+
+    def test_promotion_follows_cost(self):
+        """Testa que o engine passa à frente só quando o acerto compensa o tempo."""
+        stats = EngineStats(window=4, min_samples=2)
+        stats.merge([EngineAttempt(PDFPLUMBER, ACCEPTED, 10.0, True)])
+        stats.merge([EngineAttempt(PYPDF2, REJECTED, 1.0, False)] * 4)
+        assert not stats.pays_off(PYPDF2, PDFPLUMBER)
+
+        # 2 acertos em 4: 1 ms < 0,5 × 10 ms
+        stats.merge([EngineAttempt(PYPDF2, ACCEPTED, 1.0, True)] * 2)
+        assert stats.pays_off(PYPDF2, PDFPLUMBER)
+        assert stats.plan((PYPDF2, PDFMINER, PDFPLUMBER)) == [PYPDF2, PDFPLUMBER]
+
+        # Sempre acerta, mas custa mais que a referência
+        stats.merge([EngineAttempt(PDFMINER, ACCEPTED, 20.0, True)] * 2)
+        assert not stats.pays_off(PDFMINER, PDFPLUMBER)
+
+    def test_metrics(self):
+        """Testa as métricas por engine."""
+        stats = EngineStats()
+        stats.record(EngineAttempt(PDFMINER, ACCEPTED, 10.0, True))
+        stats.record(EngineAttempt(PDFMINER, REJECTED, 30.0, False))
+
+        assert stats.get_metrics()[PDFMINER] == {
+            "attempts": 2, "accepted": 1, "rejected": 1, "failed": 0,
+            "selected": 1, "skipped": 0, "hit_rate": 0.5, "avg_ms": 20.0,
+        }